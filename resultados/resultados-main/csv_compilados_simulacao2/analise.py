@@ -1,77 +1,897 @@
+import json
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 import re
+from statistics import NormalDist
+import sys
+import threading
+from urllib.parse import unquote, urlsplit
+import zlib
 from typing import Dict, List, Tuple
 
+# O parser (compilação das tabelas, catálogo e resumos) fica em simulacao2/codigos/p2p/normal
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'simulacao2' / 'codigos' / 'p2p' / 'normal'))
+from analisar import ARQUIVO_CATALOGO, SUFIXO_RESUMO  # noqa: E402
+
+# Estados Paje das operações coletivas (usados na análise de desbalanceamento)
+ESTADOS_COLETIVOS = ('PMPI_Bcast', 'PMPI_Reduce', 'PMPI_Gather', 'PMPI_Scatter', 'PMPI_Alltoall')
+
+# Unidades SimGrid (SI) para banda (bytes/s) e latência (s)
+UNIDADES_BANDA = {'Bps': 1, 'kBps': 1e3, 'KBps': 1e3, 'MBps': 1e6, 'GBps': 1e9, 'TBps': 1e12,
+                  'KiBps': 2**10, 'MiBps': 2**20, 'GiBps': 2**30, 'TiBps': 2**40}
+UNIDADES_TEMPO = {'s': 1, 'ms': 1e-3, 'us': 1e-6, 'ns': 1e-9, 'ps': 1e-12}
+
+# Tamanho de mensagem (bytes) e iterações usados pelos benchmarks (msg_size e IT)
+TAMANHO_MENSAGEM_PADRAO = 1024
+ITERACOES_PADRAO = 100
+
+# Benchmarks com root/master em argv[1] e o padrão quando o nome do arquivo não traz _raiz<R>
+PADROES_FLEX = ('bcastflex', 'pingpongflex')
+RAIZ_PADRAO = 0
+
+# Eixos das configurações (campos de metadata) comparáveis por MPILogAnalyzer.comparar e seus rótulos
+EIXOS_COMPARACAO = {
+    'tipo_comunicacao': 'Tipo Comunicação',
+    'topologia': 'Topologia',
+    'tecnologia': 'Tecnologia',
+    'num_nos': 'Nº Nós',
+}
+
+# Resolução das figuras no modo exato e no modo prévia (rascunho)
+DPI_FINAL = 300
+DPI_PREVIA = 72
+
+# Quantil normal dos intervalos de confiança (95%) reportados no modo prévia
+Z_CONFIANCA = 1.96
+
+# Grupos (de mesma contagem) do histograma reamostrado pelo bootstrap das médias
+GRUPOS_BOOTSTRAP = 64
+
+# Tabelas de self.results exportadas por exportar_tabelas, na ordem do relatório
+TABELAS_RELATORIO = ('estatisticas_basicas', 'escalabilidade', 'comparacao_tecnologias', 'comparacao_topologias',
+                     'latencia_cauda', 'piores_mensagens', 'concorrencia', 'desbalanceamento', 'espera_por_rank',
+                     'plataformas', 'eficiencia', 'caminho_critico', 'sensibilidade_raiz', 'tempo_por_raiz',
+                     'banda_efetiva', 'curvas_tamanho', 'modelo_saltos', 'residuos_por_salto')
+
+# Servidor de exploração (MPILogAnalyzer.iniciar_servidor): só em localhost, com a página
+# estática ao lado deste arquivo e histogramas de durações reduzidos a BINS_HISTOGRAMA faixas
+ENDERECO_EXPLORADOR = '127.0.0.1'
+PORTA_EXPLORADOR = 8050
+BINS_HISTOGRAMA = 40
+PAGINA_EXPLORADOR = Path(__file__).with_name('explorador.html')
+
+
+def converter_unidade(valor: str, unidades: Dict[str, float]) -> float:
+    """
+    Converte um valor SimGrid com unidade (ex.: "25GBps", "2us") para SI
+
+    Args:
+        valor: Valor com sufixo de unidade (ou número puro)
+        unidades: Tabela sufixo -> fator
+
+    Returns:
+        Valor convertido
+    """
+    match = re.fullmatch(r'\s*([0-9.eE+-]+)\s*([A-Za-z]*)\s*', valor)
+    if not match:
+        raise ValueError(f"Valor com unidade inválida: {valor!r}")
+    numero, unidade = match.groups()
+    return float(numero) * (unidades[unidade] if unidade else 1)
+
+
+def carregar_plataforma(diretorio: Path) -> Dict:
+    """
+    Lê o platform.xml (e o hostfile.txt, se houver) de uma configuração
+
+    Args:
+        diretorio: Diretório da configuração (<topologia>/<tecnologia>/<nós>)
+
+    Returns:
+        Dicionário com topologia, parâmetros, banda/latência e o mapeamento
+        rank -> índice do nó (pela ordem do hostfile)
+    """
+    import xml.etree.ElementTree as ET
+
+    cluster = ET.parse(Path(diretorio) / 'platform.xml').getroot().find('.//cluster')
+    attrs = cluster.attrib
+
+    inicio, fim = (int(x) for x in attrs['radical'].split('-'))
+    num_nos = fim - inicio + 1
+
+    mapa_ranks = np.arange(num_nos)
+    hostfile = Path(diretorio) / 'hostfile.txt'
+    if hostfile.exists():
+        nos = [int(m.group(1)) for m in re.finditer(r'node(\d+)', hostfile.read_text())]
+        if nos:
+            mapa_ranks = np.array(nos) - inicio
+
+    return {
+        'topologia': attrs.get('topology', 'FLAT').upper(),
+        'topo_parameters': attrs.get('topo_parameters', ''),
+        'num_nos': num_nos,
+        'banda': converter_unidade(attrs['bw'], UNIDADES_BANDA),
+        'latencia': converter_unidade(attrs['lat'], UNIDADES_TEMPO),
+        'banda_backbone': converter_unidade(attrs['bb_bw'], UNIDADES_BANDA) if 'bb_bw' in attrs else None,
+        'latencia_backbone': converter_unidade(attrs['bb_lat'], UNIDADES_TEMPO) if 'bb_lat' in attrs else 0.0,
+        'banda_loopback': converter_unidade(attrs.get('loopback_bw', attrs['bw']), UNIDADES_BANDA),
+        'latencia_loopback': converter_unidade(attrs.get('loopback_lat', '0'), UNIDADES_TEMPO),
+        'mapa_ranks': mapa_ranks
+    }
+
+
+def matriz_saltos(plataforma: Dict) -> np.ndarray:
+    """
+    Calcula o número de enlaces entre cada par de nós da plataforma
+
+    Modelos por topologia do cluster SimGrid:
+        TORUS: soma por dimensão da distância com wrap-around
+        FAT_TREE: 2 x nível do ancestral comum mais baixo
+        DRAGONFLY: 2 (nó-roteador) + 1 por nível (roteador, chassi, grupo) distinto
+        FLAT (estrela): enlace privado de origem + enlace privado de destino
+
+    Args:
+        plataforma: Dicionário retornado por carregar_plataforma
+
+    Returns:
+        Matriz (num_nos x num_nos) de saltos, indexada pelo índice do nó
+    """
+    n = plataforma['num_nos']
+    nos = np.arange(n)
+    topologia = plataforma['topologia']
+    params = plataforma['topo_parameters']
+
+    if topologia == 'TORUS':
+        dims = [int(d) for d in params.split(',')]
+        saltos = np.zeros((n, n), dtype=np.int64)
+        passo = 1
+        for k in dims:
+            coord = (nos // passo) % k
+            diff = np.abs(coord[:, None] - coord[None, :])
+            saltos += np.minimum(diff, k - diff)
+            passo *= k
+
+    elif topologia == 'FAT_TREE':
+        partes = params.split(';')
+        descendentes = [int(d) for d in partes[1].split(',')]
+        saltos = np.zeros((n, n), dtype=np.int64)
+        pendente = nos[:, None] != nos[None, :]
+        bloco = 1
+        for nivel, k in enumerate(descendentes, start=1):
+            bloco *= k
+            mesmo = (nos[:, None] // bloco) == (nos[None, :] // bloco)
+            saltos[pendente & mesmo] = 2 * nivel
+            pendente &= ~mesmo
+
+    elif topologia == 'DRAGONFLY':
+        partes = [int(p.split(',')[0]) for p in params.split(';')]
+        _, chassis, roteadores, por_roteador = partes
+        roteador = nos // por_roteador
+        niveis = [roteador % roteadores,
+                  (roteador // roteadores) % chassis,
+                  roteador // (roteadores * chassis)]
+        saltos = np.full((n, n), 2, dtype=np.int64)
+        for nivel in niveis:
+            saltos += nivel[:, None] != nivel[None, :]
+
+    else:
+        saltos = np.full((n, n), 2, dtype=np.int64)
+
+    np.fill_diagonal(saltos, 0)
+    return saltos
+
+
+# Esquema explícito das tabelas compiladas (*_completo.csv)
+ESQUEMA_TABELAS = {
+    'Rank Origem': np.int16,
+    'Rank Destino': np.int16,
+    'Ação da Origem': 'category',
+    'Estado do Destino': 'category',
+    'Tempo Inicial': np.float64,
+    'Tempo Final': np.float64,
+    'Tamanho (bytes)': np.int64,
+}
+
+# Colunas mantidas (além de Duracao) com MPILogAnalyzer(somente_duracoes=True)
+COLUNAS_MINIMAS = ('Rank Origem', 'Rank Destino')
+COLUNAS_TEMPO = ('Tempo Inicial', 'Tempo Final')
+
+# Colunas numéricas publicadas em memória compartilhada e seus tipos
+COLUNAS_COMPARTILHADAS = {
+    'Rank Origem': np.int32,
+    'Rank Destino': np.int32,
+    'Tempo Inicial': np.float64,
+    'Tempo Final': np.float64,
+    'Duracao': np.float64,
+}
+
+# Dataset anexado em cada processo trabalhador (ver _inicializar_trabalhador)
+_DATASET_TRABALHADOR = None
+
+
+def anexar_memoria_compartilhada(descritor: Dict) -> Tuple[object, Dict[str, Dict]]:
+    """
+    Anexa o dataset publicado por MPILogAnalyzer.publicar_memoria_compartilhada
+
+    As colunas são visões numpy sobre o bloco compartilhado: nenhum dado é
+    copiado, e a memória por processo não cresce com o tamanho do dataset.
+
+    Args:
+        descritor: Descritor retornado por publicar_memoria_compartilhada
+
+    Returns:
+        Tupla (bloco, configs) onde configs[key] = {'colunas': {...}, 'metadata': {...}};
+        o bloco deve permanecer referenciado enquanto as visões forem usadas
+    """
+    from multiprocessing import shared_memory
+
+    try:
+        bloco = shared_memory.SharedMemory(name=descritor['nome'], track=False)
+    except TypeError:
+        # Python < 3.13: os trabalhadores compartilham o resource_tracker do processo pai
+        bloco = shared_memory.SharedMemory(name=descritor['nome'])
+
+    configs = {}
+    for key, entrada in descritor['configs'].items():
+        colunas = {}
+        for coluna, (offset, dtype, tamanho) in entrada['colunas'].items():
+            visao = np.ndarray((tamanho,), dtype=dtype, buffer=bloco.buf, offset=offset)
+            visao.flags.writeable = False
+            colunas[coluna] = visao
+        configs[key] = {'colunas': colunas, 'metadata': entrada['metadata']}
+
+    return bloco, configs
+
+
+def _inicializar_trabalhador(descritor: Dict):
+    """Anexa o dataset compartilhado uma única vez por processo trabalhador."""
+    global _DATASET_TRABALHADOR
+    _DATASET_TRABALHADOR = anexar_memoria_compartilhada(descritor)
+
+
+def _executar_tarefa(funcao, key: str):
+    """Executa funcao(colunas, metadata) sobre uma configuração do dataset anexado."""
+    _, configs = _DATASET_TRABALHADOR
+    return key, funcao(configs[key]['colunas'], configs[key]['metadata'])
+
+
+def aplicar_esquema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte as colunas presentes para os tipos de ESQUEMA_TABELAS
+
+    Args:
+        df: Tabela compilada
+
+    Returns:
+        A tabela com os tipos do esquema (a própria, se já estiver nos tipos)
+    """
+    tipos = {coluna: tipo for coluna, tipo in ESQUEMA_TABELAS.items()
+             if coluna in df and df[coluna].dtype != tipo}
+    return df.astype(tipos) if tipos else df
+
+
+def calcular_duracao(df: pd.DataFrame, somente_duracoes: bool = False) -> pd.DataFrame:
+    """
+    Adiciona a coluna Duracao, subtraindo os arrays de tempo diretamente
+
+    Args:
+        df: Tabela compilada com Tempo Inicial e Tempo Final
+        somente_duracoes: Mantém só COLUNAS_MINIMAS e Duracao
+
+    Returns:
+        A tabela com a coluna Duracao
+    """
+    df['Duracao'] = np.subtract(df['Tempo Final'].to_numpy(), df['Tempo Inicial'].to_numpy())
+    if somente_duracoes:
+        df = df.drop(columns=[coluna for coluna in df.columns if coluna not in COLUNAS_MINIMAS + ('Duracao',)])
+    return df
+
+
+def ler_amostra_csv(arquivo: Path, n: int, semente: int = 42, linhas_por_bloco: int = 200_000,
+                    colunas: List[str] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Lê uma amostra aleatória simples de n linhas de um CSV, em streaming
+
+    Amostragem de reservatório por chaves: cada linha recebe uma chave
+    uniforme e ficam as n menores chaves vistas até o momento, então só o
+    reservatório e o bloco corrente ficam em memória. O gerador é semeado
+    com a semente e o nome do arquivo, de modo que a amostra se repete a
+    cada execução e não depende da ordem dos arquivos nem de linhas_por_bloco.
+
+    Args:
+        arquivo: Caminho do arquivo *_completo.csv
+        n: Número máximo de linhas da amostra
+        semente: Semente da amostragem
+        linhas_por_bloco: Linhas lidas por bloco do CSV
+        colunas: Colunas lidas (None = todas)
+
+    Returns:
+        (amostra na ordem original do arquivo, total de linhas do arquivo)
+    """
+    gerador = np.random.default_rng([semente, zlib.crc32(Path(arquivo).name.encode())])
+    reservatorio = None
+    chaves = np.empty(0)
+    total = 0
+
+    for bloco in pd.read_csv(arquivo, chunksize=linhas_por_bloco, usecols=colunas, dtype=ESQUEMA_TABELAS):
+        bloco.index = np.arange(total, total + len(bloco))
+        novas = gerador.random(len(bloco))
+        total += len(bloco)
+
+        # Com o reservatório cheio, só entram chaves menores que a maior guardada
+        if len(chaves) == n:
+            entram = novas < chaves.max()
+            bloco, novas = bloco[entram], novas[entram]
+
+        reservatorio = bloco if reservatorio is None else pd.concat((reservatorio, bloco))
+        chaves = np.concatenate((chaves, novas))
+        if len(chaves) > n:
+            manter = np.argpartition(chaves, n - 1)[:n]
+            reservatorio, chaves = reservatorio.iloc[manter], chaves[manter]
+
+    if reservatorio is None:
+        return pd.read_csv(arquivo, usecols=colunas), 0
+
+    # Categorias que diferem entre blocos voltam como texto na concatenação
+    return aplicar_esquema(reservatorio.sort_index().reset_index(drop=True)), total
+
+
+def meia_largura_quantis(valores: np.ndarray, quantis, z: float = Z_CONFIANCA) -> np.ndarray:
+    """
+    Meia largura do intervalo de confiança de quantis por estatísticas de ordem
+
+    O número de amostras abaixo do quantil q é Binomial(n, q), então os
+    postos n*q -/+ z*sqrt(n*q*(1-q)) delimitam o intervalo sem supor a
+    forma da distribuição. Postos fora da amostra são truncados nos
+    extremos (o intervalo de quantis muito altos fica subestimado).
+
+    Args:
+        valores: Amostra
+        quantis: Quantis (entre 0 e 1)
+        z: Quantil normal do nível de confiança
+
+    Returns:
+        Array com a meia largura de cada quantil
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    quantis = np.atleast_1d(np.asarray(quantis, dtype=np.float64))
+    n = len(valores)
+    if n < 2:
+        return np.full(len(quantis), np.nan)
+
+    desvio = z * np.sqrt(n * quantis * (1 - quantis))
+    baixo = np.clip(np.floor(n * quantis - desvio), 0, n - 1).astype(np.int64)
+    alto = np.clip(np.ceil(n * quantis + desvio), 0, n - 1).astype(np.int64)
+    parcial = np.partition(valores, np.unique(np.concatenate((baixo, alto))))
+
+    return (parcial[alto] - parcial[baixo]) / 2
+
+
+def ler_resumo(arquivo: Path) -> Dict:
+    """
+    Lê o resumo gravado na conversão ao lado de uma tabela compilada
+
+    Um resumo mais antigo que a tabela (tabela recompilada depois dele) é
+    ignorado.
+
+    Args:
+        arquivo: Caminho do arquivo *_completo.csv
+
+    Returns:
+        Dicionário do resumo, ou None se não houver resumo válido
+    """
+    arquivo = Path(arquivo)
+    resumo_file = arquivo.with_name(arquivo.name.replace('_completo.csv', SUFIXO_RESUMO))
+    if not resumo_file.exists() or resumo_file.stat().st_mtime < arquivo.stat().st_mtime:
+        return None
+
+    with open(resumo_file, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def quantil_ponderado(valores: np.ndarray, contagens: np.ndarray, q: float) -> float:
+    """
+    Quantil (interpolação linear, como pandas/numpy) de um histograma de valores
+
+    Equivale ao quantil do array com cada valor repetido pela sua contagem.
+
+    Args:
+        valores: Valores distintos em ordem crescente
+        contagens: Número de ocorrências de cada valor
+        q: Quantil (entre 0 e 1)
+
+    Returns:
+        O quantil q
+    """
+    acumulado = np.cumsum(contagens)
+    if len(acumulado) == 0 or acumulado[-1] == 0:
+        return np.nan
+
+    posicao = (acumulado[-1] - 1) * q
+    baixo = np.floor(posicao)
+    # Índice do valor na posição p (0-based) do array expandido
+    v_baixo, v_alto = valores[np.searchsorted(acumulado, [baixo + 1, min(baixo + 2, acumulado[-1])])]
+
+    return v_baixo + (v_alto - v_baixo) * (posicao - baixo)
+
+
+def estatisticas_caixa(valores: np.ndarray, contagens: np.ndarray) -> Dict[str, float]:
+    """
+    Estatísticas de um boxplot (quartis e bigodes a 1,5 IQR) de um histograma de valores
+
+    Args:
+        valores: Valores distintos em ordem crescente
+        contagens: Número de ocorrências de cada valor
+
+    Returns:
+        Dicionário com minimo, bigode_inferior, q1, mediana, q3, bigode_superior e maximo
+    """
+    q1, mediana, q3 = (quantil_ponderado(valores, contagens, q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+
+    return {
+        'minimo': float(valores[0]),
+        'bigode_inferior': float(valores[valores >= q1 - 1.5 * iqr][0]),
+        'q1': float(q1),
+        'mediana': float(mediana),
+        'q3': float(q3),
+        'bigode_superior': float(valores[valores <= q3 + 1.5 * iqr][-1]),
+        'maximo': float(valores[-1])
+    }
+
+
+def resumir_esboco(resumo: Dict) -> Dict[str, float]:
+    """
+    Agrega as durações de uma configuração a partir do seu resumo
+
+    Média e desvio saem da contagem, soma e soma dos quadrados; mínimo,
+    mediana e máximo são exatos (resumos sem a mediana usam o esboço de
+    quantis, exato quando o histograma não foi reduzido a centróides).
+
+    Args:
+        resumo: Resumo lido por ler_resumo
+
+    Returns:
+        Dicionário com media, mediana, desvio, minimo, maximo e contagem
+    """
+    n = resumo['contagem']
+    media = resumo['soma'] / n if n else np.nan
+    variancia = (resumo['soma_quadrados'] - resumo['soma'] * media) / (n - 1) if n > 1 else np.nan
+    esboco = resumo['esboco']
+    mediana = resumo.get('mediana')
+    if mediana is None:
+        mediana = quantil_ponderado(np.asarray(esboco['valores'], dtype=np.float64),
+                                    np.asarray(esboco['contagens'], dtype=np.int64), 0.5)
+
+    return {
+        'media': media,
+        'mediana': mediana,
+        'desvio': np.sqrt(max(variancia, 0.0)) if n > 1 else np.nan,
+        'minimo': np.nan if resumo['minimo'] is None else resumo['minimo'],
+        'maximo': np.nan if resumo['maximo'] is None else resumo['maximo'],
+        'contagem': n
+    }
+
+
+class EnginePandas:
+    """Engine de leitura e agregação com pandas (leitura concorrente, agregação single-thread)"""
+
+    nome = 'pandas'
+
+    def __init__(self, n_threads: int = None):
+        self.n_threads = n_threads or os.cpu_count()
+
+    def ler_tabela(self, arquivo: Path, somente_duracoes: bool = False) -> pd.DataFrame:
+        """
+        Lê uma tabela compilada com o esquema explícito e calcula a coluna Duracao
+
+        Se existir um <nome>_completo.parquet ao lado do CSV, ele é lido no
+        lugar do CSV (quando há pyarrow ou fastparquet instalado).
+
+        Args:
+            arquivo: Caminho do arquivo *_completo.csv
+            somente_duracoes: Lê só as colunas de rank e tempo e mantém só ranks e Duracao
+
+        Returns:
+            DataFrame pandas da configuração
+        """
+        colunas = list(COLUNAS_MINIMAS + COLUNAS_TEMPO) if somente_duracoes else None
+        binario = Path(arquivo).with_suffix('.parquet')
+        if binario.exists():
+            try:
+                return calcular_duracao(aplicar_esquema(pd.read_parquet(binario, columns=colunas)), somente_duracoes)
+            except ImportError:
+                pass
+
+        return calcular_duracao(pd.read_csv(arquivo, usecols=colunas, dtype=ESQUEMA_TABELAS), somente_duracoes)
+
+    def ler_tabelas(self, arquivos: List[Path], somente_duracoes: bool = False) -> List[pd.DataFrame]:
+        """
+        Lê os CSVs compilados em paralelo (o parser C do pandas libera o GIL)
+
+        Args:
+            arquivos: Caminhos dos arquivos *_completo.csv
+            somente_duracoes: Mantém só ranks e Duracao (ver ler_tabela)
+
+        Returns:
+            Lista de DataFrames pandas, na ordem de arquivos
+        """
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            return list(executor.map(lambda arquivo: self.ler_tabela(arquivo, somente_duracoes), arquivos))
+
+    def resumir(self, tabelas: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Agrega a coluna Duracao de cada configuração
+
+        Args:
+            tabelas: Dicionário key -> DataFrame da configuração
+
+        Returns:
+            DataFrame indexado por key com media, mediana, desvio, minimo, maximo e contagem
+        """
+        resumo = {}
+        for key, df in tabelas.items():
+            resumo[key] = {
+                'media': df['Duracao'].mean(),
+                'mediana': df['Duracao'].median(),
+                'desvio': df['Duracao'].std(),
+                'minimo': df['Duracao'].min(),
+                'maximo': df['Duracao'].max(),
+                'contagem': len(df)
+            }
+
+        return pd.DataFrame.from_dict(resumo, orient='index')
+
+
+class EnginePolars(EnginePandas):
+    """Engine colunar multi-thread com Polars (leitura e agregação em paralelo)"""
+
+    nome = 'polars'
+
+    def __init__(self, n_threads: int = None):
+        super().__init__(n_threads)
+        try:
+            import polars
+        except ImportError as erro:
+            raise ImportError("O engine 'polars' requer o pacote polars (pip install polars)") from erro
+        self.pl = polars
+
+    def ler_tabelas(self, arquivos: List[Path], somente_duracoes: bool = False) -> List[pd.DataFrame]:
+        pl = self.pl
+        consultas = []
+        for arquivo in arquivos:
+            consulta = pl.scan_csv(arquivo)
+            if somente_duracoes:
+                consulta = consulta.select(list(COLUNAS_MINIMAS + COLUNAS_TEMPO))
+            consulta = consulta.with_columns((pl.col('Tempo Final') - pl.col('Tempo Inicial')).alias('Duracao'))
+            if somente_duracoes:
+                consulta = consulta.drop(list(COLUNAS_TEMPO))
+            consultas.append(consulta)
+
+        # Todos os arquivos são lidos e processados em paralelo pelo Polars;
+        # a conversão é feita por coluna (não exige pyarrow)
+        return [aplicar_esquema(pd.DataFrame({coluna: tabela[coluna].to_numpy() for coluna in tabela.columns}))
+                for tabela in pl.collect_all(consultas)]
+
+    def resumir(self, tabelas: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        pl = self.pl
+        chaves = list(tabelas.keys())
+        tamanhos = [len(df) for df in tabelas.values()]
+
+        dados = pl.DataFrame({
+            'key': np.repeat(np.arange(len(chaves)), tamanhos),
+            'Duracao': np.concatenate([df['Duracao'].to_numpy(dtype=np.float64) for df in tabelas.values()])
+        })
+        agregado = dados.group_by('key').agg(
+            pl.col('Duracao').mean().alias('media'),
+            pl.col('Duracao').median().alias('mediana'),
+            pl.col('Duracao').std(ddof=1).alias('desvio'),
+            pl.col('Duracao').min().alias('minimo'),
+            pl.col('Duracao').max().alias('maximo'),
+            pl.len().alias('contagem')
+        ).sort('key')
+
+        resumo = pd.DataFrame({coluna: agregado[coluna].to_numpy()
+                               for coluna in ('media', 'mediana', 'desvio', 'minimo', 'maximo', 'contagem')})
+        resumo.index = [chaves[i] for i in agregado['key'].to_numpy()]
+
+        return resumo.reindex(chaves)
+
+
+# Engines de dataframe disponíveis (MPILogAnalyzer(engine=...))
+ENGINES = {
+    'pandas': EnginePandas,
+    'polars': EnginePolars,
+}
+
+
 class MPILogAnalyzer:
     """Analisador de logs MPI para diferentes configurações de rede"""
     
-    def __init__(self, csv_directory: str):
+    def __init__(self, csv_directory: str, engine: str = 'pandas', amostra: int = None, semente: int = 42,
+                 somente_duracoes: bool = False, resumos: bool = False):
         """
         Inicializa o analisador
         
         Args:
             csv_directory: Diretório contendo os arquivos CSV
+            engine: Engine de leitura/agregação ('pandas' ou 'polars')
+            amostra: Modo prévia: linhas amostradas por configuração, com
+                     figuras em resolução de rascunho e estimativas de erro
+                     no relatório (None = modo exato, todas as linhas)
+            semente: Semente da amostragem do modo prévia
+            somente_duracoes: Mantém só ranks e Duracao de cada mensagem (menos
+                              memória; as análises que usam os tempos ou a
+                              ação/estado ficam indisponíveis)
+            resumos: Usa o <nome>_resumo.json gravado na conversão no lugar das
+                     linhas: estatísticas básicas, escalabilidade e comparações
+                     saem só dos resumos, e as linhas só são lidas quando uma
+                     análise precisa delas (modo exato apenas)
         """
+        if resumos and amostra is not None:
+            raise ValueError("resumos=True só vale no modo exato (amostra=None)")
         self.csv_directory = Path(csv_directory)
+        self.engine = ENGINES[engine]()
+        self.amostra = amostra
+        self.semente = semente
+        self.dpi = DPI_FINAL if amostra is None else DPI_PREVIA
+        self.somente_duracoes = somente_duracoes
+        self.resumos = resumos
+        self.resumo = None
         self.data = {}
         self.results = {}
+        self.bootstrap = {}
+        self.concorrencia = {}
+        self.caminhos_criticos = {}
+        self.plataformas = {}
+        self.matrizes_saltos = {}
+        self.memoria_compartilhada = None
         
     def parse_filename(self, filename: str) -> Dict[str, str]:
         """
         Extrai informações do nome do arquivo
         
+        Formato: <padrão>_<topologia>_<tecnologia>_<nós>[_raiz<R>][_tam<B>]_completo.csv,
+        onde _raiz<R> é o root/master (argv[1]) dos benchmarks flex (sem ele,
+        os flex usam RAIZ_PADRAO e os demais padrões não têm raiz) e _tam<B>
+        o tamanho de mensagem em bytes (sem ele, TAMANHO_MENSAGEM_PADRAO).
+        
         Args:
             filename: Nome do arquivo CSV
             
         Returns:
             Dicionário com metadados extraídos
         """
-        pattern = r'(.+?)_(.+?)_(.+?)_(\d+)_completo\.csv'
+        pattern = r'(.+?)_(.+?)_(.+?)_(\d+)(?:_raiz(\d+))?(?:_tam(\d+))?_completo\.csv'
         match = re.match(pattern, filename)
         
         if match:
+            if match.group(5) is not None:
+                raiz = int(match.group(5))
+            else:
+                raiz = RAIZ_PADRAO if match.group(1) in PADROES_FLEX else None
             return {
                 'tipo_comunicacao': match.group(1),
                 'topologia': match.group(2),
                 'tecnologia': match.group(3),
                 'num_nos': int(match.group(4)),
+                'raiz': raiz,
+                'tamanho_mensagem': int(match.group(6)) if match.group(6) else TAMANHO_MENSAGEM_PADRAO,
                 'arquivo': filename
             }
         return None
     
+    def carregar_catalogo(self) -> Dict[Path, Path]:
+        """
+        Lê os apelidos do catálogo de tabelas compiladas, se houver
+
+        Um apelido é uma tabela de um trace equivalente (mesmo corpo) a outro
+        já compilado: não existe em disco e é lido da tabela original.
+
+        Returns:
+            Dicionário caminho do apelido -> caminho da tabela original
+        """
+        catalogo_file = self.csv_directory / ARQUIVO_CATALOGO
+        if not catalogo_file.exists():
+            return {}
+
+        catalogo = pd.read_csv(catalogo_file, keep_default_na=False)
+        apelidos = {}
+        for tabela, original in zip(catalogo['Tabela'], catalogo['Original']):
+            if not original:
+                continue
+            if (self.csv_directory / original).exists():
+                apelidos[self.csv_directory / tabela] = self.csv_directory / original
+            else:
+                print(f"Tabela original de {tabela} não encontrada: {original}")
+
+        return apelidos
+    
     def load_data(self):
         """Carrega todos os arquivos CSV do diretório"""
         csv_files = list(self.csv_directory.glob('*_completo.csv'))
+        apelidos = self.carregar_catalogo()
+        csv_files += [apelido for apelido in apelidos if apelido not in csv_files]
         
         if not csv_files:
             print(f"Nenhum arquivo CSV encontrado em {self.csv_directory}")
             return
         
-        print(f"Encontrados {len(csv_files)} arquivos CSV")
+        print(f"Encontrados {len(csv_files)} arquivos CSV" +
+              (f" ({len(apelidos)} apelidos de traces equivalentes)" if apelidos else ""))
+        self.bootstrap.clear()
+        self.resumo = None
+        
+        arquivos = [(f, self.parse_filename(f.name)) for f in csv_files]
+        arquivos = [(f, metadata) for f, metadata in arquivos if metadata]
         
-        for csv_file in csv_files:
-            metadata = self.parse_filename(csv_file.name)
+        # Apelidos reaproveitam a tabela original, lida uma única vez
+        reais = list(dict.fromkeys(apelidos.get(f, f) for f, _ in arquivos))
+        resumos = {}
+        if self.resumos:
+            # Tabelas com resumo válido não são lidas (ver carregar_linhas)
+            resumos = {real: resumo for real in reais if (resumo := ler_resumo(real)) is not None}
+            print(f"{len(resumos)} de {len(reais)} tabelas carregadas só pelo resumo")
+        if self.amostra is None:
+            sem_resumo = [real for real in reais if real not in resumos]
+            lidas = dict(zip(sem_resumo, self.engine.ler_tabelas(sem_resumo, self.somente_duracoes)))
+            lidas = [lidas.get(real) for real in reais]
+            lidas_totais = [len(df) if df is not None else resumos[real]['contagem'] for real, df in zip(reais, lidas)]
+        else:
+            # Modo prévia: cada configuração é um estrato com a sua própria amostra
+            colunas = list(COLUNAS_MINIMAS + COLUNAS_TEMPO) if self.somente_duracoes else None
+            with ThreadPoolExecutor() as executor:
+                amostras = list(executor.map(
+                    lambda csv_file: ler_amostra_csv(csv_file, self.amostra, self.semente, colunas=colunas), reais))
+            lidas = [calcular_duracao(df, self.somente_duracoes) for df, _ in amostras]
+            lidas_totais = [total for _, total in amostras]
+        
+        por_arquivo = dict(zip(reais, zip(lidas, lidas_totais)))
+        tabelas, totais = [], []
+        for csv_file, _ in arquivos:
+            df, total = por_arquivo[apelidos.get(csv_file, csv_file)]
+            tabelas.append(df if csv_file not in apelidos or df is None else df.copy(deep=False))
+            totais.append(total)
+        
+        for (csv_file, metadata), df, total in zip(arquivos, tabelas, totais):
+            # Cria chave única para identificar a configuração
+            key = f"{metadata['tipo_comunicacao']}_{metadata['topologia']}_{metadata['tecnologia']}_{metadata['num_nos']}"
             
-            if metadata:
-                df = pd.read_csv(csv_file)
-                
-                # Calcula duração da comunicação
-                df['Duracao'] = df['Tempo Final'] - df['Tempo Inicial']
-                
-                # Cria chave única para identificar a configuração
-                key = f"{metadata['tipo_comunicacao']}_{metadata['topologia']}_{metadata['tecnologia']}_{metadata['num_nos']}"
-                
-                self.data[key] = {
-                    'df': df,
-                    'metadata': metadata
-                }
-                
+            # As posições de raiz (no tamanho padrão) ficam em 'raizes' e os tamanhos
+            # de mensagem (na raiz padrão) em 'tamanhos'; as demais análises usam
+            # a raiz e o tamanho padrão (ou os menores carregados) em 'df'
+            entrada = self.data.setdefault(key, {'raizes': {}, 'tamanhos': {}})
+            raiz_padrao = metadata['raiz'] in (None, RAIZ_PADRAO)
+            tamanho_padrao = metadata['tamanho_mensagem'] == TAMANHO_MENSAGEM_PADRAO
+            if df is not None and metadata['raiz'] is not None and tamanho_padrao:
+                entrada['raizes'][metadata['raiz']] = df
+            if df is not None and raiz_padrao:
+                entrada['tamanhos'][metadata['tamanho_mensagem']] = df
+            
+            prioridade = lambda m: (m['raiz'] not in (None, RAIZ_PADRAO), m['tamanho_mensagem'] != TAMANHO_MENSAGEM_PADRAO,
+                                    m['raiz'] or 0, m['tamanho_mensagem'])
+            if 'metadata' in entrada and prioridade(entrada['metadata']) <= prioridade(metadata):
                 print(f"✓ Carregado: {csv_file.name}")
+                continue
+            
+            entrada['metadata'] = metadata
+            entrada['linhas_totais'] = total
+            entrada.pop('estados', None)
+            real = apelidos.get(csv_file, csv_file)
+            if df is None:
+                entrada.pop('df', None)
+                entrada['resumo'] = resumos[real]
+                print(f"✓ Carregado (resumo): {csv_file.name}")
+                continue
+            entrada['df'] = df
+            entrada.pop('resumo', None)
+            
+            # Intervalos de estado por rank, se o parser os exportou
+            estados_file = real.with_name(real.name.replace('_completo.csv', '_estados.csv'))
+            if estados_file.exists():
+                entrada['estados'] = pd.read_csv(estados_file)
+            
+            print(f"✓ Carregado: {csv_file.name}")
     
+    def carregar_linhas(self):
+        """
+        Lê as linhas das configurações carregadas só pelo resumo (resumos=True)
+
+        Chamado pelas análises que precisam de cada mensagem; sem efeito
+        quando todas as linhas já estão carregadas. As entradas existentes são
+        preenchidas no lugar, mantendo o que já foi associado a cada
+        configuração (como a plataforma de carregar_plataformas).
+        """
+        if all('df' in data for data in self.data.values()):
+            return
+
+        print("A análise requer as linhas das tabelas; lendo os CSVs compilados...")
+        resumos, self.resumos = self.resumos, False
+        # Sem o metadata, load_data reescolhe a tabela de cada configuração e grava df/estados
+        for data in self.data.values():
+            data.pop('metadata', None)
+        try:
+            self.load_data()
+        finally:
+            self.resumos = resumos
+
+    def resumir_duracoes(self) -> pd.DataFrame:
+        """
+        Agrega as durações de todas as configurações pelo engine configurado
+
+        Configurações carregadas só pelo resumo são agregadas por resumir_esboco.
+
+        Returns:
+            DataFrame indexado por key com media, mediana, desvio, minimo, maximo e contagem
+        """
+        if self.resumo is None:
+            tabelas = {key: data['df'] for key, data in self.data.items() if 'df' in data}
+            esbocos = {key: resumir_esboco(data['resumo']) for key, data in self.data.items() if 'df' not in data}
+            if not esbocos:
+                self.resumo = self.engine.resumir(tabelas)
+            else:
+                partes = [pd.DataFrame.from_dict(esbocos, orient='index')]
+                if tabelas:
+                    partes.insert(0, self.engine.resumir(tabelas))
+                self.resumo = pd.concat(partes).reindex(list(self.data))
+
+        return self.resumo
+
+    def erro_padrao_medias(self) -> pd.Series:
+        """
+        Erro padrão da duração média de cada configuração no modo prévia
+
+        Usa a correção de população finita (a amostra sai sem reposição do
+        total de linhas do arquivo), então o erro é zero no modo exato.
+
+        Returns:
+            Series indexada por key com o erro padrão da média
+        """
+        resumo = self.resumir_duracoes()
+        totais = pd.Series({key: data.get('linhas_totais', len(data['df'])) for key, data in self.data.items()})
+        fracao = resumo['contagem'] / totais.reindex(resumo.index)
+
+        return resumo['desvio'] / np.sqrt(resumo['contagem']) * np.sqrt((1 - fracao).clip(lower=0))
+
+    def _requer_modo_exato(self, analise: str) -> bool:
+        """
+        Indica (e avisa) que uma análise não pode ser estimada no modo prévia
+
+        Args:
+            analise: Nome da análise para a mensagem
+
+        Returns:
+            True se o analisador está no modo prévia
+        """
+        if self.amostra is None:
+            return False
+
+        print(f"{analise} requer todas as mensagens de cada chamada; disponível só no modo exato (amostra=None)")
+        return True
+
+    def _requer_colunas(self, analise: str, colunas: Tuple[str, ...]) -> bool:
+        """
+        Indica (e avisa) que uma análise precisa de colunas descartadas por somente_duracoes
+
+        Args:
+            analise: Nome da análise para a mensagem
+            colunas: Colunas necessárias
+
+        Returns:
+            True se alguma configuração não tem as colunas
+        """
+        faltando = [coluna for coluna in colunas if any(coluna not in data['df'] for data in self.data.values())]
+        if not faltando:
+            return False
+
+        print(f"{analise} requer as colunas {faltando}; carregue com somente_duracoes=False")
+        return True
+
     def calcular_estatisticas_basicas(self) -> pd.DataFrame:
         """
         Calcula estatísticas básicas para cada configuração
@@ -80,9 +900,12 @@ class MPILogAnalyzer:
             DataFrame com estatísticas resumidas
         """
         stats = []
+        resumo = self.resumir_duracoes()
+        if self.amostra is not None:
+            erros = self.erro_padrao_medias()
         
         for key, data in self.data.items():
-            df = data['df']
+            agg = resumo.loc[key]
             meta = data['metadata']
             
             stat = {
@@ -90,14 +913,23 @@ class MPILogAnalyzer:
                 'Topologia': meta['topologia'],
                 'Tecnologia': meta['tecnologia'],
                 'Nº Nós': meta['num_nos'],
-                'Tempo Médio (s)': df['Duracao'].mean(),
-                'Tempo Mediano (s)': df['Duracao'].median(),
-                'Desvio Padrão (s)': df['Duracao'].std(),
-                'Tempo Mínimo (s)': df['Duracao'].min(),
-                'Tempo Máximo (s)': df['Duracao'].max(),
-                'Total Comunicações': len(df)
+                'Tempo Médio (s)': agg['media'],
+                'Tempo Mediano (s)': agg['mediana'],
+                'Desvio Padrão (s)': agg['desvio'],
+                'Tempo Mínimo (s)': agg['minimo'],
+                'Tempo Máximo (s)': agg['maximo'],
+                'Total Comunicações': int(agg['contagem'])
             }
             
+            # Modo prévia: meias larguras dos intervalos de 95% e total real do arquivo
+            if self.amostra is not None:
+                n = int(agg['contagem'])
+                stat['Tempo Médio (s) ± IC95'] = Z_CONFIANCA * erros[key]
+                stat['Tempo Mediano (s) ± IC95'] = meia_largura_quantis(data['df']['Duracao'].to_numpy(), 0.5)[0]
+                stat['Desvio Padrão (s) ± IC95'] = Z_CONFIANCA * agg['desvio'] / np.sqrt(2 * (n - 1)) if n > 1 else np.nan
+                stat['Total Comunicações'] = data['linhas_totais']
+                stat['Linhas Amostradas'] = n
+            
             stats.append(stat)
         
         df_stats = pd.DataFrame(stats)
@@ -113,6 +945,8 @@ class MPILogAnalyzer:
             DataFrame com análise de escalabilidade
         """
         escala = []
+        medias = self.resumir_duracoes()['media']
+        erros = self.erro_padrao_medias() if self.amostra is not None else None
         
         # Agrupa por tipo, topologia e tecnologia
         configs = {}
@@ -125,7 +959,8 @@ class MPILogAnalyzer:
             
             configs[config_key].append({
                 'num_nos': meta['num_nos'],
-                'tempo_medio': data['df']['Duracao'].mean(),
+                'tempo_medio': medias[key],
+                'erro': erros[key] if erros is not None else 0.0,
                 'metadata': meta
             })
         
@@ -140,7 +975,7 @@ class MPILogAnalyzer:
                 variacao_percentual = ((proximo['tempo_medio'] - atual['tempo_medio']) / 
                                       atual['tempo_medio'] * 100)
                 
-                escala.append({
+                linha = {
                     'Tipo Comunicação': atual['metadata']['tipo_comunicacao'],
                     'Topologia': atual['metadata']['topologia'],
                     'Tecnologia': atual['metadata']['tecnologia'],
@@ -150,127 +985,1463 @@ class MPILogAnalyzer:
                     'Tempo Médio Final (s)': proximo['tempo_medio'],
                     'Variação (%)': variacao_percentual,
                     'Variação Absoluta (s)': proximo['tempo_medio'] - atual['tempo_medio']
-                })
+                }
+                
+                # Modo prévia: propagação dos erros das duas médias (método delta)
+                if erros is not None:
+                    razao = proximo['tempo_medio'] / atual['tempo_medio']
+                    relativo = np.hypot(atual['erro'] / atual['tempo_medio'], proximo['erro'] / proximo['tempo_medio'])
+                    linha['Variação (%) ± IC95'] = Z_CONFIANCA * 100 * razao * relativo
+                    linha['Variação Absoluta (s) ± IC95'] = Z_CONFIANCA * np.hypot(atual['erro'], proximo['erro'])
+                
+                escala.append(linha)
         
         df_escala = pd.DataFrame(escala)
         self.results['escalabilidade'] = df_escala
         
         return df_escala
-    
-    def comparar_tecnologias(self) -> pd.DataFrame:
+
+    def calcular_bootstrap_medias(self, n_reamostras: int = 1000, semente: int = 42,
+                                  chaves: List[str] = None) -> Tuple[List[str], np.ndarray]:
         """
-        Compara diferentes tecnologias de interconexão
-        
+        Calcula a distribuição bootstrap do tempo médio das configurações
+
+        O histograma das durações de cada configuração é comprimido em até
+        GRUPOS_BOOTSTRAP grupos de mesma contagem (_histograma_comprimido) e
+        reamostrado pelo bootstrap de Poisson: cada grupo recebe peso
+        ~ Poisson(contagem), e a soma dos valores sorteados dentro dele é a
+        média do grupo vezes o peso mais um termo normal com a variância do
+        grupo vezes o peso. É uma aproximação do bootstrap sobre as mensagens
+        (exata nos dois primeiros momentos da soma reamostrada; com até
+        GRUPOS_BOOTSTRAP valores distintos, é o próprio bootstrap).
+
+        Os histogramas comprimidos são empilhados num array (configurações,
+        grupos), completado com contagem zero, e todas as configurações são
+        reamostradas juntas, em lotes de reamostragens, com uma chamada ao
+        gerador de Poisson por lote. O custo é n_reamostras x configurações
+        x grupos, independente do número de mensagens.
+
+        Args:
+            n_reamostras: Número de reamostragens bootstrap
+            semente: Semente do gerador aleatório
+            chaves: Configurações reamostradas (padrão: todas)
+
+        Returns:
+            Tupla (chaves, medias) onde medias tem forma (n_reamostras, n_configurações)
+        """
+        chaves = list(self.data.keys()) if chaves is None else list(chaves)
+        cache = self.bootstrap.get((n_reamostras, semente, tuple(chaves)))
+        if cache is not None:
+            return chaves, cache
+
+        # Histogramas comprimidos empilhados: (configurações, grupos)
+        valores = np.zeros((len(chaves), GRUPOS_BOOTSTRAP))
+        variancias = np.zeros((len(chaves), GRUPOS_BOOTSTRAP))
+        contagens = np.zeros((len(chaves), GRUPOS_BOOTSTRAP))
+        for i, key in enumerate(chaves):
+            medias_grupo, variancias_grupo, contagens_grupo = self._histograma_comprimido(key)
+            valores[i, :len(medias_grupo)] = medias_grupo
+            variancias[i, :len(medias_grupo)] = variancias_grupo
+            contagens[i, :len(medias_grupo)] = contagens_grupo
+
+        rng = np.random.default_rng(semente)
+        medias = np.empty((n_reamostras, len(chaves)))
+
+        # Lotes limitam a memória a ~lote x configurações x grupos
+        lote = max(1, min(n_reamostras, 2_000_000 // max(1, contagens.size)))
+        for ini in range(0, n_reamostras, lote):
+            fim = min(ini + lote, n_reamostras)
+            pesos = rng.poisson(contagens, size=(fim - ini,) + contagens.shape).astype(np.float64)
+            somas = (np.einsum('rcg,cg->rc', pesos, valores) +
+                     np.sqrt(np.einsum('rcg,cg->rc', pesos, variancias)) * rng.standard_normal((fim - ini, len(chaves))))
+            totais = pesos.sum(axis=2)
+            medias[ini:fim] = np.divide(somas, totais, out=np.full_like(somas, np.nan), where=totais > 0)
+
+        self.bootstrap[(n_reamostras, semente, tuple(chaves))] = medias
+
+        return chaves, medias
+
+    def _histograma_comprimido(self, key: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Reduz o histograma das durações a até GRUPOS_BOOTSTRAP grupos
+
+        Os valores distintos (ordenados) são cortados em faixas contíguas de
+        contagem aproximadamente igual; com poucos valores distintos, cada
+        valor é um grupo (variância zero) e nada se perde.
+
+        Args:
+            key: Configuração
+
+        Returns:
+            Tupla (medias, variancias, contagens) de cada grupo
+        """
+        valores, contagens = self._histograma_duracoes(key)
+        contagens = contagens.astype(np.float64)
+        if len(valores) <= GRUPOS_BOOTSTRAP:
+            return valores, np.zeros_like(valores), contagens
+
+        acumulado = np.cumsum(contagens)
+        cortes = np.searchsorted(acumulado, acumulado[-1] * np.arange(1, GRUPOS_BOOTSTRAP) / GRUPOS_BOOTSTRAP,
+                                 side='right')
+        inicios = np.unique(np.concatenate(([0], cortes[cortes < len(valores)])))
+        totais = np.add.reduceat(contagens, inicios)
+        medias = np.add.reduceat(contagens * valores, inicios) / totais
+        grupo = np.repeat(np.arange(len(inicios)), np.diff(np.append(inicios, len(valores))))
+        variancias = np.add.reduceat(contagens * (valores - medias[grupo]) ** 2, inicios) / totais
+
+        return medias, variancias, totais
+
+    def _histograma_duracoes(self, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Valores distintos das durações (arredondadas a 1 ns) e suas contagens
+
+        Configurações carregadas só pelo resumo usam o esboço gravado na
+        conversão, que é este mesmo histograma (ou a sua redução a centróides).
+
+        Args:
+            key: Configuração
+
+        Returns:
+            Tupla (valores, contagens)
+        """
+        data = self.data[key]
+        if 'df' not in data:
+            esboco = data['resumo']['esboco']
+            valores = np.round(np.asarray(esboco['valores'], dtype=np.float64), 9)
+            unicos, inverso = np.unique(valores, return_inverse=True)
+            return unicos, np.bincount(inverso, weights=esboco['contagens']).astype(np.int64)
+
+        duracoes = np.round(data['df']['Duracao'].to_numpy(dtype=np.float64), 9)
+        return np.unique(duracoes, return_counts=True)
+
+    def tabela_configuracoes(self) -> pd.DataFrame:
+        """
+        Tabela agregada das configurações carregadas, base das comparações
+
+        Returns:
+            DataFrame com uma linha por configuração (na ordem de self.data):
+            os eixos de EIXOS_COMPARACAO, a chave, a média e a contagem
+        """
+        resumo = self.resumir_duracoes()
+        tabela = pd.DataFrame([{eixo: data['metadata'][eixo] for eixo in EIXOS_COMPARACAO}
+                               for data in self.data.values()])
+        tabela['chave'] = list(self.data)
+        tabela['media'] = resumo['media'].reindex(tabela['chave']).to_numpy()
+        tabela['contagem'] = resumo['contagem'].reindex(tabela['chave']).to_numpy()
+
+        return tabela
+
+    def _intervalos_diferencas(self, celula: np.ndarray, peso: np.ndarray, idx1: np.ndarray, idx2: np.ndarray,
+                               n_reamostras: int, semente: int, nivel: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        IC da diferença (média da célula 2 - média da célula 1) de cada par
+
+        Uma célula junta configurações com peso (contagem / total da célula),
+        e a sua média é a média ponderada das médias delas. O intervalo é o
+        bootstrap dessa média (calcular_bootstrap_medias) e, com resumos=True,
+        a aproximação normal pelos erros padrão do resumo, sem reamostrar os
+        histogramas.
+
+        Args:
+            celula: Célula de cada configuração (na ordem de self.data)
+            peso: Peso de cada configuração na sua célula
+            idx1: Célula 1 de cada par
+            idx2: Célula 2 de cada par
+            n_reamostras: Número de reamostragens bootstrap
+            semente: Semente do gerador aleatório
+            nivel: Nível de confiança do intervalo
+
+        Returns:
+            Tupla (inferior, superior) com um valor por par
+        """
+        ordem = np.argsort(celula, kind='stable')
+        inicios = np.flatnonzero(np.r_[True, np.diff(celula[ordem]) != 0])
+        alfa = (1 - nivel) / 2
+
+        if self.resumos:
+            resumo = self.resumir_duracoes().reindex(list(self.data))
+            medias = np.add.reduceat(resumo['media'].to_numpy()[ordem] * peso[ordem], inicios)
+            erros = (resumo['desvio'] / np.sqrt(resumo['contagem'])).to_numpy()
+            erros = np.sqrt(np.add.reduceat((erros[ordem] * peso[ordem]) ** 2, inicios))
+            diferencas = medias[idx2] - medias[idx1]
+            meia_largura = NormalDist().inv_cdf(1 - alfa) * np.hypot(erros[idx1], erros[idx2])
+            return diferencas - meia_largura, diferencas + meia_largura
+
+        # Só as configurações de células que aparecem em algum par são reamostradas
+        chaves = list(self.data)
+        necessarias = np.isin(celula, np.union1d(idx1, idx2))
+        medias = np.full((n_reamostras, len(chaves)), np.nan)
+        medias[:, necessarias] = self.calcular_bootstrap_medias(
+            n_reamostras, semente, [key for key, usada in zip(chaves, necessarias) if usada])[1]
+        medias = np.add.reduceat(medias[:, ordem] * peso[ordem], inicios, axis=1)
+
+        # Todos os pares de uma vez: (n_reamostras, n_pares)
+        diferencas = medias[:, idx2] - medias[:, idx1]
+        inferior, superior = np.nanquantile(diferencas, [alfa, 1 - alfa], axis=0)
+
+        return inferior, superior
+
+    def comparar(self, eixo: str, fixos: Tuple[str, ...] = None, referencia=None,
+                 n_reamostras: int = 1000, semente: int = 42) -> pd.DataFrame:
+        """
+        Compara as configurações ao longo de um eixo, com outros eixos fixos
+
+        Os eixos são os campos de metadata em EIXOS_COMPARACAO. Configurações
+        com os mesmos valores dos eixos fixos formam um grupo; dentro dele,
+        as que têm o mesmo valor do eixo comparado formam uma célula, cuja
+        média junta as mensagens delas (média das médias ponderada pela
+        contagem; sem eixos livres, cada célula é uma configuração). Os pares
+        saem de uma junção da tabela de células consigo mesma pelo grupo,
+        sem laços por par: todos os pares de valores do eixo (na ordem em que
+        aparecem) ou, com referencia, cada valor contra ela.
+
+        Cada par recebe o intervalo de confiança bootstrap (95%) da diferença
+        entre os tempos médios e a indicação de significância (Melhor é
+        sempre o lado de menor média; Significativo diz se a diferença é real).
+
+        Args:
+            eixo: Eixo comparado (ex.: 'tecnologia', 'num_nos')
+            fixos: Eixos mantidos fixos (padrão: todos os demais)
+            referencia: Valor do eixo usado como base de todos os pares
+                        (None = todos os pares)
+            n_reamostras: Número de reamostragens bootstrap
+            semente: Semente do gerador aleatório
+
+        Returns:
+            DataFrame com uma linha por par: eixos fixos, valor e tempo médio de
+            cada lado, melhor, diferença percentual e absoluta e o IC
+        """
+        if fixos is None:
+            fixos = tuple(outro for outro in EIXOS_COMPARACAO if outro != eixo)
+        fixos = list(fixos)
+        tabela = self.tabela_configuracoes()
+        if tabela.empty:
+            return pd.DataFrame()
+
+        # Grupos e células na ordem em que aparecem em self.data
+        tabela['grupo'] = tabela.groupby(fixos, sort=False).ngroup() if fixos else 0
+        tabela['celula'] = tabela.groupby(['grupo', eixo], sort=False).ngroup()
+        tabela['peso'] = tabela['contagem'] / tabela.groupby('celula')['contagem'].transform('sum')
+        tabela['ponderada'] = tabela['media'] * tabela['peso']
+
+        celulas = tabela.groupby('celula', sort=True).agg(
+            **{coluna: (coluna, 'first') for coluna in fixos + [eixo, 'grupo']},
+            media=('ponderada', 'sum'))
+        celulas['celula'] = celulas.index
+        celulas['posicao'] = celulas.groupby('grupo').cumcount()
+
+        lados = celulas[['grupo', 'celula', 'posicao', eixo, 'media']]
+        pares = celulas[fixos + ['grupo', 'celula', 'posicao', eixo, 'media']].merge(
+            lados, on='grupo', suffixes=('_1', '_2'))
+        if referencia is None:
+            pares = pares[pares['posicao_1'] < pares['posicao_2']]
+        else:
+            pares = pares[(pares[f'{eixo}_1'] == referencia) & (pares[f'{eixo}_2'] != referencia)]
+        pares = pares.sort_values(['grupo', 'posicao_1', 'posicao_2'], kind='stable')
+        if pares.empty:
+            return pd.DataFrame()
+
+        rotulo = EIXOS_COMPARACAO[eixo]
+        tempo1 = pares['media_1'].to_numpy()
+        tempo2 = pares['media_2'].to_numpy()
+        df_comp = pd.DataFrame({EIXOS_COMPARACAO[fixo]: pares[fixo].to_numpy() for fixo in fixos})
+        df_comp[f'{rotulo} 1'] = pares[f'{eixo}_1'].to_numpy()
+        df_comp['Tempo Médio 1 (s)'] = tempo1
+        df_comp[f'{rotulo} 2'] = pares[f'{eixo}_2'].to_numpy()
+        df_comp['Tempo Médio 2 (s)'] = tempo2
+        df_comp['Melhor'] = np.where(tempo1 < tempo2, df_comp[f'{rotulo} 1'], df_comp[f'{rotulo} 2'])
+        df_comp['Diferença (%)'] = np.abs((tempo2 - tempo1) / tempo1 * 100)
+        df_comp['Diferença Absoluta (s)'] = np.abs(tempo2 - tempo1)
+
+        inferior, superior = self._intervalos_diferencas(
+            tabela['celula'].to_numpy(), tabela['peso'].to_numpy(),
+            pares['celula_1'].to_numpy(), pares['celula_2'].to_numpy(), n_reamostras, semente)
+        df_comp['IC95% Inf. Diferença (s)'] = inferior
+        df_comp['IC95% Sup. Diferença (s)'] = superior
+        df_comp['Significativo'] = np.where((inferior > 0) | (superior < 0), 'Sim', 'Não')
+        df_comp['Método do IC'] = 'normal (resumos)' if self.resumos else 'bootstrap aproximado'
+
+        return df_comp
+
+    def comparar_tecnologias(self, n_reamostras: int = 1000, semente: int = 42) -> pd.DataFrame:
+        """
+        Compara diferentes tecnologias de interconexão
+
+        Todos os pares de tecnologias com tipo, topologia e número de nós
+        fixos (ver comparar).
+
+        Args:
+            n_reamostras: Número de reamostragens bootstrap
+            semente: Semente do gerador aleatório
+
+        Returns:
+            DataFrame com comparação entre tecnologias
+        """
+        df_comp = self.comparar('tecnologia', n_reamostras=n_reamostras, semente=semente)
+        self.results['comparacao_tecnologias'] = df_comp
+
+        return df_comp
+
+    def comparar_topologias(self, n_reamostras: int = 1000, semente: int = 42) -> pd.DataFrame:
+        """
+        Compara diferentes topologias de rede
+
+        Todos os pares de topologias com tipo, tecnologia e número de nós
+        fixos (ver comparar).
+
+        Args:
+            n_reamostras: Número de reamostragens bootstrap
+            semente: Semente do gerador aleatório
+
+        Returns:
+            DataFrame com comparação entre topologias
+        """
+        df_comp = self.comparar('topologia', n_reamostras=n_reamostras, semente=semente)
+        self.results['comparacao_topologias'] = df_comp
+
+        return df_comp
+
+    def analisar_latencia_cauda(self, quantis: Tuple[float, ...] = (0.9, 0.99, 0.999),
+                                n_piores: int = 10) -> pd.DataFrame:
+        """
+        Analisa a latência de cauda (quantis altos) de cada configuração
+
+        Todas as estatísticas de ordem (mediana, quantis e máximo) de uma
+        configuração saem de uma única chamada a np.partition, sem ordenar
+        a série inteira. As n_piores mensagens de cada configuração são
+        guardadas em self.results['piores_mensagens'] com ranks e tempos,
+        para localizar no trace as causas de uma cauda ruim.
+
+        Args:
+            quantis: Quantis a reportar (entre 0 e 1)
+            n_piores: Número de piores mensagens listadas por configuração
+
+        Returns:
+            DataFrame com os quantis de cauda por configuração
+        """
+        self.carregar_linhas()
+        cauda = []
+        piores = []
+        probs = np.array([0.5] + list(quantis))
+
+        for key, data in self.data.items():
+            df = data['df']
+            meta = data['metadata']
+            duracoes = df['Duracao'].to_numpy(dtype=np.float64)
+            n = len(duracoes)
+            if n == 0:
+                continue
+
+            # Posições (interpolação linear) de todos os quantis + máximo
+            posicoes = (n - 1) * probs
+            baixo = np.floor(posicoes).astype(np.int64)
+            alto = np.minimum(baixo + 1, n - 1)
+            kth = np.unique(np.concatenate((baixo, alto, [n - 1])))
+            parcial = np.partition(duracoes, kth)
+
+            fracao = posicoes - baixo
+            valores = parcial[baixo] * (1 - fracao) + parcial[alto] * fracao
+            mediana = valores[0]
+            maximo = parcial[n - 1]
+
+            stat = {
+                'Tipo Comunicação': meta['tipo_comunicacao'],
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Tempo Mediano (s)': mediana,
+            }
+            for q, valor in zip(quantis, valores[1:]):
+                stat[f'p{q * 100:g} (s)'] = valor
+            stat['Tempo Máximo (s)'] = maximo
+            stat['Máximo/Mediana'] = maximo / mediana if mediana > 0 else np.nan
+
+            # Modo prévia: intervalos dos quantis (o máximo é o da amostra, um limite inferior)
+            if self.amostra is not None:
+                larguras = meia_largura_quantis(duracoes, probs)
+                stat['Tempo Mediano (s) ± IC95'] = larguras[0]
+                for q, largura in zip(quantis, larguras[1:]):
+                    stat[f'p{q * 100:g} (s) ± IC95'] = largura
+            cauda.append(stat)
+
+            # Piores mensagens: seleção parcial das k maiores durações
+            k = min(n_piores, n)
+            idx = np.argpartition(duracoes, n - k)[n - k:]
+            idx = idx[np.argsort(duracoes[idx])[::-1]]
+            for posicao, i in enumerate(idx, start=1):
+                linha = df.iloc[i]
+                piores.append({
+                    'Tipo Comunicação': meta['tipo_comunicacao'],
+                    'Topologia': meta['topologia'],
+                    'Tecnologia': meta['tecnologia'],
+                    'Nº Nós': meta['num_nos'],
+                    'Posição': posicao,
+                    'Rank Origem': linha['Rank Origem'],
+                    'Rank Destino': linha['Rank Destino'],
+                    'Tempo Inicial': linha.get('Tempo Inicial', np.nan),
+                    'Tempo Final': linha.get('Tempo Final', np.nan),
+                    'Duração (s)': duracoes[i],
+                    'Duração/Mediana': duracoes[i] / mediana if mediana > 0 else np.nan
+                })
+
+        df_cauda = pd.DataFrame(cauda)
+        self.results['latencia_cauda'] = df_cauda
+        self.results['piores_mensagens'] = pd.DataFrame(piores)
+
+        return df_cauda
+
+    def gerar_graficos_cauda(self, output_dir: str = 'graficos'):
+        """
+        Gera um gráfico de latência de cauda por padrão de comunicação
+
+        Args:
+            output_dir: Diretório para salvar os gráficos
+        """
+        if 'latencia_cauda' not in self.results:
+            self.analisar_latencia_cauda()
+
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+
+        sns.set_style("whitegrid")
+
+        df_cauda = self.results['latencia_cauda']
+        colunas = [c for c in df_cauda.columns
+                   if (c.startswith('Tempo Mediano') or c.startswith('p')) and not c.endswith('± IC95')]
+        colunas.append('Tempo Máximo (s)')
+
+        for padrao, df_padrao in df_cauda.groupby('Tipo Comunicação'):
+            df_padrao = df_padrao.sort_values(['Tecnologia', 'Topologia', 'Nº Nós'])
+            labels = [f"{r['Topologia']}\n{r['Tecnologia']}\n{r['Nº Nós']}n" for _, r in df_padrao.iterrows()]
+
+            fig, ax = plt.subplots(figsize=(max(10, 0.6 * len(labels)), 7))
+            largura = 0.8 / len(colunas)
+            x = np.arange(len(labels))
+
+            for i, coluna in enumerate(colunas):
+                # Modo prévia: a meia largura do IC95 do quantil vira barra de erro
+                erro = df_padrao.get(f'{coluna} ± IC95')
+                ax.bar(x + i * largura, df_padrao[coluna], width=largura,
+                       yerr=erro, capsize=2 if erro is not None else 0,
+                       label=coluna.replace(' (s)', ''), alpha=0.8)
+
+            ax.set_yscale('log')
+            ax.set_xticks(x + largura * (len(colunas) - 1) / 2)
+            ax.set_xticklabels(labels, rotation=90, fontsize=9)
+            ax.set_ylabel('Duração (s)', fontsize=14)
+            ax.set_title(f'Latência de Cauda - {padrao.upper()}', fontsize=14, fontweight='bold')
+            ax.grid(True, alpha=0.3, axis='y')
+            ax.legend(fontsize=9, loc='best')
+
+            plt.tight_layout()
+            plt.savefig(output_path / f'cauda_{padrao}.png', dpi=self.dpi, bbox_inches='tight')
+            plt.close()
+
+        print(f"\n✓ Gráficos de cauda salvos em: {output_path}")
+        print(f"  - cauda_[padrao].png (um para cada padrão)")
+
+    def analisar_concorrencia(self, n_intervalos: int = 200) -> pd.DataFrame:
+        """
+        Analisa quantas mensagens estão em trânsito ao longo do tempo
+
+        Para cada configuração, os eventos de início (+1) e fim (-1) de todas
+        as mensagens são ordenados e acumulados (cumsum), o que dá o nível de
+        concorrência em cada instante sem laços em Python. A linha do tempo é
+        reduzida a n_intervalos intervalos (concorrência média ponderada pelo
+        tempo e taxa de conclusão de mensagens) e guardada em self.concorrencia.
+
+        Args:
+            n_intervalos: Número de intervalos da linha do tempo
+
+        Returns:
+            DataFrame com concorrência de pico e média por configuração
+        """
+        self.carregar_linhas()
+        resumo = []
+        self.concorrencia = {}
+        if self._requer_modo_exato('A concorrência') or self._requer_colunas('A concorrência', COLUNAS_TEMPO):
+            self.results['concorrencia'] = pd.DataFrame()
+            return self.results['concorrencia']
+
+        for key, data in self.data.items():
+            df = data['df']
+            meta = data['metadata']
+            if df.empty:
+                continue
+
+            inicio = df['Tempo Inicial'].to_numpy(dtype=np.float64)
+            fim = df['Tempo Final'].to_numpy(dtype=np.float64)
+
+            # Eventos ordenados por tempo; no mesmo instante o fim (-1) vem antes do início (+1)
+            tempos = np.concatenate((inicio, fim))
+            deltas = np.concatenate((np.ones(len(inicio), dtype=np.int64),
+                                     -np.ones(len(fim), dtype=np.int64)))
+            ordem = np.lexsort((deltas, tempos))
+            tempos = tempos[ordem]
+            nivel = np.cumsum(deltas[ordem])
+
+            t0, t1 = tempos[0], tempos[-1]
+            duracao_total = t1 - t0
+
+            # Integral do nível no tempo (nível constante entre eventos consecutivos)
+            integral = np.concatenate(([0.0], np.cumsum(nivel[:-1] * np.diff(tempos))))
+            media = integral[-1] / duracao_total if duracao_total > 0 else float(nivel.max())
+            ocupado = np.sum(np.diff(tempos)[nivel[:-1] > 0])
+
+            bordas = np.linspace(t0, t1, n_intervalos + 1)
+            largura = bordas[1] - bordas[0] if duracao_total > 0 else 1.0
+            concorrencia_media = np.diff(np.interp(bordas, tempos, integral)) / largura
+            conclusoes, _ = np.histogram(fim, bins=bordas)
+
+            self.concorrencia[key] = {
+                'tempo': (bordas[:-1] + bordas[1:]) / 2,
+                'concorrencia': concorrencia_media,
+                'taxa_conclusao': conclusoes / largura,
+                'metadata': meta
+            }
+
+            resumo.append({
+                'Tipo Comunicação': meta['tipo_comunicacao'],
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Concorrência Máxima': int(nivel.max()),
+                'Concorrência Média': media,
+                'Ocupação da Rede (%)': ocupado / duracao_total * 100 if duracao_total > 0 else np.nan,
+                'Duração Total (s)': duracao_total,
+                'Taxa Média de Conclusão (msg/s)': len(fim) / duracao_total if duracao_total > 0 else np.nan
+            })
+
+        df_conc = pd.DataFrame(resumo)
+        self.results['concorrencia'] = df_conc
+
+        return df_conc
+
+    def gerar_graficos_concorrencia(self, output_dir: str = 'graficos'):
+        """
+        Gera as linhas do tempo de concorrência e de taxa de conclusão por padrão
+
+        Args:
+            output_dir: Diretório para salvar os gráficos
+        """
+        if not self.concorrencia:
+            self.analisar_concorrencia()
+
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+
+        sns.set_style("whitegrid")
+
+        padroes = {}
+        for key, linha in self.concorrencia.items():
+            padroes.setdefault(linha['metadata']['tipo_comunicacao'], []).append(linha)
+
+        for padrao, linhas in sorted(padroes.items()):
+            nos_list = sorted(set(l['metadata']['num_nos'] for l in linhas))
+
+            fig, axes = plt.subplots(2, len(nos_list), figsize=(7*len(nos_list), 9), squeeze=False)
+
+            for idx, num_nos in enumerate(nos_list):
+                for linha in sorted(linhas, key=lambda l: (l['metadata']['topologia'], l['metadata']['tecnologia'])):
+                    meta = linha['metadata']
+                    if meta['num_nos'] != num_nos:
+                        continue
+                    label = f"{meta['topologia']}-{meta['tecnologia']}"
+                    axes[0][idx].plot(linha['tempo'], linha['concorrencia'], linewidth=1, label=label, alpha=0.8)
+                    axes[1][idx].plot(linha['tempo'], linha['taxa_conclusao'], linewidth=1, label=label, alpha=0.8)
+
+                axes[0][idx].set_title(f'{num_nos} Nós', fontsize=12)
+                axes[0][idx].set_ylabel('Mensagens em trânsito', fontsize=11)
+                axes[1][idx].set_ylabel('Conclusões (msg/s)', fontsize=11)
+                axes[1][idx].set_xlabel('Tempo (s)', fontsize=11)
+                axes[0][idx].grid(True, alpha=0.3)
+                axes[1][idx].grid(True, alpha=0.3)
+                axes[0][idx].legend(fontsize=8, loc='best')
+
+            plt.suptitle(f'Concorrência ao Longo do Tempo - {padrao.upper()}',
+                        fontsize=14, fontweight='bold', y=1.02)
+            plt.tight_layout()
+            plt.savefig(output_path / f'concorrencia_{padrao}.png', dpi=self.dpi, bbox_inches='tight')
+            plt.close()
+
+        print(f"\n✓ Gráficos de concorrência salvos em: {output_path}")
+        print(f"  - concorrencia_[padrao].png (um para cada padrão)")
+
+    def analisar_desbalanceamento(self) -> pd.DataFrame:
+        """
+        Analisa a defasagem de chegada dos ranks em cada chamada coletiva
+
+        Usa os intervalos de estado exportados pelo parser (arquivos
+        *_estados.csv). Para cada chamada (estado, índice da chamada), a
+        defasagem é a diferença entre a última e a primeira entrada, e a
+        espera de cada rank é o tempo entre sua entrada e a chegada do último
+        rank (limitada à sua saída). Tudo é calculado com groupby/transform,
+        separando o custo de rede do desbalanceamento entre ranks.
+
+        Returns:
+            DataFrame com defasagem e espera por configuração
+        """
+        self.carregar_linhas()
+        resumo = []
+        por_rank = []
+
+        for key, data in self.data.items():
+            if 'estados' not in data:
+                continue
+
+            meta = data['metadata']
+            est = data['estados']
+            est = est[est['Estado'].isin(ESTADOS_COLETIVOS)]
+            if est.empty:
+                continue
+
+            entrada = est['Tempo Entrada']
+            saida = est['Tempo Saída']
+            chamada = est.groupby(['Estado', 'Chamada'])
+
+            primeira = chamada['Tempo Entrada'].transform('min')
+            ultima = chamada['Tempo Entrada'].transform('max')
+            espera = np.minimum(ultima, saida) - entrada
+            atraso = entrada - primeira
+            permanencia = saida - entrada
+
+            por_chamada = pd.DataFrame({
+                'defasagem': ultima - primeira,
+                'duracao': chamada['Tempo Saída'].transform('max') - primeira,
+                'Estado': est['Estado'],
+                'Chamada': est['Chamada']
+            }).drop_duplicates(['Estado', 'Chamada'])
+
+            ranks = pd.DataFrame({
+                'Rank': est['Rank'],
+                'espera': espera,
+                'atraso': atraso
+            }).groupby('Rank').mean()
+
+            resumo.append({
+                'Tipo Comunicação': meta['tipo_comunicacao'],
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Chamadas': len(por_chamada),
+                'Defasagem Média (s)': por_chamada['defasagem'].mean(),
+                'Defasagem Máxima (s)': por_chamada['defasagem'].max(),
+                'Duração Média da Chamada (s)': por_chamada['duracao'].mean(),
+                'Espera Média por Rank (s)': espera.mean(),
+                'Fração de Espera (%)': espera.sum() / permanencia.sum() * 100 if permanencia.sum() > 0 else np.nan,
+                'Rank Mais Atrasado': ranks['atraso'].idxmax()
+            })
+
+            for rank, linha in ranks.iterrows():
+                por_rank.append({
+                    'Tipo Comunicação': meta['tipo_comunicacao'],
+                    'Topologia': meta['topologia'],
+                    'Tecnologia': meta['tecnologia'],
+                    'Nº Nós': meta['num_nos'],
+                    'Rank': rank,
+                    'Espera Média (s)': linha['espera'],
+                    'Atraso Médio de Chegada (s)': linha['atraso']
+                })
+
+        if not resumo:
+            print("Nenhum arquivo *_estados.csv carregado; gere-os com analisar_trace_completo(..., retornar_estados=True)")
+
+        df_desb = pd.DataFrame(resumo)
+        self.results['desbalanceamento'] = df_desb
+        self.results['espera_por_rank'] = pd.DataFrame(por_rank)
+
+        return df_desb
+
+    def analisar_caminho_critico(self) -> pd.DataFrame:
+        """
+        Extrai o caminho crítico de cada chamada coletiva
+
+        Cada par (origem, destino) troca exatamente uma mensagem por chamada,
+        então a k-ésima mensagem do par (em ordem de início) pertence à
+        chamada k. Uma mensagem enviada pelo rank r depende da última
+        mensagem recebida por r, na mesma chamada, que terminou até o seu
+        início (merge_asof por chamada e rank). O caminho crítico parte da
+        mensagem que termina por último e segue as dependências para trás
+        (sem repetir mensagens: duas mensagens de duração zero podem ser
+        predecessoras uma da outra). Os caminhos de cada configuração ficam
+        em self.caminhos_criticos.
+
+        O trânsito de cada salto é a menor duração do seu par (origem,
+        destino) entre todas as chamadas, o tempo do par sem contenção; o
+        restante do comprimento do caminho é espera (contenção, sincronização
+        e intervalos entre mensagens).
+
+        Returns:
+            DataFrame com comprimento, saltos e ranks do caminho crítico por configuração
+        """
+        self.carregar_linhas()
+        resultados = []
+        self.caminhos_criticos = {}
+        if (self._requer_modo_exato('O caminho crítico') or
+                self._requer_colunas('O caminho crítico', COLUNAS_TEMPO + ('Ação da Origem',))):
+            self.results['caminho_critico'] = pd.DataFrame()
+            return self.results['caminho_critico']
+
+        for key, data in self.data.items():
+            meta = data['metadata']
+            df = data['df']
+            if df.empty or not df['Ação da Origem'].isin(ESTADOS_COLETIVOS).all():
+                continue
+
+            msgs = pd.DataFrame({
+                'origem': df['Rank Origem'].to_numpy(),
+                'destino': df['Rank Destino'].to_numpy(),
+                'inicio': df['Tempo Inicial'].to_numpy(dtype=np.float64),
+                'fim': df['Tempo Final'].to_numpy(dtype=np.float64)
+            })
+            msgs['id'] = np.arange(len(msgs))
+            msgs = msgs.sort_values(['inicio', 'id'], kind='stable')
+            msgs['chamada'] = msgs.groupby(['origem', 'destino']).cumcount()
+
+            # Predecessor: última mensagem recebida pela origem, na chamada, até o início
+            recebidas = (msgs[['chamada', 'destino', 'fim', 'id']]
+                         .rename(columns={'destino': 'origem', 'id': 'predecessor'})
+                         .sort_values('fim', kind='stable'))
+            msgs = pd.merge_asof(msgs, recebidas, left_on='inicio', right_on='fim',
+                                 by=['chamada', 'origem'], suffixes=('', '_pred'),
+                                 direction='backward', allow_exact_matches=True)
+
+            msgs = msgs.sort_values('id')
+            # Trânsito de cada mensagem: menor duração do seu par entre as chamadas
+            transito = (msgs['fim'] - msgs['inicio']).groupby([msgs['origem'], msgs['destino']]).transform('min')
+            transito = transito.to_numpy()
+            origem = msgs['origem'].to_numpy()
+            destino = msgs['destino'].to_numpy()
+            inicio = msgs['inicio'].to_numpy()
+            fim = msgs['fim'].to_numpy()
+            predecessor = msgs['predecessor'].fillna(-1).to_numpy(dtype=np.int64)
+
+            por_chamada = msgs.groupby('chamada')
+            ultima = por_chamada['fim'].idxmax().to_numpy()
+            abertura = por_chamada['inicio'].min().to_numpy()
+
+            caminhos = []
+            for chamada, atual in enumerate(ultima):
+                ids = [atual]
+                visitadas = {atual}
+                while predecessor[ids[-1]] >= 0 and predecessor[ids[-1]] not in visitadas:
+                    ids.append(predecessor[ids[-1]])
+                    visitadas.add(ids[-1])
+                ids = np.array(ids[::-1])
+                ranks = [origem[ids[0]]] + list(destino[ids])
+
+                caminhos.append({
+                    'Chamada': chamada,
+                    'Comprimento (s)': fim[ids[-1]] - inicio[ids[0]],
+                    'Duração da Chamada (s)': fim[ids[-1]] - abertura[chamada],
+                    'Tempo em Trânsito (s)': transito[ids].sum(),
+                    'Tempo em Espera (s)': fim[ids[-1]] - inicio[ids[0]] - transito[ids].sum(),
+                    'Saltos': len(ids),
+                    'Ranks': ' -> '.join(str(r) for r in ranks)
+                })
+
+            df_caminhos = pd.DataFrame(caminhos)
+            self.caminhos_criticos[key] = df_caminhos
+
+            comprimento = df_caminhos['Comprimento (s)']
+            resultados.append({
+                'Tipo Comunicação': meta['tipo_comunicacao'],
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Chamadas': len(df_caminhos),
+                'Comprimento Médio (s)': comprimento.mean(),
+                'Comprimento Máximo (s)': comprimento.max(),
+                'Fração em Trânsito (%)': df_caminhos['Tempo em Trânsito (s)'].sum() / comprimento.sum() * 100
+                                          if comprimento.sum() > 0 else np.nan,
+                'Saltos Médios': df_caminhos['Saltos'].mean(),
+                'Caminho Mais Frequente': df_caminhos['Ranks'].mode().iloc[0]
+            })
+
+        df_cc = pd.DataFrame(resultados)
+        self.results['caminho_critico'] = df_cc
+
+        return df_cc
+
+    def analisar_sensibilidade_raiz(self) -> pd.DataFrame:
+        """
+        Analisa a sensibilidade do tempo de conclusão à posição da raiz (flex)
+
+        Junta todas as posições de raiz de todas as configurações numa única
+        tabela e calcula, numa passada agrupada, o tempo de cada iteração (a
+        k-ésima mensagem de cada par origem/destino pertence à iteração k) e
+        sua média por (configuração, raiz). Com carregar_plataformas(), cada
+        raiz ganha o nó que ocupa e sua distância média (saltos) aos demais.
+
+        Returns:
+            DataFrame com melhor/pior raiz e dispersão por configuração
+        """
+        self.carregar_linhas()
+        if (self._requer_modo_exato('O tempo por iteração de cada raiz') or
+                self._requer_colunas('O tempo por iteração de cada raiz', COLUNAS_TEMPO)):
+            self.results['sensibilidade_raiz'] = pd.DataFrame()
+            self.results['tempo_por_raiz'] = pd.DataFrame()
+            return self.results['sensibilidade_raiz']
+
+        partes = []
+        for key, data in self.data.items():
+            for raiz, df in data.get('raizes', {}).items():
+                partes.append(pd.DataFrame({
+                    'key': key,
+                    'raiz': raiz,
+                    'origem': df['Rank Origem'].to_numpy(),
+                    'destino': df['Rank Destino'].to_numpy(),
+                    'inicio': df['Tempo Inicial'].to_numpy(dtype=np.float64),
+                    'fim': df['Tempo Final'].to_numpy(dtype=np.float64)
+                }))
+
+        if not partes:
+            print("Nenhuma configuração com posição de raiz (padrões flex) carregada")
+            self.results['sensibilidade_raiz'] = pd.DataFrame()
+            self.results['tempo_por_raiz'] = pd.DataFrame()
+            return self.results['sensibilidade_raiz']
+
+        msgs = pd.concat(partes, ignore_index=True).sort_values('inicio', kind='stable')
+        msgs['iteracao'] = msgs.groupby(['key', 'raiz', 'origem', 'destino'], sort=False).cumcount()
+
+        iteracoes = msgs.groupby(['key', 'raiz', 'iteracao'], sort=False).agg(inicio=('inicio', 'min'),
+                                                                             fim=('fim', 'max'))
+        iteracoes['tempo'] = iteracoes['fim'] - iteracoes['inicio']
+        por_raiz = (iteracoes.groupby(['key', 'raiz'])['tempo']
+                    .agg(['mean', 'median', 'max', 'count'])
+                    .reset_index())
+
+        linhas = []
+        for _, linha in por_raiz.iterrows():
+            data = self.data[linha['key']]
+            meta = data['metadata']
+            registro = {
+                'Tipo Comunicação': meta['tipo_comunicacao'],
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Raiz': int(linha['raiz']),
+                'Iterações': int(linha['count']),
+                'Tempo Médio por Iteração (s)': linha['mean'],
+                'Tempo Mediano por Iteração (s)': linha['median'],
+                'Tempo Máximo por Iteração (s)': linha['max']
+            }
+            if 'plataforma' in data:
+                mapa = data['plataforma']['mapa_ranks']
+                no = mapa[int(linha['raiz'])]
+                outros = np.delete(mapa, int(linha['raiz']))
+                registro['Nó da Raiz'] = int(no)
+                registro['Saltos Médios da Raiz'] = data['plataforma']['saltos'][no, outros].mean()
+            linhas.append(registro)
+
+        df_raiz = pd.DataFrame(linhas).sort_values(['Tipo Comunicação', 'Topologia', 'Tecnologia', 'Nº Nós', 'Raiz'])
+
+        resumo = []
+        colunas_config = ['Tipo Comunicação', 'Topologia', 'Tecnologia', 'Nº Nós']
+        for config, grupo in df_raiz.groupby(colunas_config):
+            tempo = grupo['Tempo Médio por Iteração (s)']
+            melhor = grupo.loc[tempo.idxmin()]
+            pior = grupo.loc[tempo.idxmax()]
+            registro = dict(zip(colunas_config, config))
+            registro.update({
+                'Raízes': len(grupo),
+                'Melhor Raiz': int(melhor['Raiz']),
+                'Melhor Tempo (s)': melhor['Tempo Médio por Iteração (s)'],
+                'Pior Raiz': int(pior['Raiz']),
+                'Pior Tempo (s)': pior['Tempo Médio por Iteração (s)'],
+                'Dispersão (%)': (tempo.max() - tempo.min()) / tempo.min() * 100 if tempo.min() > 0 else np.nan,
+                'Coef. Variação (%)': tempo.std() / tempo.mean() * 100 if len(grupo) > 1 else np.nan
+            })
+            if 'Saltos Médios da Raiz' in grupo and grupo['Saltos Médios da Raiz'].nunique() > 1 and len(grupo) > 2:
+                registro['Correlação Saltos x Tempo'] = grupo['Saltos Médios da Raiz'].corr(tempo)
+            resumo.append(registro)
+
+        df_sens = pd.DataFrame(resumo)
+        self.results['sensibilidade_raiz'] = df_sens
+        self.results['tempo_por_raiz'] = df_raiz
+
+        return df_sens
+
+    def gerar_graficos_raiz(self, output_dir: str = 'graficos'):
+        """
+        Gera um gráfico por topologia do tempo por iteração em função da raiz
+
+        Args:
+            output_dir: Diretório para salvar os gráficos
+        """
+        if 'tempo_por_raiz' not in self.results:
+            self.analisar_sensibilidade_raiz()
+
+        df_raiz = self.results['tempo_por_raiz']
+        if df_raiz.empty:
+            return
+
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+
+        sns.set_style("whitegrid")
+
+        for topologia, df_topo in df_raiz.groupby('Topologia'):
+            padroes = sorted(df_topo['Tipo Comunicação'].unique())
+
+            fig, axes = plt.subplots(1, len(padroes), figsize=(7*len(padroes), 5), squeeze=False)
+
+            for idx, padrao in enumerate(padroes):
+                ax = axes[0][idx]
+                df_padrao = df_topo[df_topo['Tipo Comunicação'] == padrao]
+                for (tecnologia, num_nos), grupo in df_padrao.groupby(['Tecnologia', 'Nº Nós']):
+                    ax.plot(grupo['Raiz'], grupo['Tempo Médio por Iteração (s)'], marker='o',
+                            linewidth=1.5, label=f"{tecnologia}-{num_nos}n", alpha=0.8)
+
+                ax.set_title(padrao.upper(), fontsize=12)
+                ax.set_xlabel('Rank da Raiz', fontsize=11)
+                ax.set_ylabel('Tempo Médio por Iteração (s)', fontsize=11)
+                ax.set_yscale('log')
+                ax.grid(True, alpha=0.3)
+                ax.legend(fontsize=8, loc='best')
+
+            plt.suptitle(f'Sensibilidade à Posição da Raiz - {topologia.upper()}',
+                        fontsize=14, fontweight='bold', y=1.02)
+            plt.tight_layout()
+            plt.savefig(output_path / f'raiz_{topologia}.png', dpi=self.dpi, bbox_inches='tight')
+            plt.close()
+
+        print(f"\n✓ Gráficos de sensibilidade à raiz salvos em: {output_path}")
+        print(f"  - raiz_[topologia].png (um para cada topologia)")
+
+    def analisar_tamanho_mensagem(self) -> pd.DataFrame:
+        """
+        Gera as curvas de latência e banda efetiva em função do tamanho da mensagem
+
+        O tamanho vem da coluna 'Tamanho (bytes)' (traces com display-sizes)
+        ou do sufixo _tam<B> do arquivo. Todas as mensagens de todas as
+        configurações e tamanhos são agrupadas numa única passada; para cada
+        configuração com ao menos dois tamanhos são calculados a banda de
+        pico, o ponto de meia banda medido (interpolado em log do tamanho) e o
+        ajuste de Hockney t(m) = t0 + m / r_inf, com n_1/2 = t0 * r_inf.
+
+        Returns:
+            DataFrame com banda de pico e ponto de meia banda por configuração
+        """
+        self.carregar_linhas()
+        partes = []
+        for key, data in self.data.items():
+            for tamanho, df in data.get('tamanhos', {}).items():
+                partes.append(pd.DataFrame({
+                    'key': key,
+                    'tamanho': (df['Tamanho (bytes)'].to_numpy(dtype=np.int64) if 'Tamanho (bytes)' in df
+                                else np.full(len(df), tamanho, dtype=np.int64)),
+                    'duracao': df['Duracao'].to_numpy(dtype=np.float64)
+                }))
+
+        curvas = pd.DataFrame()
+        if partes:
+            msgs = pd.concat(partes, ignore_index=True)
+            msgs = msgs[msgs['duracao'] > 0]
+            curvas = (msgs.groupby(['key', 'tamanho'])['duracao']
+                      .agg(['mean', 'median', 'count'])
+                      .reset_index())
+            curvas = curvas[curvas.groupby('key')['tamanho'].transform('size') >= 2].reset_index(drop=True)
+
+        if curvas.empty:
+            print("Nenhuma configuração com mais de um tamanho de mensagem carregada")
+            self.results['curvas_tamanho'] = pd.DataFrame()
+            self.results['banda_efetiva'] = pd.DataFrame()
+            return self.results['banda_efetiva']
+
+        curvas['banda'] = curvas['tamanho'] / curvas['median']
+        por_config = curvas.groupby('key', sort=False)
+        pico = por_config['banda'].transform('max')
+
+        # Meia banda medida: primeiro tamanho com banda >= pico/2, interpolado com o anterior
+        acima = curvas[curvas['banda'] >= pico / 2].groupby('key').head(1)
+        anterior = curvas.groupby('key')[['tamanho', 'banda']].shift().loc[acima.index]
+        log_m, log_m0 = np.log2(acima['tamanho']), np.log2(anterior['tamanho'])
+        fracao = (pico[acima.index] / 2 - anterior['banda']) / (acima['banda'] - anterior['banda'])
+        meia_banda = pd.Series(np.where(anterior['tamanho'].notna(), 2 ** (log_m0 + fracao * (log_m - log_m0)),
+                                        acima['tamanho']), index=acima['key'].to_numpy())
+
+        # Ajuste de Hockney por mínimos quadrados, com somas agrupadas
+        somas = curvas.assign(mt=curvas['tamanho'] * curvas['median'],
+                              mm=curvas['tamanho'].astype(np.float64) ** 2).groupby('key', sort=False)
+        n = somas.size()
+        sm, st = somas['tamanho'].sum(), somas['median'].sum()
+        smt, smm = somas['mt'].sum(), somas['mm'].sum()
+        inclinacao = (n * smt - sm * st) / (n * smm - sm ** 2)
+        t0 = (st - inclinacao * sm) / n
+        r_inf = 1 / inclinacao
+
+        resumo = []
+        for key, grupo in por_config:
+            meta = self.data[key]['metadata']
+            resumo.append({
+                'Tipo Comunicação': meta['tipo_comunicacao'],
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Tamanhos': len(grupo),
+                'Menor Tamanho (B)': grupo['tamanho'].min(),
+                'Maior Tamanho (B)': grupo['tamanho'].max(),
+                'Latência no Menor Tamanho (s)': grupo['median'].iloc[0],
+                'Banda de Pico (B/s)': grupo['banda'].max(),
+                'Meia Banda Medida (B)': meia_banda[key],
+                'Hockney t0 (s)': t0[key],
+                'Hockney r_inf (B/s)': r_inf[key] if inclinacao[key] > 0 else np.nan,
+                'Hockney n_1/2 (B)': t0[key] * r_inf[key] if inclinacao[key] > 0 and t0[key] > 0 else np.nan
+            })
+
+        linhas = []
+        for _, linha in curvas.iterrows():
+            meta = self.data[linha['key']]['metadata']
+            linhas.append({
+                'Tipo Comunicação': meta['tipo_comunicacao'],
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Tamanho (B)': int(linha['tamanho']),
+                'Mensagens': int(linha['count']),
+                'Latência Média (s)': linha['mean'],
+                'Latência Mediana (s)': linha['median'],
+                'Banda Efetiva (B/s)': linha['banda']
+            })
+
+        # Modo prévia: intervalos da latência média e mediana de cada tamanho; a
+        # banda efetiva herda o erro relativo da mediana
+        if self.amostra is not None and linhas:
+            erros = (msgs.groupby(['key', 'tamanho'])['duracao']
+                     .agg(desvio='std', largura=lambda d: meia_largura_quantis(d.to_numpy(), 0.5)[0])
+                     .reindex(pd.MultiIndex.from_frame(curvas[['key', 'tamanho']])))
+            for linha, desvio, largura in zip(linhas, erros['desvio'], erros['largura']):
+                linha['Latência Média (s) ± IC95'] = Z_CONFIANCA * desvio / np.sqrt(linha['Mensagens'])
+                linha['Latência Mediana (s) ± IC95'] = largura
+                linha['Banda Efetiva (B/s) ± IC95'] = linha['Banda Efetiva (B/s)'] * largura / linha['Latência Mediana (s)']
+
+        df_banda = pd.DataFrame(resumo)
+        self.results['curvas_tamanho'] = pd.DataFrame(linhas)
+        self.results['banda_efetiva'] = df_banda
+
+        return df_banda
+
+    def gerar_graficos_tamanho(self, output_dir: str = 'graficos'):
+        """
+        Gera as curvas de latência e banda efetiva por tamanho, uma figura por padrão
+
+        Args:
+            output_dir: Diretório para salvar os gráficos
+        """
+        if 'curvas_tamanho' not in self.results:
+            self.analisar_tamanho_mensagem()
+
+        curvas = self.results['curvas_tamanho']
+        if curvas.empty:
+            return
+
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+
+        sns.set_style("whitegrid")
+        resumo = self.results['banda_efetiva']
+        colunas_config = ['Topologia', 'Tecnologia', 'Nº Nós']
+
+        for padrao, df_padrao in curvas.groupby('Tipo Comunicação'):
+            fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+            for config, grupo in df_padrao.groupby(colunas_config):
+                label = f"{config[0]}-{config[1]}-{config[2]}n"
+                linha, = axes[0].plot(grupo['Tamanho (B)'], grupo['Latência Mediana (s)'], marker='o',
+                                      linewidth=1.5, label=label, alpha=0.8)
+                axes[1].plot(grupo['Tamanho (B)'], grupo['Banda Efetiva (B/s)'], marker='o',
+                             linewidth=1.5, label=label, alpha=0.8, color=linha.get_color())
+
+                filtro = (resumo['Tipo Comunicação'] == padrao)
+                for coluna, valor in zip(colunas_config, config):
+                    filtro &= resumo[coluna] == valor
+                meia_banda = resumo.loc[filtro, 'Meia Banda Medida (B)'].iloc[0]
+                if np.isfinite(meia_banda):
+                    axes[1].axvline(meia_banda, color=linha.get_color(), linestyle=':', linewidth=1)
+
+            axes[0].set_xscale('log', base=2)
+            axes[0].set_yscale('log')
+            axes[0].set_xlabel('Tamanho da Mensagem (bytes)', fontsize=11)
+            axes[0].set_ylabel('Latência Mediana (s)', fontsize=11)
+            axes[0].set_title('Latência x Tamanho', fontsize=12)
+            axes[1].set_xscale('log', base=2)
+            axes[1].set_xlabel('Tamanho da Mensagem (bytes)', fontsize=11)
+            axes[1].set_ylabel('Banda Efetiva (B/s)', fontsize=11)
+            axes[1].set_title('Banda Efetiva x Tamanho (pontilhado: meia banda)', fontsize=12)
+            for ax in axes:
+                ax.grid(True, alpha=0.3)
+                ax.legend(fontsize=8, loc='best')
+
+            plt.suptitle(f'Varredura de Tamanho de Mensagem - {padrao.upper()}',
+                        fontsize=14, fontweight='bold', y=1.02)
+            plt.tight_layout()
+            plt.savefig(output_path / f'tamanho_{padrao}.png', dpi=self.dpi, bbox_inches='tight')
+            plt.close()
+
+        print(f"\n✓ Gráficos de varredura de tamanho salvos em: {output_path}")
+        print(f"  - tamanho_[padrao].png (um para cada padrão)")
+
+    def publicar_memoria_compartilhada(self) -> Dict:
+        """
+        Copia as colunas de comunicação de todas as configurações para um bloco de memória compartilhada
+
+        O descritor retornado é pequeno (nome do bloco, offsets, tipos e
+        metadados) e pode ser enviado a processos trabalhadores, que anexam
+        as colunas com anexar_memoria_compartilhada sem copiá-las.
+
+        Returns:
+            Descritor do dataset compartilhado
+        """
+        from multiprocessing import shared_memory
+
+        self.carregar_linhas()
+        self.liberar_memoria_compartilhada()
+
+        layout = {}
+        offset = 0
+        for key, data in self.data.items():
+            colunas = {}
+            for coluna, dtype in COLUNAS_COMPARTILHADAS.items():
+                if coluna not in data['df']:
+                    continue
+                tamanho = len(data['df'])
+                colunas[coluna] = (offset, np.dtype(dtype).str, tamanho)
+                # Alinha cada coluna em 8 bytes
+                offset += -(-tamanho * np.dtype(dtype).itemsize // 8) * 8
+            layout[key] = {'colunas': colunas, 'metadata': data['metadata']}
+
+        bloco = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for key, data in self.data.items():
+            for coluna, (inicio, dtype, tamanho) in layout[key]['colunas'].items():
+                destino = np.ndarray((tamanho,), dtype=dtype, buffer=bloco.buf, offset=inicio)
+                destino[:] = data['df'][coluna].to_numpy()
+
+        self.memoria_compartilhada = bloco
+        descritor = {'nome': bloco.name, 'tamanho': offset, 'configs': layout}
+
+        print(f"✓ Dataset publicado em memória compartilhada: {bloco.name} ({offset / 2**20:.1f} MiB)")
+
+        return descritor
+
+    def liberar_memoria_compartilhada(self):
+        """Libera o bloco de memória compartilhada publicado, se houver"""
+        bloco = self.memoria_compartilhada
+        if bloco is not None:
+            bloco.close()
+            bloco.unlink()
+            self.memoria_compartilhada = None
+
+    def executar_em_paralelo(self, funcao, n_processos: int = None) -> Dict:
+        """
+        Executa funcao(colunas, metadata) para cada configuração em vários processos
+
+        Os trabalhadores anexam o dataset compartilhado uma vez, na
+        inicialização; cada tarefa recebe apenas a chave da configuração.
+        funcao deve ser definida no nível do módulo (picklable) e receber
+        um dicionário coluna -> array numpy (somente leitura) e os metadados.
+
+        Args:
+            funcao: Função aplicada a cada configuração
+            n_processos: Número de processos (padrão: número de CPUs)
+
+        Returns:
+            Dicionário key -> resultado de funcao
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        descritor = self.publicar_memoria_compartilhada()
+        try:
+            with ProcessPoolExecutor(max_workers=n_processos,
+                                     initializer=_inicializar_trabalhador,
+                                     initargs=(descritor,)) as executor:
+                futuros = [executor.submit(_executar_tarefa, funcao, key) for key in self.data]
+                return dict(f.result() for f in futuros)
+        finally:
+            self.liberar_memoria_compartilhada()
+
+    def carregar_plataformas(self, diretorio_simulacao: str) -> pd.DataFrame:
+        """
+        Carrega o catálogo de plataformas (platform.xml/hostfile.txt) das configurações
+
+        Procura <diretorio_simulacao>/<topologia>/<tecnologia>/<nós>/platform.xml
+        para cada configuração carregada e anexa os parâmetros (e a matriz de
+        saltos entre nós) em self.data[key]['plataforma'].
+
+        Cada diretório é lido uma única vez (os padrões de comunicação de uma
+        mesma plataforma compartilham o dicionário) e a matriz de saltos é
+        calculada uma vez por topologia SimGrid (tipo, topo_parameters e nós).
+        A plataforma também guarda 'saltos_ranks', a matriz de saltos entre
+        ranks pelo mapeamento do hostfile.
+
+        Args:
+            diretorio_simulacao: Diretório da campanha (ex.: ../simulacao2)
+
         Returns:
-            DataFrame com comparação entre tecnologias
+            DataFrame com o catálogo de parâmetros por configuração
         """
-        comp = []
-        
-        # Agrupa por tipo, topologia e número de nós
-        configs = {}
+        base = Path(diretorio_simulacao)
+        catalogo = []
+
         for key, data in self.data.items():
             meta = data['metadata']
-            config_key = f"{meta['tipo_comunicacao']}_{meta['topologia']}_{meta['num_nos']}"
-            
-            if config_key not in configs:
-                configs[config_key] = {}
-            
-            configs[config_key][meta['tecnologia']] = {
-                'tempo_medio': data['df']['Duracao'].mean(),
-                'metadata': meta
-            }
-        
-        # Compara tecnologias
-        for config_key, tecnologias in configs.items():
-            if len(tecnologias) > 1:
-                techs = list(tecnologias.keys())
-                
-                for i in range(len(techs)):
-                    for j in range(i + 1, len(techs)):
-                        tech1 = techs[i]
-                        tech2 = techs[j]
-                        
-                        tempo1 = tecnologias[tech1]['tempo_medio']
-                        tempo2 = tecnologias[tech2]['tempo_medio']
-                        
-                        melhor = tech1 if tempo1 < tempo2 else tech2
-                        diferenca_percentual = abs((tempo2 - tempo1) / tempo1 * 100)
-                        
-                        comp.append({
-                            'Tipo Comunicação': tecnologias[tech1]['metadata']['tipo_comunicacao'],
-                            'Topologia': tecnologias[tech1]['metadata']['topologia'],
-                            'Nº Nós': tecnologias[tech1]['metadata']['num_nos'],
-                            'Tecnologia 1': tech1,
-                            'Tempo Médio 1 (s)': tempo1,
-                            'Tecnologia 2': tech2,
-                            'Tempo Médio 2 (s)': tempo2,
-                            'Melhor': melhor,
-                            'Diferença (%)': diferenca_percentual,
-                            'Diferença Absoluta (s)': abs(tempo2 - tempo1)
-                        })
-        
-        df_comp = pd.DataFrame(comp)
-        self.results['comparacao_tecnologias'] = df_comp
-        
-        return df_comp
-    
-    def comparar_topologias(self) -> pd.DataFrame:
+            diretorio = base / meta['topologia'] / meta['tecnologia'] / str(meta['num_nos'])
+            if not (diretorio / 'platform.xml').exists():
+                continue
+
+            if diretorio not in self.plataformas:
+                plataforma = carregar_plataforma(diretorio)
+                topologia = (plataforma['topologia'], plataforma['topo_parameters'], plataforma['num_nos'])
+                if topologia not in self.matrizes_saltos:
+                    self.matrizes_saltos[topologia] = matriz_saltos(plataforma)
+                plataforma['saltos'] = self.matrizes_saltos[topologia]
+                mapa = plataforma['mapa_ranks']
+                plataforma['saltos_ranks'] = plataforma['saltos'][np.ix_(mapa, mapa)]
+                self.plataformas[diretorio] = plataforma
+
+            plataforma = self.plataformas[diretorio]
+            data['plataforma'] = plataforma
+
+            catalogo.append({
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Topologia SimGrid': plataforma['topologia'],
+                'Parâmetros': plataforma['topo_parameters'],
+                'Banda (B/s)': plataforma['banda'],
+                'Latência (s)': plataforma['latencia'],
+                'Banda Backbone (B/s)': plataforma['banda_backbone'],
+                'Latência Backbone (s)': plataforma['latencia_backbone'],
+                'Saltos Máximos': int(plataforma['saltos'].max())
+            })
+
+        print(f"✓ Plataformas carregadas: {len(catalogo)} de {len(self.data)} configurações")
+
+        df_catalogo = pd.DataFrame(catalogo).drop_duplicates(['Topologia', 'Tecnologia', 'Nº Nós'])
+        self.results['plataformas'] = df_catalogo
+
+        return df_catalogo
+
+    def _saltos_mensagens(self, data: Dict) -> np.ndarray:
+        """Saltos entre origem e destino de cada mensagem da configuração (container do trace = rank + 1)"""
+        df = data['df']
+        return data['plataforma']['saltos_ranks'][df['Rank Origem'].to_numpy() - 1, df['Rank Destino'].to_numpy() - 1]
+
+    def _limite_mensagens(self, plataforma: Dict, saltos: np.ndarray, tamanho: int) -> np.ndarray:
+        """Limite inferior de duração (latência x saltos + tamanho / banda de gargalo)"""
+        banda = plataforma['banda']
+        if plataforma['banda_backbone'] is not None:
+            banda = min(banda, plataforma['banda_backbone'])
+        latencia_extra = plataforma['latencia_backbone'] if plataforma['topologia'] == 'FLAT' else 0.0
+
+        return np.where(saltos > 0,
+                        saltos * plataforma['latencia'] + latencia_extra + tamanho / banda,
+                        plataforma['latencia_loopback'] + tamanho / plataforma['banda_loopback'])
+
+    def _limite_chamada(self, padrao: str, plataforma: Dict, tamanho: int, iteracoes: int) -> float:
         """
-        Compara diferentes topologias de rede
-        
+        Limite inferior do tempo médio por chamada do benchmark
+
+        Chamadas consecutivas podem se sobrepor (o root de um bcast retorna
+        antes dos demais), então o limite de uma execução é o caminho de uma
+        chamada completa mais (iterações - 1) vezes o gargalo de vazão por
+        chamada; o resultado é dividido pelo número de iterações.
+        """
+        n = plataforma['num_nos']
+        limites = self._limite_mensagens(plataforma, plataforma['saltos'], tamanho)
+        fora_diagonal = ~np.eye(n, dtype=bool)
+        mensagem_minima = limites[fora_diagonal].min()
+        transmissao = tamanho / plataforma['banda']
+        profundidade = int(np.ceil(np.log2(n)))
+
+        if padrao.startswith('bcast') or padrao.startswith('reduce'):
+            # Árvore binomial: root envia/recebe profundidade mensagens por chamada
+            caminho, vazao = profundidade * mensagem_minima, profundidade * transmissao
+        elif padrao.startswith('gather') or padrao.startswith('scatter'):
+            # Root recebe/envia n - 1 mensagens pelo seu enlace
+            vazao = (n - 1) * transmissao
+            caminho = max(profundidade * mensagem_minima, vazao + mensagem_minima - transmissao)
+        elif padrao.startswith('all2all'):
+            vazao = (n - 1) * transmissao
+            caminho = vazao + mensagem_minima - transmissao
+        elif padrao.startswith('pingpong'):
+            # Master (rank 0) troca ida e volta, em sequência, com cada um dos demais
+            master = plataforma['mapa_ranks'][0]
+            caminho = 2 * (limites[master].sum() - limites[master, master])
+            vazao = caminho
+        else:
+            return np.nan
+
+        return (caminho + (iteracoes - 1) * vazao) / iteracoes
+
+    def analisar_eficiencia(self, tamanho_mensagem: int = TAMANHO_MENSAGEM_PADRAO,
+                            iteracoes: int = ITERACOES_PADRAO) -> pd.DataFrame:
+        """
+        Compara as durações medidas com o limite teórico da plataforma
+
+        Para cada mensagem, o limite é latência x saltos (+ backbone) mais o
+        tempo de transmissão na banda de gargalo; para cada chamada, um limite
+        por padrão (árvore binomial, gargalo no root, all-to-all ou ping-pong
+        sequencial) que admite sobreposição entre iterações. Eficiência = limite / medido, comparável entre tecnologias.
+        Requer carregar_plataformas().
+
+        Args:
+            tamanho_mensagem: Tamanho das mensagens em bytes
+            iteracoes: Número de chamadas (iterações) por execução
+
         Returns:
-            DataFrame com comparação entre topologias
+            DataFrame com eficiência por mensagem e por chamada por configuração
         """
-        comp = []
-        
-        # Agrupa por tipo, tecnologia e número de nós
-        configs = {}
+        self.carregar_linhas()
+        eficiencia = []
+        erros = self.erro_padrao_medias() if self.amostra is not None else None
+
         for key, data in self.data.items():
+            if 'plataforma' not in data:
+                continue
+
+            df = data['df']
             meta = data['metadata']
-            config_key = f"{meta['tipo_comunicacao']}_{meta['tecnologia']}_{meta['num_nos']}"
-            
-            if config_key not in configs:
-                configs[config_key] = {}
-            
-            configs[config_key][meta['topologia']] = {
-                'tempo_medio': data['df']['Duracao'].mean(),
-                'metadata': meta
+            plataforma = data['plataforma']
+            saltos = self._saltos_mensagens(data)
+            limite = self._limite_mensagens(plataforma, saltos, tamanho_mensagem)
+
+            duracao = df['Duracao'].to_numpy(dtype=np.float64)
+            validas = duracao > 0
+
+            tempo_chamada = ((df['Tempo Final'].max() - df['Tempo Inicial'].min()) / iteracoes
+                             if 'Tempo Final' in df else np.nan)
+            limite_chamada = self._limite_chamada(meta['tipo_comunicacao'], plataforma, tamanho_mensagem, iteracoes)
+
+            linha = {
+                'Tipo Comunicação': meta['tipo_comunicacao'],
+                'Topologia': meta['topologia'],
+                'Tecnologia': meta['tecnologia'],
+                'Nº Nós': meta['num_nos'],
+                'Saltos Médios': saltos.mean(),
+                'Limite Médio por Mensagem (s)': limite.mean(),
+                'Tempo Médio (s)': duracao.mean(),
+                'Eficiência por Mensagem (%)': np.median(limite[validas] / duracao[validas]) * 100,
+                'Limite por Chamada (s)': limite_chamada,
+                'Tempo por Chamada (s)': tempo_chamada,
+                'Eficiência por Chamada (%)': limite_chamada / tempo_chamada * 100 if tempo_chamada > 0 else np.nan
             }
-        
-        # Compara topologias
-        for config_key, topologias in configs.items():
-            if len(topologias) > 1:
-                topos = list(topologias.keys())
-                
-                for i in range(len(topos)):
-                    for j in range(i + 1, len(topos)):
-                        topo1 = topos[i]
-                        topo2 = topos[j]
-                        
-                        tempo1 = topologias[topo1]['tempo_medio']
-                        tempo2 = topologias[topo2]['tempo_medio']
-                        
-                        melhor = topo1 if tempo1 < tempo2 else topo2
-                        diferenca_percentual = abs((tempo2 - tempo1) / tempo1 * 100)
-                        
-                        comp.append({
-                            'Tipo Comunicação': topologias[topo1]['metadata']['tipo_comunicacao'],
-                            'Tecnologia': topologias[topo1]['metadata']['tecnologia'],
-                            'Nº Nós': topologias[topo1]['metadata']['num_nos'],
-                            'Topologia 1': topo1,
-                            'Tempo Médio 1 (s)': tempo1,
-                            'Topologia 2': topo2,
-                            'Tempo Médio 2 (s)': tempo2,
-                            'Melhor': melhor,
-                            'Diferença (%)': diferenca_percentual,
-                            'Diferença Absoluta (s)': abs(tempo2 - tempo1)
-                        })
-        
-        df_comp = pd.DataFrame(comp)
-        self.results['comparacao_topologias'] = df_comp
-        
-        return df_comp
-    
+
+            # Modo prévia: intervalos das estatísticas por mensagem (as por chamada
+            # usam o intervalo de tempo coberto pela amostra)
+            if erros is not None:
+                linha['Tempo Médio (s) ± IC95'] = Z_CONFIANCA * erros[key]
+                linha['Eficiência por Mensagem (%) ± IC95'] = meia_largura_quantis(
+                    limite[validas] / duracao[validas], 0.5)[0] * 100
+
+            eficiencia.append(linha)
+
+        if not eficiencia:
+            print("Nenhuma plataforma carregada; chame carregar_plataformas() antes")
+
+        df_efic = pd.DataFrame(eficiencia)
+        self.results['eficiencia'] = df_efic
+
+        return df_efic
+
+    def analisar_modelo_saltos(self, quantil_residuo: float = 0.99) -> pd.DataFrame:
+        """
+        Ajusta, por configuração, a duração das mensagens ao número de saltos
+
+        Regressão linear duração = intercepto + latência por salto x saltos,
+        com os saltos entre Rank Origem e Rank Destino da matriz da plataforma.
+        Todas as configurações são ajustadas de uma vez: as somas de cada
+        uma saem de np.bincount sobre as mensagens concatenadas. Os resíduos
+        acima do modelo (espera e congestionamento, que não dependem da
+        distância) são resumidos pelo quantil e pelo excesso sobre o tempo
+        total. Configurações em que todas as mensagens têm o mesmo número de
+        saltos (estrela) ficam sem inclinação e o modelo é a média.
+        Requer carregar_plataformas().
+
+        Args:
+            quantil_residuo: Quantil reportado dos resíduos
+
+        Returns:
+            DataFrame com o ajuste e os resíduos por configuração
+        """
+        self.carregar_linhas()
+        chaves = [key for key, data in self.data.items() if 'plataforma' in data]
+        if not chaves:
+            print("Nenhuma plataforma carregada; chame carregar_plataformas() antes")
+            self.results['modelo_saltos'] = pd.DataFrame()
+            self.results['residuos_por_salto'] = pd.DataFrame()
+            return self.results['modelo_saltos']
+
+        saltos = [self._saltos_mensagens(self.data[key]) for key in chaves]
+        tamanhos = np.array([len(s) for s in saltos])
+        k = len(chaves)
+        grupo = np.repeat(np.arange(k), tamanhos)
+        x = np.concatenate(saltos).astype(np.float64)
+        y = np.concatenate([self.data[key]['df']['Duracao'].to_numpy(dtype=np.float64) for key in chaves])
+
+        # Mínimos quadrados por grupo com somas centradas
+        n = np.bincount(grupo, minlength=k).astype(np.float64)
+        media_x = np.bincount(grupo, x, k) / n
+        media_y = np.bincount(grupo, y, k) / n
+        dx = x - media_x[grupo]
+        dy = y - media_y[grupo]
+        sxx = np.bincount(grupo, dx * dx, k)
+        sxy = np.bincount(grupo, dx * dy, k)
+        syy = np.bincount(grupo, dy * dy, k)
+        variavel = sxx > 0
+        inclinacao = np.divide(sxy, sxx, out=np.zeros(k), where=variavel)
+        intercepto = media_y - inclinacao * media_x
+
+        residuo = dy - inclinacao[grupo] * dx
+        ssr = np.bincount(grupo, residuo * residuo, k)
+        excesso = np.bincount(grupo, np.maximum(residuo, 0), k)
+
+        # Quantil dos resíduos (posto mais próximo) com uma ordenação só
+        ordem = np.lexsort((residuo, grupo))
+        inicios = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+        posto = inicios + np.maximum(np.ceil(quantil_residuo * tamanhos).astype(np.int64) - 1, 0)
+        quantil = residuo[ordem][posto]
+
+        df_modelo = pd.DataFrame({
+            'Tipo Comunicação': [self.data[key]['metadata']['tipo_comunicacao'] for key in chaves],
+            'Topologia': [self.data[key]['metadata']['topologia'] for key in chaves],
+            'Tecnologia': [self.data[key]['metadata']['tecnologia'] for key in chaves],
+            'Nº Nós': [self.data[key]['metadata']['num_nos'] for key in chaves],
+            'Saltos Médios': media_x,
+            'Latência do Enlace (s)': [self.data[key]['plataforma']['latencia'] for key in chaves],
+            'Latência por Salto (s)': np.where(variavel, inclinacao, np.nan),
+            'Intercepto (s)': intercepto,
+            'R²': np.where(variavel & (syy > 0), 1 - ssr / np.where(syy > 0, syy, 1), np.nan),
+            f'Resíduo P{quantil_residuo * 100:g} (s)': quantil,
+            'Excesso de Congestionamento (%)': excesso / (media_y * n) * 100
+        })
+
+        # Modo prévia: erro padrão da inclinação
+        if self.amostra is not None:
+            erro = np.sqrt(np.divide(ssr / np.maximum(n - 2, 1), sxx, out=np.full(k, np.nan), where=variavel & (n > 2)))
+            df_modelo.insert(df_modelo.columns.get_loc('Latência por Salto (s)') + 1,
+                             'Latência por Salto (s) ± IC95', Z_CONFIANCA * erro)
+
+        # Duração medida e prevista por número de saltos
+        por_salto = pd.DataFrame({'grupo': grupo, 'Saltos': x.astype(np.int64), 'Duracao': y, 'Resíduo': residuo})
+        por_salto = por_salto.groupby(['grupo', 'Saltos']).agg(
+            Mensagens=('Duracao', 'size'),
+            tempo_medio=('Duracao', 'mean'),
+            residuo_medio=('Resíduo', 'mean')
+        ).reset_index()
+        indice = por_salto['grupo'].to_numpy()
+        df_por_salto = df_modelo.iloc[indice][['Tipo Comunicação', 'Topologia', 'Tecnologia', 'Nº Nós']].reset_index(drop=True)
+        df_por_salto['Saltos'] = por_salto['Saltos']
+        df_por_salto['Mensagens'] = por_salto['Mensagens']
+        df_por_salto['Tempo Médio (s)'] = por_salto['tempo_medio']
+        df_por_salto['Tempo Previsto (s)'] = intercepto[indice] + inclinacao[indice] * por_salto['Saltos'].to_numpy()
+        df_por_salto['Resíduo Médio (s)'] = por_salto['residuo_medio']
+
+        self.results['modelo_saltos'] = df_modelo
+        self.results['residuos_por_salto'] = df_por_salto
+
+        return df_modelo
+
     def gerar_graficos(self, output_dir: str = 'graficos'):
         """
         Gera gráficos de análise
@@ -278,6 +2449,7 @@ class MPILogAnalyzer:
         Args:
             output_dir: Diretório para salvar os gráficos
         """
+        self.carregar_linhas()
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
         
@@ -353,7 +2525,7 @@ class MPILogAnalyzer:
 
             # 🔥 Salvar 1 PNG por padrão
             nome_fig = output_path / f'escalabilidade_{padrao}.png'
-            plt.savefig(nome_fig, dpi=300, bbox_inches='tight')
+            plt.savefig(nome_fig, dpi=self.dpi, bbox_inches='tight')
             plt.close()
 
                 
@@ -395,7 +2567,7 @@ class MPILogAnalyzer:
             plt.suptitle(f'Comparação de Desempenho - {padrao.upper()}', 
                         fontsize=14, fontweight='bold', y=1.02)
             plt.tight_layout()
-            plt.savefig(output_path / f'heatmap_{padrao}.png', dpi=300, bbox_inches='tight')
+            plt.savefig(output_path / f'heatmap_{padrao}.png', dpi=self.dpi, bbox_inches='tight')
             plt.close()
         
         # 3. Boxplot comparativo por tecnologia E por tipo de comunicação
@@ -442,7 +2614,7 @@ class MPILogAnalyzer:
                     plt.tight_layout()
                     plt.savefig(
                         output_path / f'boxplot_{tecnologia}_{padrao}.png',
-                        dpi=300,
+                        dpi=self.dpi,
                         bbox_inches='tight'
                     )
 
@@ -482,7 +2654,7 @@ class MPILogAnalyzer:
                    f'{height:.6f}s', ha='center', va='bottom', fontsize=9)
         
         plt.tight_layout()
-        plt.savefig(output_path / 'melhores_configuracoes.png', dpi=300, bbox_inches='tight')
+        plt.savefig(output_path / 'melhores_configuracoes.png', dpi=self.dpi, bbox_inches='tight')
         plt.close()
         
         print(f"\n✓ Gráficos salvos em: {output_path}")
@@ -505,6 +2677,24 @@ class MPILogAnalyzer:
             
             f.write(f"Total de configurações analisadas: {len(self.data)}\n\n")
             
+            if self.amostra is not None:
+                f.write(f"MODO PRÉVIA: amostra de até {self.amostra} linhas por configuração "
+                        f"(semente {self.semente}).\n")
+                f.write("Colunas '± IC95' são meias larguras de intervalos de confiança de 95%; "
+                        "máximos e piores mensagens são os da amostra.\n")
+                f.write("Concorrência, caminho crítico e sensibilidade à raiz só no modo exato (amostra=None).\n\n")
+            
+            com_resumo = sum('df' not in data for data in self.data.values())
+            if com_resumo:
+                f.write(f"{com_resumo} configurações agregadas pelos resumos da conversão (<nome>{SUFIXO_RESUMO}), "
+                        "sem ler as linhas.\n")
+            if self.resumos:
+                f.write("ICs das comparações pela aproximação normal da diferença das médias (sem bootstrap).\n\n")
+            else:
+                f.write(f"ICs das comparações por bootstrap aproximado: o histograma de cada configuração é "
+                        f"comprimido em até {GRUPOS_BOOTSTRAP} grupos\n(média e variância de cada grupo) antes "
+                        f"de reamostrar.\n\n")
+            
             # Estatísticas básicas
             if 'estatisticas_basicas' in self.results:
                 f.write("\n" + "="*80 + "\n")
@@ -536,18 +2726,577 @@ class MPILogAnalyzer:
                 f.write("="*80 + "\n\n")
                 f.write(self.results['comparacao_topologias'].to_string(index=False))
                 f.write("\n")
+            
+            # Latência de cauda
+            if 'latencia_cauda' in self.results:
+                f.write("\n" + "="*80 + "\n")
+                f.write("5. LATÊNCIA DE CAUDA\n")
+                f.write("="*80 + "\n\n")
+                f.write(self.results['latencia_cauda'].to_string(index=False))
+                f.write("\n")
+                
+                if not self.results['piores_mensagens'].empty:
+                    f.write("\nPiores mensagens por configuração:\n\n")
+                    f.write(self.results['piores_mensagens'].to_string(index=False))
+                    f.write("\n")
+            
+            # Concorrência
+            if 'concorrencia' in self.results and not self.results['concorrencia'].empty:
+                f.write("\n" + "="*80 + "\n")
+                f.write("6. CONCORRÊNCIA DE MENSAGENS\n")
+                f.write("="*80 + "\n\n")
+                f.write(self.results['concorrencia'].to_string(index=False))
+                f.write("\n")
+            
+            # Desbalanceamento
+            if 'desbalanceamento' in self.results and not self.results['desbalanceamento'].empty:
+                f.write("\n" + "="*80 + "\n")
+                f.write("7. DEFASAGEM DE CHEGADA E DESBALANCEAMENTO\n")
+                f.write("="*80 + "\n\n")
+                f.write(self.results['desbalanceamento'].to_string(index=False))
+                f.write("\n")
+            
+            # Eficiência frente ao limite da plataforma
+            if 'eficiencia' in self.results and not self.results['eficiencia'].empty:
+                f.write("\n" + "="*80 + "\n")
+                f.write("8. EFICIÊNCIA FRENTE AO LIMITE TEÓRICO DA PLATAFORMA\n")
+                f.write("="*80 + "\n\n")
+                if 'plataformas' in self.results:
+                    f.write(self.results['plataformas'].to_string(index=False))
+                    f.write("\n\n")
+                f.write(self.results['eficiencia'].to_string(index=False))
+                f.write("\n")
+            
+            # Caminho crítico
+            if 'caminho_critico' in self.results and not self.results['caminho_critico'].empty:
+                f.write("\n" + "="*80 + "\n")
+                f.write("9. CAMINHO CRÍTICO DAS CHAMADAS COLETIVAS\n")
+                f.write("="*80 + "\n\n")
+                f.write(self.results['caminho_critico'].to_string(index=False))
+                f.write("\n")
+            
+            # Sensibilidade à posição da raiz
+            if 'sensibilidade_raiz' in self.results and not self.results['sensibilidade_raiz'].empty:
+                f.write("\n" + "="*80 + "\n")
+                f.write("10. SENSIBILIDADE À POSIÇÃO DA RAIZ (BENCHMARKS FLEX)\n")
+                f.write("="*80 + "\n\n")
+                f.write(self.results['sensibilidade_raiz'].to_string(index=False))
+                f.write("\n\nTempo por posição da raiz:\n\n")
+                f.write(self.results['tempo_por_raiz'].to_string(index=False))
+                f.write("\n")
+            
+            # Varredura de tamanho de mensagem
+            if 'banda_efetiva' in self.results and not self.results['banda_efetiva'].empty:
+                f.write("\n" + "="*80 + "\n")
+                f.write("11. LATÊNCIA E BANDA EFETIVA POR TAMANHO DE MENSAGEM\n")
+                f.write("="*80 + "\n\n")
+                f.write(self.results['banda_efetiva'].to_string(index=False))
+                f.write("\n\nCurvas por tamanho:\n\n")
+                f.write(self.results['curvas_tamanho'].to_string(index=False))
+                f.write("\n")
+            
+            # Modelo de latência por saltos
+            if 'modelo_saltos' in self.results and not self.results['modelo_saltos'].empty:
+                f.write("\n" + "="*80 + "\n")
+                f.write("12. MODELO DE LATÊNCIA POR SALTOS E RESÍDUOS DE CONGESTIONAMENTO\n")
+                f.write("="*80 + "\n\n")
+                f.write(self.results['modelo_saltos'].to_string(index=False))
+                f.write("\n\nTempo medido e previsto por número de saltos:\n\n")
+                f.write(self.results['residuos_por_salto'].to_string(index=False))
+                f.write("\n")
         
         print(f"\n✓ Relatório salvo em: {output_file}")
 
+    def exportar_tabelas(self, destino: str = None, formato: str = 'jsonl', linhas_por_bloco: int = 10_000) -> Path:
+        """
+        Grava as tabelas de resultados (TABELAS_RELATORIO) em formato tipado
+
+        As seções são gravadas uma a uma, na ordem do relatório, sem montar a
+        saída inteira em memória.
+            jsonl: um arquivo; cada seção começa com a linha
+                   {"secao": <nome>, "esquema": {coluna: dtype}, "linhas": n},
+                   seguida de uma linha {"secao": <nome>, <coluna>: valor, ...}
+                   por registro (NaN e infinitos viram null), gravadas em
+                   blocos de linhas_por_bloco; o arquivo é descarregado ao fim
+                   de cada seção
+            parquet: um <nome>.parquet por tabela no diretório destino
+
+        Args:
+            destino: Arquivo .jsonl ou diretório dos .parquet (padrão:
+                     relatorio_analise.jsonl ou relatorio_analise_tabelas)
+            formato: 'jsonl' ou 'parquet'
+            linhas_por_bloco: Registros serializados por vez no formato jsonl
+
+        Returns:
+            Caminho do arquivo ou diretório gravado
+        """
+        if formato not in ('jsonl', 'parquet'):
+            raise ValueError(f"Formato de tabelas desconhecido: {formato!r} (use 'jsonl' ou 'parquet')")
+        destino = Path(destino or ('relatorio_analise.jsonl' if formato == 'jsonl' else 'relatorio_analise_tabelas'))
+        secoes = [nome for nome in TABELAS_RELATORIO
+                  if isinstance(self.results.get(nome), pd.DataFrame) and len(self.results[nome].columns)]
+
+        if formato == 'parquet':
+            destino.mkdir(parents=True, exist_ok=True)
+            for nome in secoes:
+                gravar_parquet(self.results[nome], destino / f'{nome}.parquet')
+        else:
+            with open(destino, 'w', encoding='utf-8') as f:
+                for nome in secoes:
+                    df = self.results[nome]
+                    esquema = {coluna: str(tipo) for coluna, tipo in df.dtypes.items()}
+                    f.write(json.dumps({'secao': nome, 'esquema': esquema, 'linhas': len(df)}, ensure_ascii=False) + "\n")
+                    numericas = df.select_dtypes('number').columns
+                    for inicio in range(0, len(df), linhas_por_bloco):
+                        bloco = df.iloc[inicio:inicio + linhas_por_bloco]
+                        validos = bloco.notna()
+                        validos[numericas] &= np.isfinite(bloco[numericas].to_numpy(dtype=np.float64))
+                        registros = bloco.astype(object).where(validos, None).to_dict('records')
+                        f.writelines(json.dumps({'secao': nome, **registro}, ensure_ascii=False) + "\n"
+                                     for registro in registros)
+                    f.flush()
+
+        print(f"✓ {len(secoes)} tabelas exportadas ({formato}) em: {destino}")
+
+        return destino
+
+    def preparar_exploracao(self, n_bins: int = BINS_HISTOGRAMA) -> Dict[str, bytes]:
+        """
+        Pré-calcula as respostas JSON do servidor de exploração
+
+        Tudo sai dos dados já carregados (nenhuma tabela é relida):
+            /api/configuracoes: agregados e estatísticas de boxplot por configuração
+            /api/histograma/<chave>: histograma de durações em n_bins faixas
+                                     logarítmicas, reduzido do histograma de
+                                     valores distintos (também com resumos=True)
+            /api/matriz/<chave>: duração média e contagem por par (origem,
+                                 destino) de ranks; só para configurações
+                                 com as linhas carregadas
+
+        Args:
+            n_bins: Número de faixas dos histogramas
+
+        Returns:
+            Dicionário caminho -> corpo da resposta
+        """
+        resumo = self.resumir_duracoes()
+        respostas = {}
+        configuracoes = []
+
+        for key, data in self.data.items():
+            valores, contagens = self._histograma_duracoes(key)
+            configuracao = {campo: data['metadata'][campo] for campo in EIXOS_COMPARACAO}
+            configuracao['chave'] = key
+            configuracao.update({campo: _json_finito(resumo.at[key, campo])
+                                 for campo in ('media', 'mediana', 'desvio', 'minimo', 'maximo')})
+            configuracao['contagem'] = int(resumo.at[key, 'contagem'])
+            configuracao['caixa'] = estatisticas_caixa(valores, contagens) if len(valores) else None
+            configuracao['matriz'] = 'df' in data
+            configuracoes.append(configuracao)
+
+            # Faixas logarítmicas entre o menor e o maior valor positivo (alargadas se forem iguais)
+            positivos = valores > 0
+            if positivos.any():
+                inicio = valores[positivos][0]
+                bordas = np.geomspace(inicio, max(valores[-1], inicio * 1.01), n_bins + 1)
+                faixas, _ = np.histogram(valores[positivos], bordas, weights=contagens[positivos])
+                histograma = {'chave': key, 'bordas': bordas.tolist(), 'contagens': faixas.astype(np.int64).tolist(),
+                              'nao_positivas': int(contagens[~positivos].sum())}
+            else:
+                histograma = {'chave': key, 'bordas': [], 'contagens': [], 'nao_positivas': int(contagens.sum())}
+            respostas[f'/api/histograma/{key}'] = json.dumps(histograma).encode('utf-8')
+
+            if 'df' in data:
+                # Container do trace = rank + 1
+                origem = data['df']['Rank Origem'].to_numpy(dtype=np.int64) - 1
+                destino = data['df']['Rank Destino'].to_numpy(dtype=np.int64) - 1
+                n = int(max(data['metadata']['num_nos'], origem.max(initial=-1) + 1, destino.max(initial=-1) + 1))
+                par = origem * n + destino
+                pares = np.bincount(par, minlength=n * n)
+                somas = np.bincount(par, data['df']['Duracao'].to_numpy(dtype=np.float64), n * n)
+                medias = np.divide(somas, pares, out=np.full(n * n, np.nan), where=pares > 0)
+                respostas[f'/api/matriz/{key}'] = json.dumps({
+                    'chave': key,
+                    'ranks': n,
+                    'media': _json_finito(medias.reshape(n, n)),
+                    'contagem': pares.reshape(n, n).tolist()
+                }).encode('utf-8')
+
+        respostas['/api/configuracoes'] = json.dumps(configuracoes, ensure_ascii=False).encode('utf-8')
+        respostas['/'] = PAGINA_EXPLORADOR.read_bytes()
+
+        return respostas
+
+    def iniciar_servidor(self, porta: int = PORTA_EXPLORADOR, bloquear: bool = True) -> ThreadingHTTPServer:
+        """
+        Inicia o servidor de exploração interativa em http://127.0.0.1:<porta>/
+
+        A página (explorador.html) desenha no navegador as visões de
+        escalabilidade, heatmap, boxplot, matriz de ranks e histograma a
+        partir das respostas de preparar_exploracao, calculadas uma única
+        vez; trocar de visão não refaz nenhuma análise nem figura. O servidor
+        só escuta em localhost.
+
+        Args:
+            porta: Porta TCP (0 = uma porta livre qualquer)
+            bloquear: Atende até Ctrl+C; com False, atende numa thread e retorna
+
+        Returns:
+            O servidor (server.shutdown() encerra o atendimento em segundo plano)
+        """
+        respostas = self.preparar_exploracao()
+        manipulador = type('ManipuladorExplorador', (_ManipuladorExplorador,), {'respostas': respostas})
+        servidor = ThreadingHTTPServer((ENDERECO_EXPLORADOR, porta), manipulador)
+        print(f"✓ Explorador em http://{ENDERECO_EXPLORADOR}:{servidor.server_address[1]}/ "
+              f"({len(respostas)} respostas pré-calculadas)")
+
+        if not bloquear:
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+            return servidor
+
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
+
+        return servidor
+
+
+def gravar_parquet(df: pd.DataFrame, arquivo: Path):
+    """
+    Grava um DataFrame em Parquet com pandas (pyarrow/fastparquet) ou, sem eles, com polars
+
+    Args:
+        df: Tabela
+        arquivo: Caminho do .parquet
+    """
+    try:
+        df.to_parquet(arquivo, index=False)
+        return
+    except ImportError:
+        pass
+
+    try:
+        import polars as pl
+    except ImportError as erro:
+        raise ImportError("O formato 'parquet' requer pyarrow, fastparquet ou polars (pip install pyarrow)") from erro
+    pl.DataFrame({coluna: df[coluna].to_numpy() for coluna in df.columns}).write_parquet(arquivo)
+
+
+class _ManipuladorExplorador(BaseHTTPRequestHandler):
+    """Responde GET com as respostas pré-calculadas de MPILogAnalyzer.preparar_exploracao"""
+
+    respostas: Dict[str, bytes] = {}
+
+    def do_GET(self):
+        caminho = unquote(urlsplit(self.path).path)
+        corpo = self.respostas.get(caminho)
+        if corpo is None:
+            corpo = json.dumps({'erro': f'Recurso não encontrado: {caminho}'}, ensure_ascii=False).encode('utf-8')
+            self.send_response(404)
+        else:
+            self.send_response(200)
+            self.send_header('Cache-Control', 'max-age=3600')
+        self.send_header('Content-Type', 'text/html; charset=utf-8' if caminho == '/' else 'application/json')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def _json_finito(valores: np.ndarray) -> list:
+    """Lista (aninhada) de um array com NaN e infinitos trocados por None (null em JSON)"""
+    valores = np.asarray(valores, dtype=np.float64)
+    return np.where(np.isfinite(valores), valores, None).tolist()
+
+
+def _pvalor_ks(d: float, n1: int, n2: int) -> float:
+    """p-valor assintótico do teste de Kolmogorov-Smirnov de duas amostras"""
+    ne = n1 * n2 / (n1 + n2)
+    lam = (np.sqrt(ne) + 0.12 + 0.11 / np.sqrt(ne)) * d
+    if lam < 1e-3:
+        return 1.0
+    k = np.arange(1, 101)
+    return float(np.clip(2 * np.sum((-1.0) ** (k - 1) * np.exp(-2 * k**2 * lam**2)), 0.0, 1.0))
+
+
+def _metadados_simulacao(diretorio_simulacao: Path, meta: Dict) -> Tuple[str, str]:
+    """Hash do platform.xml e versão do SimGrid (cabeçalho do trace) de uma configuração"""
+    import hashlib
+
+    diretorio = Path(diretorio_simulacao) / meta['topologia'] / meta['tecnologia'] / str(meta['num_nos'])
+    plataforma = diretorio / 'platform.xml'
+    hash_plataforma = hashlib.sha256(plataforma.read_bytes()).hexdigest()[:12] if plataforma.exists() else None
+
+    versao = None
+    trace = diretorio / f"{meta['tipo_comunicacao']}_{meta['topologia']}_{meta['tecnologia']}_{meta['num_nos']}.trace"
+    if trace.exists():
+        with open(trace, 'r') as f:
+            match = re.search(r'SimGrid-([\w.]+)', f.readline())
+            versao = match.group(1) if match else None
+
+    return hash_plataforma, versao
+
+
+class MPICampaignComparator:
+    """Detector de regressões de desempenho entre campanhas de simulação"""
+
+    def __init__(self, campanhas: Dict[str, str], simulacoes: Dict[str, str] = None, engine: str = 'pandas'):
+        """
+        Inicializa o comparador
+
+        Args:
+            campanhas: Nome da campanha -> diretório dos CSVs compilados; a
+                primeira campanha é a base de comparação
+            simulacoes: Nome da campanha -> diretório da simulação (platform.xml
+                e traces), para detectar mudanças de plataforma e de versão do SimGrid
+            engine: Engine de leitura/agregação dos analisadores
+        """
+        self.campanhas = dict(campanhas)
+        self.simulacoes = dict(simulacoes or {})
+        self.analyzers = {nome: MPILogAnalyzer(diretorio, engine=engine)
+                          for nome, diretorio in self.campanhas.items()}
+        self.results = {}
+
+    def load_data(self):
+        """Carrega os CSVs de todas as campanhas"""
+        for nome, analyzer in self.analyzers.items():
+            print(f"\nCampanha: {nome}")
+            analyzer.load_data()
+
+    def detectar_regressoes(self, limiar_percentual: float = 5.0, alfa: float = 0.05,
+                            n_reamostras: int = 1000, semente: int = 42) -> pd.DataFrame:
+        """
+        Compara cada campanha com a campanha base, configuração a configuração
+
+        As configurações são alinhadas por (padrão, topologia, tecnologia, nós).
+        A variação da média tem IC bootstrap; a mudança de distribuição (mediana
+        e cauda) é testada com Kolmogorov-Smirnov. Uma configuração é regressão
+        (ou melhoria) quando o IC da variação da média não contém zero e a
+        variação passa do limiar; o KS é só reportado (uma mudança de forma com
+        a média estável não muda a classificação).
+
+        Args:
+            limiar_percentual: Variação mínima da média (%) para classificar
+            alfa: Nível de significância do teste KS e do IC (1 - alfa)
+            n_reamostras: Número de reamostragens bootstrap
+            semente: Semente do gerador aleatório
+
+        Returns:
+            DataFrame ordenado: regressões, melhorias e estáveis, por |variação|
+        """
+        nomes = list(self.analyzers.keys())
+        base = nomes[0]
+
+        linhas = []
+        analyzer_base = self.analyzers[base]
+        resumo_base = analyzer_base.resumir_duracoes()
+
+        for nome in nomes[1:]:
+            analyzer = self.analyzers[nome]
+            resumo = analyzer.resumir_duracoes()
+            comuns = [key for key in analyzer_base.data if key in analyzer.data]
+
+            # IC bootstrap da variação da média, só das configurações em comum
+            if comuns:
+                medias_base = analyzer_base.calcular_bootstrap_medias(n_reamostras, semente, comuns)[1]
+                medias = analyzer.calcular_bootstrap_medias(n_reamostras, semente, comuns)[1]
+                diferencas = medias - medias_base
+                inferior, superior = np.nanquantile(diferencas, [alfa / 2, 1 - alfa / 2], axis=0)
+
+            for i, key in enumerate(comuns):
+                meta = analyzer.data[key]['metadata']
+                x_base = np.sort(analyzer_base.data[key]['df']['Duracao'].to_numpy(dtype=np.float64))
+                x = np.sort(analyzer.data[key]['df']['Duracao'].to_numpy(dtype=np.float64))
+
+                # KS: maior distância entre as distribuições empíricas
+                pontos = np.concatenate((x_base, x))
+                d = np.max(np.abs(np.searchsorted(x_base, pontos, side='right') / len(x_base) -
+                                  np.searchsorted(x, pontos, side='right') / len(x)))
+                p_ks = _pvalor_ks(d, len(x_base), len(x))
+                p99_base, p99 = np.quantile(x_base, 0.99), np.quantile(x, 0.99)
+
+                media_base, media = resumo_base.loc[key, 'media'], resumo.loc[key, 'media']
+                mediana_base, mediana = resumo_base.loc[key, 'mediana'], resumo.loc[key, 'mediana']
+                variacao = (media - media_base) / media_base * 100
+
+                significativo = inferior[i] > 0 or superior[i] < 0
+                if significativo and variacao >= limiar_percentual:
+                    classificacao = 'Regressão'
+                elif significativo and variacao <= -limiar_percentual:
+                    classificacao = 'Melhoria'
+                else:
+                    classificacao = 'Estável'
+
+                linha = {
+                    'Tipo Comunicação': meta['tipo_comunicacao'],
+                    'Topologia': meta['topologia'],
+                    'Tecnologia': meta['tecnologia'],
+                    'Nº Nós': meta['num_nos'],
+                    'Campanha Base': base,
+                    'Campanha': nome,
+                    'Média Base (s)': media_base,
+                    'Média (s)': media,
+                    'Δ Média (%)': variacao,
+                    'IC Inf. Δ Média (s)': inferior[i],
+                    'IC Sup. Δ Média (s)': superior[i],
+                    'Δ Mediana (%)': (mediana - mediana_base) / mediana_base * 100,
+                    'Δ p99 (%)': (p99 - p99_base) / p99_base * 100,
+                    'KS D': d,
+                    'KS p-valor': p_ks,
+                    'Classificação': classificacao
+                }
+
+                if base in self.simulacoes and nome in self.simulacoes:
+                    plat_base, versao_base = _metadados_simulacao(self.simulacoes[base], meta)
+                    plat, versao = _metadados_simulacao(self.simulacoes[nome], meta)
+                    linha['Plataforma Alterada'] = 'Sim' if plat_base != plat else 'Não'
+                    linha['Versão SimGrid'] = versao_base if versao_base == versao else f"{versao_base} -> {versao}"
+
+                linhas.append(linha)
+
+        df_reg = pd.DataFrame(linhas)
+        if not df_reg.empty:
+            ordem = df_reg['Classificação'].map({'Regressão': 0, 'Melhoria': 1, 'Estável': 2})
+            df_reg = (df_reg.assign(_ordem=ordem, _abs=df_reg['Δ Média (%)'].abs())
+                      .sort_values(['_ordem', '_abs'], ascending=[True, False])
+                      .drop(columns=['_ordem', '_abs'])
+                      .reset_index(drop=True))
+
+            if 'Versão SimGrid' in df_reg:
+                alteracoes = df_reg[(df_reg['Plataforma Alterada'] == 'Sim') |
+                                    df_reg['Versão SimGrid'].astype(str).str.contains('->')]
+            else:
+                alteracoes = df_reg.iloc[:0]
+            if not alteracoes.empty:
+                print(f"⚠ {len(alteracoes)} configurações com platform.xml ou versão do SimGrid alterados")
+
+        self.results['regressoes'] = df_reg
+
+        return df_reg
+
+    def gerar_graficos(self, output_dir: str = 'graficos', n_maximo: int = 40):
+        """
+        Gera o gráfico das maiores variações significativas entre campanhas
+
+        Args:
+            output_dir: Diretório para salvar os gráficos
+            n_maximo: Número máximo de configurações exibidas
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(exist_ok=True)
+
+        df_reg = self.results['regressoes']
+        df_plot = df_reg[df_reg['Classificação'] != 'Estável'].head(n_maximo).iloc[::-1]
+        if df_plot.empty:
+            print("Nenhuma variação significativa entre campanhas")
+            return
+
+        labels = [f"{r['Tipo Comunicação']}-{r['Topologia']}-{r['Tecnologia']}-{r['Nº Nós']}n ({r['Campanha']})"
+                  for _, r in df_plot.iterrows()]
+        cores = ['indianred' if c == 'Regressão' else 'seagreen' for c in df_plot['Classificação']]
+
+        fig, ax = plt.subplots(figsize=(12, max(4, 0.3 * len(df_plot))))
+        ax.barh(range(len(df_plot)), df_plot['Δ Média (%)'], color=cores, alpha=0.8, edgecolor='black')
+        ax.set_yticks(range(len(df_plot)))
+        ax.set_yticklabels(labels, fontsize=8)
+        ax.axvline(0, color='black', linewidth=1)
+        ax.set_xlabel('Variação do Tempo Médio (%)', fontsize=12)
+        ax.set_title('Regressões e Melhorias entre Campanhas', fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3, axis='x')
+
+        plt.tight_layout()
+        plt.savefig(output_path / 'regressoes_campanhas.png', dpi=DPI_FINAL, bbox_inches='tight')
+        plt.close()
+
+        print(f"\n✓ Gráfico salvo em: {output_path / 'regressoes_campanhas.png'}")
+
+    def gerar_relatorio(self, output_file: str = 'relatorio_regressoes.txt'):
+        """
+        Gera o relatório de regressões/melhorias em texto
+
+        Args:
+            output_file: Arquivo de saída do relatório
+        """
+        df_reg = self.results['regressoes']
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write("RELATÓRIO DE REGRESSÕES ENTRE CAMPANHAS\n")
+            f.write("="*80 + "\n\n")
+
+            for nome, diretorio in self.campanhas.items():
+                f.write(f"Campanha {nome}: {diretorio}\n")
+            f.write("\n")
+
+            for classificacao in ('Regressão', 'Melhoria', 'Estável'):
+                parte = df_reg[df_reg['Classificação'] == classificacao] if not df_reg.empty else df_reg
+                f.write("\n" + "="*80 + "\n")
+                f.write(f"{classificacao.upper()} ({len(parte)})\n")
+                f.write("="*80 + "\n\n")
+                if not parte.empty:
+                    f.write(parte.to_string(index=False))
+                    f.write("\n")
+
+        print(f"\n✓ Relatório salvo em: {output_file}")
+
 
 # Exemplo de uso
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Análise dos logs MPI compilados')
+    parser.add_argument('--previa', type=int, metavar='LINHAS', default=None,
+                        help='Modo prévia: amostra LINHAS linhas por configuração (sem a opção, modo exato)')
+    parser.add_argument('--resumos', action='store_true',
+                        help='Só as seções 1 a 4 do relatório, montadas pelos resumos da conversão (sem ler as linhas)')
+    parser.add_argument('--tabelas', choices=('jsonl', 'parquet'), default=None,
+                        help='Também exporta as tabelas de resultados nesse formato (relatorio_analise.jsonl '
+                             'ou relatorio_analise_tabelas/)')
+    parser.add_argument('--explorar', type=int, metavar='PORTA', nargs='?', const=PORTA_EXPLORADOR, default=None,
+                        help=f'Só inicia o servidor de exploração em 127.0.0.1 (porta padrão {PORTA_EXPLORADOR})')
+    parser.add_argument('--sem-texto', action='store_true', help='Não gera o relatorio_analise.txt')
+    parser.add_argument('--comparar', nargs='+', metavar='NOME=DIR', default=None,
+                        help='Só compara campanhas (a primeira é a base) e gera o relatorio_regressoes.txt')
+    parser.add_argument('--simulacoes', nargs='+', metavar='NOME=DIR', default=[],
+                        help='Com --comparar: diretório da simulação de cada campanha (plataforma e versão do SimGrid)')
+    args = parser.parse_args()
+
+    if args.comparar:
+        pares = lambda itens: dict(item.split('=', 1) for item in itens)
+        comparador = MPICampaignComparator(pares(args.comparar), simulacoes=pares(args.simulacoes))
+        comparador.load_data()
+        print(comparador.detectar_regressoes())
+        comparador.gerar_graficos()
+        comparador.gerar_relatorio()
+        raise SystemExit(0)
+
     # Inicializa o analisador
-    analyzer = MPILogAnalyzer(csv_directory='../../resultados/csv_compilados_simulacao2/')
+    analyzer = MPILogAnalyzer(csv_directory='../../resultados/csv_compilados_simulacao2/', amostra=args.previa,
+                              resumos=args.resumos)
     
     # Carrega os dados
     analyzer.load_data()
     
+    if args.explorar is not None:
+        analyzer.iniciar_servidor(porta=args.explorar)
+        raise SystemExit(0)
+    
+    if args.resumos:
+        analyzer.calcular_estatisticas_basicas()
+        analyzer.analisar_escalabilidade()
+        analyzer.comparar_tecnologias()
+        analyzer.comparar_topologias()
+        if not args.sem_texto:
+            analyzer.gerar_relatorio_completo()
+        if args.tabelas:
+            analyzer.exportar_tabelas(formato=args.tabelas)
+        raise SystemExit(0)
+    
     # Executa análises
     print("\n" + "="*80)
     print("EXECUTANDO ANÁLISES")
@@ -569,13 +3318,53 @@ if __name__ == "__main__":
     comp_topo = analyzer.comparar_topologias()
     print(comp_topo)
     
+    print("\n5. Analisando latência de cauda...")
+    cauda = analyzer.analisar_latencia_cauda()
+    print(cauda)
+    
+    print("\n6. Analisando concorrência de mensagens...")
+    conc = analyzer.analisar_concorrencia()
+    print(conc)
+    
+    print("\n7. Analisando defasagem de chegada nas coletivas...")
+    desb = analyzer.analisar_desbalanceamento()
+    print(desb)
+    
+    print("\n8. Calculando eficiência frente ao limite da plataforma...")
+    analyzer.carregar_plataformas('../simulacao2/')
+    efic = analyzer.analisar_eficiencia()
+    print(efic)
+    
+    print("\n9. Extraindo o caminho crítico das coletivas...")
+    caminho = analyzer.analisar_caminho_critico()
+    print(caminho)
+    
+    print("\n10. Analisando sensibilidade à posição da raiz...")
+    raiz = analyzer.analisar_sensibilidade_raiz()
+    print(raiz)
+    
+    print("\n11. Calculando curvas de latência e banda por tamanho de mensagem...")
+    banda = analyzer.analisar_tamanho_mensagem()
+    print(banda)
+    
+    print("\n12. Ajustando o modelo de latência por saltos...")
+    saltos = analyzer.analisar_modelo_saltos()
+    print(saltos)
+    
     # Gera gráficos
-    print("\n5. Gerando gráficos...")
+    print("\n13. Gerando gráficos...")
     analyzer.gerar_graficos()
+    analyzer.gerar_graficos_cauda()
+    analyzer.gerar_graficos_concorrencia()
+    analyzer.gerar_graficos_raiz()
+    analyzer.gerar_graficos_tamanho()
     
     # Gera relatório completo
-    print("\n6. Gerando relatório completo...")
-    analyzer.gerar_relatorio_completo()
+    print("\n14. Gerando relatório completo...")
+    if not args.sem_texto:
+        analyzer.gerar_relatorio_completo()
+    if args.tabelas:
+        analyzer.exportar_tabelas(formato=args.tabelas)
     
     print("\n" + "="*80)
     print("ANÁLISE CONCLUÍDA!")
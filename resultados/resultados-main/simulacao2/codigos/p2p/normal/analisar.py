@@ -1,32 +1,181 @@
+import glob
+import gzip
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+from array import array
+from multiprocessing import Pool
+
+import numpy as np
 import pandas as pd
 
-def analisar_trace_completo(nome_arquivo_trace):
+# Categorias de diagnóstico da validação do trace e sua gravidade
+CATEGORIAS_DIAGNOSTICO = {
+    'linha_malformada': 'erro',
+    'evento_nao_definido': 'erro',
+    'valor_indefinido': 'erro',
+    'pop_sem_push': 'erro',
+    'fim_sem_inicio': 'erro',
+    'tempo_nao_monotonico': 'erro',
+    'link_duplicado': 'aviso',
+    'link_nao_finalizado': 'aviso',
+    'estado_nao_finalizado': 'aviso',
+}
+
+# Número máximo de exemplos guardados por categoria
+MAX_EXEMPLOS_DIAGNOSTICO = 5
+
+# Ordem de registro, numa mesma linha, das categorias que podem coincidir
+_ORDEM_NA_LINHA = {'evento_nao_definido': 0, 'tempo_nao_monotonico': 1}
+
+# Linhas de definição lidas na pré-passada do modo paralelo
+_PADRAO_DEFINICOES = re.compile(rb'\n(?:%|5 )[^\n]*')
+
+# Linhas de comentário (versão do SimGrid e linha de comando), ignoradas pelo parser
+_PADRAO_COMENTARIOS = re.compile(rb'^#[^\n]*(?:\n|$)', re.MULTILINE)
+
+# Catálogo das tabelas compiladas (impressões digitais e apelidos)
+ARQUIVO_CATALOGO = 'catalogo.csv'
+
+# Sufixo do resumo de cada tabela (<nome>_resumo.json), gravado ao lado do <nome>_completo.csv
+SUFIXO_RESUMO = '_resumo.json'
+
+# Máximo de centróides do esboço de quantis do resumo de cada tabela
+LIMITE_ESBOCO = 4096
+
+
+def _registrar_diagnostico(diagnosticos, categoria, num_linha, mensagem):
+    """Conta uma ocorrência de diagnóstico e guarda os primeiros exemplos."""
+    entrada = diagnosticos.setdefault(categoria, {'ocorrencias': 0, 'exemplos': []})
+    entrada['ocorrencias'] += 1
+    if len(entrada['exemplos']) < MAX_EXEMPLOS_DIAGNOSTICO:
+        local = f"linha {num_linha}" if num_linha is not None else "fim do trace"
+        entrada['exemplos'].append(f"{local}: {mensagem}")
+
+
+def formatar_diagnosticos(diagnosticos):
+    """
+    Formata os diagnósticos de validação de um trace em texto.
+
+    Args:
+        diagnosticos (dict): Diagnósticos em df.attrs['diagnosticos'].
+
+    Returns:
+        str: Resumo com contagem de erros/avisos e exemplos por categoria.
+    """
+    erros = sum(d['ocorrencias'] for c, d in diagnosticos.items() if CATEGORIAS_DIAGNOSTICO[c] == 'erro')
+    avisos = sum(d['ocorrencias'] for c, d in diagnosticos.items() if CATEGORIAS_DIAGNOSTICO[c] == 'aviso')
+
+    linhas = []
+    for categoria, dados in diagnosticos.items():
+        linhas.append(f"[{CATEGORIAS_DIAGNOSTICO[categoria]}] {categoria}: {dados['ocorrencias']}")
+        for exemplo in dados['exemplos']:
+            linhas.append(f"    {exemplo}")
+    linhas.append(f"Seu trace tem {erros} erros e {avisos} avisos.")
+
+    return "\n".join(linhas)
+
+
+def _indice_campo_tamanho(cabecalho):
+    """
+    Posição (em line.split()) do campo Size do PajeStartLink, se declarado.
+
+    O SimGrid só inclui o tamanho das mensagens nos links quando o trace é
+    gerado com --cfg=tracing/smpi/display-sizes:yes.
+    """
+    evento, campos, indice = None, [], None
+    for line in cabecalho:
+        parts = line[1:].split()
+        if line.startswith('%EventDef'):
+            evento, campos = parts[1], []
+        elif line.startswith('%EndEventDef'):
+            if evento == 'PajeStartLink' and 'Size' in campos:
+                indice = campos.index('Size') + 1
+            evento = None
+        elif evento is not None and parts:
+            campos.append(parts[0])
+    return indice
+
+
+def analisar_trace_completo(nome_arquivo_trace, retornar_estados=False, n_processos=1):
     """
     Analisa um arquivo de trace Paje, extraindo a ação do processo de origem
     e o estado do processo de destino para cada comunicação.
 
     Args:
         nome_arquivo_trace (str): O caminho para o arquivo .trace.
+        retornar_estados (bool): Se True, também retorna os intervalos
+            (entrada/saída) de cada estado de cada rank.
+        n_processos (int): Com mais de um processo (ou None, um por CPU), o
+            arquivo é dividido em blocos de bytes analisados em paralelo
+            (ver analisar_trace_paralelo); o resultado é idêntico.
+
+    O trace é validado durante a mesma leitura (substitui a passada do
+    verificador Paje externo): eventos não declarados no cabeçalho, valores
+    de estado indefinidos, pops sem push, fins de link sem início, tempos
+    não monotônicos e linhas malformadas são contados e ficam, com exemplos,
+    em df.attrs['diagnosticos'] do DataFrame de comunicações.
+
+    Se o PajeStartLink declara o campo Size, as comunicações ganham a
+    coluna 'Tamanho (bytes)'.
 
     Returns:
-        pandas.DataFrame: Um DataFrame com a análise completa.
+        pandas.DataFrame: Um DataFrame com a análise completa. Com
+        retornar_estados=True, uma tupla (comunicações, estados), onde
+        estados tem uma linha por chamada: Rank, Estado, Chamada (índice
+        da chamada daquele estado no rank), Tempo Entrada e Tempo Saída.
     """
+    if n_processos != 1:
+        return analisar_trace_paralelo(nome_arquivo_trace, retornar_estados, n_processos)
+
     state_definitions = {}
     current_rank_states = {}
     links_started = {}
     communications = []
+    rank_state_stacks = {}
+    state_call_counts = {}
+    state_intervals = []
+    event_definitions = set()
+    diagnosticos = {}
+    last_time = 0.0
+    cabecalho = []
+    indice_tamanho = None
 
     print(f"Analisando o arquivo: {nome_arquivo_trace}")
 
     with open(nome_arquivo_trace, 'r') as f:
-        for line in f:
-            if line.startswith('%') or not line.strip():
+        for num_linha, line in enumerate(f, start=1):
+            # %EventDef <Nome> <id>: declara os eventos válidos do trace
+            if line.startswith('%'):
+                cabecalho.append(line)
+                if line.startswith('%EventDef'):
+                    event_definitions.add(line.split()[2])
+                elif line.startswith('%EndEventDef'):
+                    indice_tamanho = _indice_campo_tamanho(cabecalho)
+                continue
+            if line.startswith('#') or not line.strip():
                 continue
 
             parts = line.split()
             event_type = parts[0]
 
+            if event_type not in event_definitions:
+                _registrar_diagnostico(diagnosticos, 'evento_nao_definido', num_linha,
+                                       f"evento '{event_type}' não declarado no cabeçalho")
+
             try:
+                # Eventos a partir de 6 (PajeCreateContainer) carregam o tempo em parts[1]
+                if len(event_type) > 1 or event_type >= '6':
+                    event_time = float(parts[1])
+                    # Comparado com o evento anterior: um tempo fora de ordem é contado uma vez
+                    if event_time < last_time:
+                        _registrar_diagnostico(diagnosticos, 'tempo_nao_monotonico', num_linha,
+                                               f"tempo {parts[1]} anterior a {last_time:.6f}")
+                    last_time = event_time
+
                 # 5: PajeDefineEntityValue (Define o nome de um estado)
                 if event_type == '5' and parts[2] == '2':
                     state_id = parts[1]
@@ -39,9 +188,39 @@ def analisar_trace_completo(nome_arquivo_trace):
                     state_id = parts[4]
                     current_rank_states[rank_id] = state_id
 
+                    if state_id not in state_definitions:
+                        _registrar_diagnostico(diagnosticos, 'valor_indefinido', num_linha,
+                                               f"estado '{state_id}' não definido (rank {rank_id})")
+
+                    rank_state_stacks.setdefault(rank_id, []).append((state_id, event_time))
+
+                # 13: PajePopState (Um rank sai do estado corrente)
+                elif event_type == '13':
+                    rank_id = parts[3]
+                    stack = rank_state_stacks.get(rank_id)
+                    if not stack:
+                        _registrar_diagnostico(diagnosticos, 'pop_sem_push', num_linha,
+                                               f"pop sem estado aberto (rank {rank_id})")
+                    else:
+                        state_id, entry_time = stack.pop()
+                        if retornar_estados:
+                            state_name = state_definitions.get(state_id, "Unknown")
+                            call_key = (rank_id, state_name)
+                            call_index = state_call_counts.get(call_key, 0)
+                            state_call_counts[call_key] = call_index + 1
+
+                            state_intervals.append({
+                                'Rank': rank_id,
+                                'Estado': state_name,
+                                'Chamada': call_index,
+                                'Tempo Entrada': entry_time,
+                                'Tempo Saída': event_time
+                            })
+
                 # 15: PajeStartLink (Início de uma comunicação)
                 elif event_type == '15':
-                    start_time = float(parts[1])
+                    size = int(parts[indice_tamanho]) if indice_tamanho is not None else None
+                    start_time = event_time
                     origin_rank = parts[5]
                     key = parts[6]
 
@@ -51,15 +230,20 @@ def analisar_trace_completo(nome_arquivo_trace):
                         if state_id in state_definitions:
                             origin_action = state_definitions[state_id]
 
+                    if key in links_started:
+                        _registrar_diagnostico(diagnosticos, 'link_duplicado', num_linha,
+                                               f"link '{key}' iniciado novamente antes do fim")
+
                     links_started[key] = {
                         'start_time': start_time,
                         'origin': origin_rank,
-                        'origin_action': origin_action
+                        'origin_action': origin_action,
+                        'size': size
                     }
 
                 # 16: PajeEndLink (Fim de uma comunicação)
                 elif event_type == '16':
-                    end_time = float(parts[1])
+                    end_time = event_time
                     destination_rank = parts[5]
                     key = parts[6]
 
@@ -74,27 +258,968 @@ def analisar_trace_completo(nome_arquivo_trace):
                             if state_id in state_definitions:
                                 destination_state = state_definitions[state_id]
 
-                        communications.append({
+                        communication = {
                             'Rank Origem': start_info['origin'],
                             'Rank Destino': destination_rank,
                             'Ação da Origem': start_info['origin_action'],
                             'Estado do Destino': destination_state,
                             'Tempo Inicial': start_info['start_time'],
                             'Tempo Final': end_time
-                        })
+                        }
+                        if indice_tamanho is not None:
+                            communication['Tamanho (bytes)'] = start_info['size']
+                        communications.append(communication)
+                    else:
+                        _registrar_diagnostico(diagnosticos, 'fim_sem_inicio', num_linha,
+                                               f"fim do link '{key}' sem início correspondente")
+            except (IndexError, ValueError) as erro:
+                _registrar_diagnostico(diagnosticos, 'linha_malformada', num_linha,
+                                       f"{line.strip()!r} ({type(erro).__name__})")
+
+    for key in links_started:
+        _registrar_diagnostico(diagnosticos, 'link_nao_finalizado', None, f"link '{key}' sem fim")
+    for rank_id, stack in rank_state_stacks.items():
+        for state_id, _ in stack:
+            _registrar_diagnostico(diagnosticos, 'estado_nao_finalizado', None,
+                                   f"estado '{state_id}' aberto no rank {rank_id}")
+
+    df_communications = pd.DataFrame(communications)
+    df_communications.attrs['diagnosticos'] = diagnosticos
+    print(formatar_diagnosticos(diagnosticos))
+
+    if retornar_estados:
+        return df_communications, pd.DataFrame(state_intervals)
+
+    return df_communications
+
+class _Vocabulario(dict):
+    """Texto -> código, atribuindo o próximo código a cada texto novo."""
+
+    def __missing__(self, texto):
+        codigo = self[texto] = len(self)
+        return codigo
+
+
+def _prepassar_definicoes(nome_arquivo_trace, limites):
+    """
+    Lê as declarações %EventDef e os PajeDefineEntityValue de estado do trace.
+
+    Returns:
+        tuple: (fotos, indice_tamanho, cabecalho_valido). fotos tem, para cada
+        bloco (inicio, fim), as definições de estado e de eventos válidas no
+        início do bloco e quantas linhas de definição o bloco contém
+        (conferidas pelo trabalhador). cabecalho_valido é False se houver
+        linhas % depois do primeiro evento.
+    """
+    with open(nome_arquivo_trace, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return [({}, set(), 0) for _ in limites], None, True
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            definicoes = [(m.start() + 1, m.group()[1:].decode()) for m in _PADRAO_DEFINICOES.finditer(mapa)]
+            primeira = mapa[:mapa.find(b'\n')] if mapa.find(b'\n') >= 0 else mapa[:]
+            if _PADRAO_DEFINICOES.match(b'\n' + primeira):
+                definicoes.insert(0, (0, primeira.decode()))
+
+            # As declarações % devem vir todas antes do primeiro evento
+            cabecalho = [linha for _, linha in definicoes if linha.startswith('%')]
+            fim_cabecalho = max((inicio for inicio, linha in definicoes if linha.startswith('%')), default=0)
+            cabecalho_valido = all(not linha.strip() or linha.startswith((b'%', b'#'))
+                                   for linha in mapa[:fim_cabecalho].split(b'\n'))
+
+    fotos = []
+    state_definitions = {}
+    event_definitions = set()
+    proxima = 0
+    for inicio, fim in limites:
+        fotos.append((dict(state_definitions), set(event_definitions)))
+        contagem = 0
+        while proxima < len(definicoes) and definicoes[proxima][0] < fim:
+            linha = definicoes[proxima][1]
+            parts = linha.split()
+            if linha.startswith('%EventDef'):
+                event_definitions.add(parts[2])
+            elif linha.startswith('5') and len(parts) > 3 and parts[2] == '2':
+                state_definitions[parts[1]] = parts[3].strip('"')
+            contagem += 1
+            proxima += 1
+        fotos[-1] += (contagem,)
+
+    return fotos, _indice_campo_tamanho(cabecalho), cabecalho_valido
+
+
+def _dividir_em_blocos(nome_arquivo_trace, n_blocos):
+    """Divide o arquivo em até n_blocos intervalos de bytes alinhados ao fim de linha."""
+    tamanho = os.path.getsize(nome_arquivo_trace)
+    limites = [0]
+    with open(nome_arquivo_trace, 'rb') as f:
+        for i in range(1, n_blocos):
+            f.seek(max(tamanho * i // n_blocos, limites[-1]))
+            f.readline()
+            if f.tell() >= tamanho:
+                break
+            if f.tell() > limites[-1]:
+                limites.append(f.tell())
+    return list(zip(limites, limites[1:] + [tamanho]))
+
+
+def _analisar_bloco(tarefa):
+    """
+    Analisa um bloco de bytes do trace com o mesmo laço do parser sequencial.
+
+    O que depende do que veio antes do bloco (estado corrente de cada rank,
+    pilhas de estados, links abertos e o último tempo) fica pendente e é
+    resolvido por _costurar_blocos, na ordem dos blocos. O estado de um
+    rank antes do seu primeiro push no bloco é uma única entrada por
+    (rank, versão das definições de estado), à qual as mensagens se referem
+    pelo código -2 - entrada; -1 marca o que a costura preenche. Ranks e
+    nomes de estado saem como códigos de um vocabulário local e todas as
+    colunas como arrays numpy, para que o retorno ao processo principal
+    seja barato.
+    """
+    (nome_arquivo_trace, inicio, fim, primeiro, state_definitions, event_definitions,
+     indice_tamanho, retornar_estados) = tarefa
+
+    codigos = _Vocabulario()
+    entradas = _Vocabulario()
+    versoes = [state_definitions]
+    # Rank -> código do estado corrente ou, antes do primeiro push no bloco, da sua entrada
+    codigo_rank = {}
+    current_rank_states = {}
+    links_started = {}
+    # Chave -> linha do início, se o primeiro evento da chave no bloco é um
+    # início (negativa depois que esse link termina), ou 0 se é um fim
+    links_vistos = {}
+    fins_sem_contexto = []
+    origens, destinos, acoes, estados = array('i'), array('i'), array('i'), array('i')
+    inicios, fins, tamanhos = array('d'), array('d'), array('q')
+    rank_state_stacks = {}
+    pops_sem_contexto = []
+    intervalos_rank, intervalos_estado = array('i'), array('i')
+    intervalos_entrada, intervalos_saida = array('d'), array('d')
+    diagnosticos = {}
+    last_time = 0.0 if primeiro else float('-inf')
+    primeiro_tempo = None
+    linhas_definicao = 0
+    num_linha = 0
+
+    def registrar(categoria, mensagem):
+        entrada = diagnosticos.setdefault(categoria, {'ocorrencias': 0, 'exemplos': []})
+        entrada['ocorrencias'] += 1
+        if len(entrada['exemplos']) < MAX_EXEMPLOS_DIAGNOSTICO:
+            entrada['exemplos'].append((num_linha, mensagem))
+
+    with open(nome_arquivo_trace, 'rb') as f:
+        f.seek(inicio)
+        dados = f.read(fim - inicio)
+
+    for num_linha, line in enumerate(io.TextIOWrapper(io.BytesIO(dados)), start=1):
+        if line.startswith('%'):
+            if line.startswith('%EventDef'):
+                event_definitions.add(line.split()[2])
+            linhas_definicao += 1
+            continue
+        if line.startswith('#') or not line.strip():
+            continue
+
+        parts = line.split()
+        event_type = parts[0]
+
+        if event_type not in event_definitions:
+            registrar('evento_nao_definido', f"evento '{event_type}' não declarado no cabeçalho")
+
+        try:
+            if len(event_type) > 1 or event_type >= '6':
+                event_time = float(parts[1])
+                if primeiro_tempo is None:
+                    primeiro_tempo = event_time
+                if event_time < last_time:
+                    registrar('tempo_nao_monotonico', f"tempo {parts[1]} anterior a {last_time:.6f}")
+                last_time = event_time
+
+            if event_type == '5':
+                linhas_definicao += 1
+                if parts[2] == '2':
+                    state_definitions = {**state_definitions, parts[1]: parts[3].strip('"')}
+                    versoes.append(state_definitions)
+                    codigo_rank = {r: codigos[state_definitions.get(s, "Unknown")]
+                                   for r, s in current_rank_states.items()}
+
+            elif event_type == '12':
+                rank_id = parts[3]
+                state_id = parts[4]
+                current_rank_states[rank_id] = state_id
+                codigo_rank[rank_id] = codigos[state_definitions.get(state_id, "Unknown")]
+
+                if state_id not in state_definitions:
+                    registrar('valor_indefinido', f"estado '{state_id}' não definido (rank {rank_id})")
+
+                rank_state_stacks.setdefault(rank_id, []).append((state_id, event_time))
+
+            elif event_type == '13':
+                rank_id = parts[3]
+                stack = rank_state_stacks.get(rank_id)
+                if not stack:
+                    # O push pode estar num bloco anterior
+                    indice = None
+                    if retornar_estados:
+                        indice = len(intervalos_rank)
+                        intervalos_rank.append(codigos[rank_id])
+                        intervalos_estado.append(-1)
+                        intervalos_entrada.append(float('nan'))
+                        intervalos_saida.append(event_time)
+                    pops_sem_contexto.append((num_linha, rank_id, indice, len(versoes) - 1))
+                else:
+                    state_id, entry_time = stack.pop()
+                    if retornar_estados:
+                        intervalos_rank.append(codigos[rank_id])
+                        intervalos_estado.append(codigos[state_definitions.get(state_id, "Unknown")])
+                        intervalos_entrada.append(entry_time)
+                        intervalos_saida.append(event_time)
+
+            elif event_type == '15':
+                size = int(parts[indice_tamanho]) if indice_tamanho is not None else -1
+                origin_rank = parts[5]
+                key = parts[6]
+                origin_action = codigo_rank.get(origin_rank)
+                if origin_action is None:
+                    origin_action = codigo_rank[origin_rank] = -2 - entradas[(origin_rank, len(versoes) - 1)]
+
+                if key in links_started:
+                    registrar('link_duplicado', f"link '{key}' iniciado novamente antes do fim")
+                links_vistos.setdefault(key, num_linha)
+
+                links_started[key] = (event_time, origin_rank, origin_action, size)
+
+            elif event_type == '16':
+                destination_rank = parts[5]
+                key = parts[6]
+                destination_state = codigo_rank.get(destination_rank)
+                if destination_state is None:
+                    destination_state = codigo_rank[destination_rank] = -2 - entradas[(destination_rank,
+                                                                                          len(versoes) - 1)]
+
+                if key in links_started:
+                    start_time, origin_rank, origin_action, size = links_started.pop(key)
+                    if links_vistos[key] > 0:
+                        links_vistos[key] = -links_vistos[key]
+                    origens.append(codigos[origin_rank])
+                    acoes.append(origin_action)
+                    inicios.append(start_time)
+                    tamanhos.append(size)
+                elif key not in links_vistos:
+                    # O início pode estar num bloco anterior
+                    fins_sem_contexto.append((num_linha, key, len(origens)))
+                    links_vistos[key] = 0
+                    origens.append(-1)
+                    acoes.append(-1)
+                    inicios.append(float('nan'))
+                    tamanhos.append(-1)
+                else:
+                    registrar('fim_sem_inicio', f"fim do link '{key}' sem início correspondente")
+                    continue
+                destinos.append(codigos[destination_rank])
+                estados.append(destination_state)
+                fins.append(event_time)
+        except (IndexError, ValueError) as erro:
+            registrar('linha_malformada', f"{line.strip()!r} ({type(erro).__name__})")
+
+    inicios_sem_contexto = {key: linha for key, linha in links_vistos.items() if linha}
+
+    return {
+        'linhas': num_linha,
+        'linhas_definicao': linhas_definicao,
+        'primeiro_tempo': primeiro_tempo,
+        'ultimo_tempo': last_time,
+        'vocabulario': list(codigos),
+        'entradas': list(entradas),
+        'versoes': versoes,
+        'estados_correntes': current_rank_states,
+        'links_abertos': links_started,
+        # Chaves cujo primeiro evento no bloco é um início, numa única string
+        'inicios_sem_contexto': ('\n'.join(inicios_sem_contexto),
+                                 np.abs(np.array(list(inicios_sem_contexto.values()), dtype=np.int64)),
+                                 np.array(list(inicios_sem_contexto.values()), dtype=np.int64) < 0),
+        'fins_sem_contexto': fins_sem_contexto,
+        'comunicacoes': [np.array(c, dtype=np.int64) for c in (origens, destinos, acoes, estados)] +
+                        [np.array(inicios), np.array(fins), np.array(tamanhos)],
+        'pilhas': rank_state_stacks,
+        'pops_sem_contexto': pops_sem_contexto,
+        'intervalos': [np.array(intervalos_rank, dtype=np.int64), np.array(intervalos_estado, dtype=np.int64),
+                       np.array(intervalos_entrada), np.array(intervalos_saida)],
+        'diagnosticos': diagnosticos
+    }
+
+
+def _costurar_blocos(blocos, contagens_definicao):
+    """
+    Junta os blocos na ordem do arquivo, resolvendo o que ficou pendente.
+
+    Returns:
+        tuple: (vocabulário, colunas de comunicação, colunas de intervalo,
+        diagnósticos) como o parser sequencial os produziria, ou None se a
+        leitura sequencial for necessária: tempo não monotônico exatamente
+        numa fronteira entre blocos, ou linhas de definição que a
+        pré-passada não reconheceu.
+    """
+    vocabulario = {}
+    estados_correntes = {}
+    links_abertos = {}
+    pilhas = {}
+    communications = []
+    state_intervals = []
+    exemplos = {}
+    ocorrencias = {}
+    deslocamento = 0
+    last_time = 0.0
+
+    def codigo(texto):
+        return vocabulario.setdefault(texto, len(vocabulario))
+
+    def registrar(categoria, linha, mensagem):
+        ocorrencias[categoria] = ocorrencias.get(categoria, 0) + 1
+        exemplos.setdefault(categoria, []).append((linha, mensagem))
+
+    for i, (bloco, contagem) in enumerate(zip(blocos, contagens_definicao)):
+        if bloco['linhas_definicao'] != contagem:
+            return None
+        if bloco['primeiro_tempo'] is not None:
+            if i > 0 and bloco['primeiro_tempo'] < last_time:
+                return None
+            last_time = bloco['ultimo_tempo']
+
+        for categoria, dados in bloco['diagnosticos'].items():
+            ocorrencias[categoria] = ocorrencias.get(categoria, 0) + dados['ocorrencias']
+            exemplos.setdefault(categoria, []).extend(
+                (deslocamento + linha, mensagem) for linha, mensagem in dados['exemplos'])
+
+        # Estado de cada entrada (rank, versão) herdado dos blocos anteriores
+        versoes = bloco['versoes']
+        entradas = [codigo(versoes[versao].get(estados_correntes.get(rank_id), "Unknown"))
+                    for rank_id, versao in bloco['entradas']]
+
+        # Tabela de tradução indexada pelo código local: c >= 0 é o vocabulário,
+        # -2 - k a entrada k e -1 continua marcando o que a costura preenche
+        tabela = np.array([codigo(texto) for texto in bloco['vocabulario']] + entradas[::-1] + [-1], dtype=np.int64)
+        comunicacoes = [tabela[c] for c in bloco['comunicacoes'][:4]] + bloco['comunicacoes'][4:]
+        intervalos = [tabela[c] for c in bloco['intervalos'][:2]] + bloco['intervalos'][2:]
+        manter_comunicacoes = np.ones(len(comunicacoes[0]), dtype=bool)
+        manter_intervalos = np.ones(len(intervalos[0]), dtype=bool)
+        abertos = {key: (inicio, origem, int(tabela[acao]), size)
+                   for key, (inicio, origem, acao, size) in bloco['links_abertos'].items()}
+
+        # Pops de estados empilhados em blocos anteriores
+        for linha, rank_id, indice, versao in bloco['pops_sem_contexto']:
+            stack = pilhas.get(rank_id)
+            if not stack:
+                registrar('pop_sem_push', deslocamento + linha, f"pop sem estado aberto (rank {rank_id})")
+                if indice is not None:
+                    manter_intervalos[indice] = False
+            else:
+                state_id, entry_time = stack.pop()
+                if indice is not None:
+                    intervalos[1][indice] = codigo(versoes[versao].get(state_id, "Unknown"))
+                    intervalos[2][indice] = entry_time
+
+        # Links que atravessam a fronteira
+        for linha, key, indice in bloco['fins_sem_contexto']:
+            if key in links_abertos:
+                start_time, origin_rank, origin_action, size = links_abertos.pop(key)
+                comunicacoes[0][indice] = codigo(origin_rank)
+                comunicacoes[2][indice] = origin_action
+                comunicacoes[4][indice] = start_time
+                comunicacoes[6][indice] = size
+            else:
+                registrar('fim_sem_inicio', deslocamento + linha, f"fim do link '{key}' sem início correspondente")
+                manter_comunicacoes[indice] = False
+        chaves, linhas, encerrados = bloco['inicios_sem_contexto']
+        posicoes = {key: p for p, key in enumerate(chaves.split('\n'))} if links_abertos and len(linhas) else {}
+        for key in list(links_abertos):
+            posicao = posicoes.get(key)
+            if posicao is not None:
+                registrar('link_duplicado', deslocamento + int(linhas[posicao]),
+                          f"link '{key}' iniciado novamente antes do fim")
+                if encerrados[posicao]:
+                    del links_abertos[key]
+                else:
+                    # Reinício de um link aberto mantém sua posição
+                    links_abertos[key] = abertos.pop(key)
+        links_abertos.update(abertos)
+
+        estados_correntes.update(bloco['estados_correntes'])
+        for rank_id, stack in bloco['pilhas'].items():
+            pilhas.setdefault(rank_id, []).extend(stack)
+
+        communications.append([c[manter_comunicacoes] for c in comunicacoes])
+        state_intervals.append([c[manter_intervalos] for c in intervalos])
+        deslocamento += bloco['linhas']
+
+    for key in links_abertos:
+        registrar('link_nao_finalizado', None, f"link '{key}' sem fim")
+    for rank_id, stack in pilhas.items():
+        for state_id, _ in stack:
+            registrar('estado_nao_finalizado', None, f"estado '{state_id}' aberto no rank {rank_id}")
+
+    # Mesma ordem de categorias e exemplos da leitura sequencial
+    fim_do_trace = deslocamento + 1
+    for categoria in exemplos:
+        exemplos[categoria].sort(key=lambda e: fim_do_trace if e[0] is None else e[0])
+    diagnosticos = {}
+    for categoria in sorted(exemplos, key=lambda c: (exemplos[c][0][0] or fim_do_trace, _ORDEM_NA_LINHA.get(c, 2))):
+        diagnosticos[categoria] = {'ocorrencias': ocorrencias[categoria], 'exemplos': []}
+        for linha, mensagem in exemplos[categoria][:MAX_EXEMPLOS_DIAGNOSTICO]:
+            local = f"linha {linha}" if linha is not None else "fim do trace"
+            diagnosticos[categoria]['exemplos'].append(f"{local}: {mensagem}")
+
+    communications = [np.concatenate(c) for c in zip(*communications)]
+    state_intervals = [np.concatenate(c) for c in zip(*state_intervals)]
+
+    return list(vocabulario), communications, state_intervals, diagnosticos
+
+
+def analisar_trace_paralelo(nome_arquivo_trace, retornar_estados=False, n_processos=None, n_blocos=None):
+    """
+    Analisa um único trace em paralelo, dividindo-o em blocos de bytes.
+
+    Uma pré-passada lê as declarações de eventos e as definições de estado
+    (que podem aparecer no meio do trace); cada bloco é então analisado num
+    processo do pool e os blocos são costurados em ordem: estado corrente e
+    pilha de cada rank, links que cruzam fronteiras, índices de chamada e
+    diagnósticos. A saída é idêntica à de analisar_trace_completo; nos casos
+    que a costura não cobre (ver _costurar_blocos), recorre à leitura
+    sequencial.
+
+    Args:
+        nome_arquivo_trace (str): O caminho para o arquivo .trace.
+        retornar_estados (bool): Como em analisar_trace_completo.
+        n_processos (int): Processos do pool (None = um por CPU).
+        n_blocos (int): Número de blocos (padrão: um por processo).
+
+    Returns:
+        pandas.DataFrame ou tuple: Como em analisar_trace_completo.
+    """
+    n_processos = n_processos or os.cpu_count()
+    limites = _dividir_em_blocos(nome_arquivo_trace, n_blocos or n_processos)
+    fotos, indice_tamanho, cabecalho_valido = _prepassar_definicoes(nome_arquivo_trace, limites)
+    if not cabecalho_valido:
+        return analisar_trace_completo(nome_arquivo_trace, retornar_estados)
+
+    tarefas = [(nome_arquivo_trace, inicio, fim, i == 0, definicoes, eventos, indice_tamanho, retornar_estados)
+               for i, ((inicio, fim), (definicoes, eventos, _)) in enumerate(zip(limites, fotos))]
+    if len(tarefas) == 1:
+        blocos = [_analisar_bloco(tarefas[0])]
+    else:
+        with Pool(min(n_processos, len(tarefas))) as pool:
+            blocos = pool.map(_analisar_bloco, tarefas, chunksize=1)
+
+    costura = _costurar_blocos(blocos, [contagem for _, _, contagem in fotos])
+    if costura is None:
+        return analisar_trace_completo(nome_arquivo_trace, retornar_estados)
+    vocabulario, communications, state_intervals, diagnosticos = costura
+    textos = np.array(vocabulario, dtype=object)
+
+    print(f"Analisando o arquivo: {nome_arquivo_trace}")
+
+    if len(communications[0]):
+        origem, destino, acao, estado, inicio, fim, tamanho = communications
+        df_communications = pd.DataFrame({
+            'Rank Origem': textos[origem],
+            'Rank Destino': textos[destino],
+            'Ação da Origem': textos[acao],
+            'Estado do Destino': textos[estado],
+            'Tempo Inicial': inicio,
+            'Tempo Final': fim
+        })
+        if indice_tamanho is not None:
+            df_communications['Tamanho (bytes)'] = tamanho
+    else:
+        df_communications = pd.DataFrame([])
+    df_communications.attrs['diagnosticos'] = diagnosticos
+    print(formatar_diagnosticos(diagnosticos))
+
+    if retornar_estados:
+        if len(state_intervals[0]):
+            rank, nome_estado, entrada, saida = state_intervals
+            chamada = pd.Series(np.zeros(len(rank), dtype=np.int64)).groupby([rank, nome_estado]).cumcount()
+            df_estados = pd.DataFrame({
+                'Rank': textos[rank],
+                'Estado': textos[nome_estado],
+                'Chamada': chamada.to_numpy(),
+                'Tempo Entrada': entrada,
+                'Tempo Saída': saida
+            })
+        else:
+            df_estados = pd.DataFrame([])
+        return df_communications, df_estados
+
+    return df_communications
+
+
+def verificar_equivalencia_paralela(nome_arquivo_trace, n_processos=None, n_blocos=None):
+    """
+    Confere se a leitura paralela produz exatamente a saída da sequencial.
+
+    Returns:
+        bool: True se comunicações, estados e diagnósticos forem idênticos.
+    """
+    sequencial, estados_seq = analisar_trace_completo(nome_arquivo_trace, retornar_estados=True)
+    paralelo, estados_par = analisar_trace_paralelo(nome_arquivo_trace, True, n_processos, n_blocos)
+
+    return (sequencial.equals(paralelo) and estados_seq.equals(estados_par) and
+            list(sequencial.dtypes) == list(paralelo.dtypes) and
+            list(estados_seq.dtypes) == list(estados_par.dtypes) and
+            sequencial.attrs['diagnosticos'] == paralelo.attrs['diagnosticos'])
+
+
+def impressao_digital_trace(nome_arquivo_trace, tamanho_bloco=1 << 20):
+    """
+    Impressão digital (BLAKE2b) do corpo de um trace, sem as linhas '#'.
+
+    Os comentários do SimGrid trazem a versão e a linha de comando (que
+    difere, por exemplo, entre bcast e bcastflex) e são ignorados pelo
+    parser, então traces com a mesma impressão digital têm a mesma análise.
+    O arquivo é lido em blocos cortados em fim de linha.
+
+    Args:
+        nome_arquivo_trace (str): O caminho para o arquivo .trace.
+        tamanho_bloco (int): Bytes lidos por vez.
+
+    Returns:
+        str: A impressão digital em hexadecimal.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    resto = b''
+    with open(nome_arquivo_trace, 'rb') as f:
+        while bloco := f.read(tamanho_bloco):
+            bloco = resto + bloco
+            corte = bloco.rfind(b'\n') + 1
+            bloco, resto = bloco[:corte], bloco[corte:]
+            digest.update(_PADRAO_COMENTARIOS.sub(b'', bloco))
+    digest.update(_PADRAO_COMENTARIOS.sub(b'', resto))
+    return digest.hexdigest()
+
+
+def _ler_catalogo(diretorio):
+    """Catálogo de um diretório de tabelas compiladas (vazio se não existir)."""
+    caminho = os.path.join(diretorio, ARQUIVO_CATALOGO)
+    if not os.path.exists(caminho):
+        return pd.DataFrame(columns=['Tabela', 'Trace', 'Impressão Digital', 'Tamanho do Trace (bytes)', 'Original'])
+    return pd.read_csv(caminho, keep_default_na=False)
+
+
+def resumir_tabela(df_communications, impressao_digital=None):
+    """
+    Resumo das durações de uma tabela compilada, suficiente para as
+    estatísticas básicas, a escalabilidade e as comparações do MPILogAnalyzer.
+
+    Guarda contagem, soma, soma dos quadrados, mínimo, mediana e máximo da
+    duração (Tempo Final - Tempo Inicial) e um esboço dos quantis: o histograma dos
+    valores distintos com as contagens. Os tempos do trace têm resolução de
+    microssegundos, então o histograma costuma ser exato; acima de LIMITE_ESBOCO valores distintos, grupos
+    consecutivos de mesma contagem total viram um centróide (média ponderada),
+    o que preserva soma e contagem.
+
+    Args:
+        df_communications (pandas.DataFrame): Tabela de analisar_trace_completo.
+        impressao_digital (str): Impressão digital do trace de origem.
+
+    Returns:
+        dict: O resumo, serializável em JSON.
+    """
+    duracoes = np.subtract(df_communications['Tempo Final'].to_numpy(dtype=np.float64),
+                           df_communications['Tempo Inicial'].to_numpy(dtype=np.float64))
+    valores, contagens = np.unique(duracoes, return_counts=True)
+
+    exato = len(valores) <= LIMITE_ESBOCO
+    if not exato:
+        acumulado = np.cumsum(contagens)
+        grupos = np.searchsorted(acumulado, np.linspace(0, acumulado[-1], LIMITE_ESBOCO + 1)[1:-1], side='right')
+        inicios = np.unique(np.concatenate(([0], grupos)))
+        somas = np.add.reduceat(valores * contagens, inicios)
+        contagens = np.add.reduceat(contagens, inicios)
+        valores = somas / contagens
+
+    vazio = len(duracoes) == 0
+    return {
+        'impressao_digital': impressao_digital,
+        'contagem': int(len(duracoes)),
+        'soma': float(np.sum(duracoes)),
+        'soma_quadrados': float(np.dot(duracoes, duracoes)),
+        'minimo': None if vazio else float(duracoes.min()),
+        'mediana': None if vazio else float(np.median(duracoes)),
+        'maximo': None if vazio else float(duracoes.max()),
+        'esboco': {'valores': valores.tolist(), 'contagens': contagens.tolist(), 'exato': bool(exato)}
+    }
+
+
+def gravar_resumo(df_communications, nome_arquivo_tabela, impressao_digital=None):
+    """
+    Grava o resumo de uma tabela em <nome>_resumo.json, ao lado dela.
+
+    Args:
+        df_communications (pandas.DataFrame): Tabela de analisar_trace_completo.
+        nome_arquivo_tabela (str): Caminho do <nome>_completo.csv.
+        impressao_digital (str): Impressão digital do trace de origem.
+
+    Returns:
+        str: O caminho do resumo gravado.
+    """
+    nome_arquivo_resumo = nome_arquivo_tabela.replace('_completo.csv', SUFIXO_RESUMO)
+    with open(nome_arquivo_resumo, 'w', encoding='utf-8') as f:
+        json.dump(resumir_tabela(df_communications, impressao_digital), f)
+    return nome_arquivo_resumo
+
+
+def gerar_resumos(diretorio_saida):
+    """
+    Grava o resumo das tabelas de um diretório compiladas sem ele (ou
+    recompiladas depois dele), com a impressão digital do catálogo.
+
+    Args:
+        diretorio_saida (str): Diretório das tabelas compiladas.
+
+    Returns:
+        list: Os caminhos dos resumos gravados.
+    """
+    catalogo = _ler_catalogo(diretorio_saida)
+    digitais = dict(zip(catalogo['Tabela'], catalogo['Impressão Digital']))
+
+    gravados = []
+    for nome_tabela in sorted(glob.glob(os.path.join(diretorio_saida, '*_completo.csv'))):
+        nome_resumo = nome_tabela.replace('_completo.csv', SUFIXO_RESUMO)
+        if os.path.exists(nome_resumo) and os.path.getmtime(nome_resumo) >= os.path.getmtime(nome_tabela):
+            continue
+        df_communications = pd.read_csv(nome_tabela, usecols=['Tempo Inicial', 'Tempo Final'])
+        gravados.append(gravar_resumo(df_communications, nome_tabela,
+                                      digitais.get(os.path.basename(nome_tabela)) or None))
+        print(f"✓ {os.path.basename(nome_resumo)}")
+    return gravados
+
+
+def compilar_traces(diretorio_simulacao, diretorio_saida, retornar_estados=False, catalogos_externos=(),
+                    n_processos=1):
+    """
+    Converte os traces <topologia>/<tecnologia>/<nós>/*.trace de uma simulação
+    nas tabelas <nome>_completo.csv lidas pelo MPILogAnalyzer.
+
+    Cada trace é identificado pela impressão digital do corpo; um trace
+    equivalente a outro já compilado (nesta execução, numa execução
+    anterior registrada no catálogo do diretório de saída ou num dos
+    catalogos_externos, por exemplo o de outra simulação) não é analisado
+    nem gravado: vira um apelido no catálogo, com a coluna Original
+    apontando (relativa ao diretório de saída) para a tabela que já existe.
+    Tabelas já compiladas com a mesma impressão digital também não são
+    refeitas (com retornar_estados, só se o <nome>_estados.csv também
+    existir). Uma tabela gravada antes que passa a ser apelido é apagada,
+    junto com o resumo e os estados; cada arquivo apagado é listado na
+    saída. Cada tabela gravada ganha o seu <nome>_resumo.json (ver
+    resumir_tabela), com o qual o MPILogAnalyzer(resumos=True) monta as
+    estatísticas agregadas sem ler as linhas.
+
+    Args:
+        diretorio_simulacao (str): Raiz da simulação (ex.: simulacao2).
+        diretorio_saida (str): Diretório das tabelas e do catalogo.csv.
+        retornar_estados (bool): Também grava <nome>_estados.csv.
+        catalogos_externos (iterable): Outros diretórios de tabelas compiladas
+            cujas tabelas podem ser reaproveitadas.
+        n_processos (int): Repassado a analisar_trace_completo.
+
+    Returns:
+        pandas.DataFrame: O catálogo gravado em diretorio_saida/catalogo.csv.
+    """
+    os.makedirs(diretorio_saida, exist_ok=True)
+    anterior = _ler_catalogo(diretorio_saida).set_index('Tabela')
+
+    # Impressão digital -> tabela original (relativa ao diretório de saída)
+    conhecidas = {}
+    for diretorio in catalogos_externos:
+        for _, linha in _ler_catalogo(diretorio).iterrows():
+            original = linha['Original'] or linha['Tabela']
+            conhecidas.setdefault(linha['Impressão Digital'], os.path.relpath(
+                os.path.join(diretorio, original), diretorio_saida))
+
+    traces = sorted(glob.glob(os.path.join(diretorio_simulacao, '*', '*', '*', '*.trace')))
+    catalogo = []
+    for nome_trace in traces:
+        tabela = os.path.basename(nome_trace)[:-len('.trace')] + '_completo.csv'
+        digital = impressao_digital_trace(nome_trace)
+        original = conhecidas.get(digital)
+
+        if original is None:
+            estados = os.path.join(diretorio_saida, tabela.replace('_completo.csv', '_estados.csv'))
+            ja_compilada = (tabela in anterior.index and not anterior.at[tabela, 'Original'] and
+                            anterior.at[tabela, 'Impressão Digital'] == digital and
+                            os.path.exists(os.path.join(diretorio_saida, tabela)) and
+                            (not retornar_estados or os.path.exists(estados)))
+            if not ja_compilada:
+                resultado = analisar_trace_completo(nome_trace, retornar_estados, n_processos)
+                df_communications = resultado[0] if retornar_estados else resultado
+                df_communications.to_csv(os.path.join(diretorio_saida, tabela), index=False)
+                gravar_resumo(df_communications, os.path.join(diretorio_saida, tabela), digital)
+                if retornar_estados:
+                    resultado[1].to_csv(estados, index=False)
+            conhecidas[digital] = tabela
+            original = ''
+        else:
+            # Tabela gravada antes de virar apelido: o conteúdo é o mesmo da original
+            for sufixo in ('_completo.csv', SUFIXO_RESUMO, '_estados.csv'):
+                arquivo = os.path.join(diretorio_saida, tabela.replace('_completo.csv', sufixo))
+                if os.path.exists(arquivo):
+                    os.remove(arquivo)
+                    print(f"  removido {os.path.basename(arquivo)} (apelido de {original})")
+
+        catalogo.append({
+            'Tabela': tabela,
+            'Trace': os.path.relpath(nome_trace, diretorio_saida),
+            'Impressão Digital': digital,
+            'Tamanho do Trace (bytes)': os.path.getsize(nome_trace),
+            'Original': original
+        })
+        print(f"✓ {tabela}" + (f" (apelido de {original})" if original else ""))
+
+    df_catalogo = pd.DataFrame(catalogo)
+    df_catalogo.to_csv(os.path.join(diretorio_saida, ARQUIVO_CATALOGO), index=False)
+
+    # Tabelas já compiladas antes dos resumos ganham o seu agora
+    gerar_resumos(diretorio_saida)
+    apelidos = (df_catalogo['Original'] != '').sum() if not df_catalogo.empty else 0
+    print(f"{len(df_catalogo)} traces, {apelidos} apelidos de traces equivalentes")
+
+    return df_catalogo
+
+
+class _EscritorEventosTrace:
+    """Escreve eventos no formato Chrome trace-event (JSON) à medida que surgem."""
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.eventos = 0
+        arquivo.write('{"displayTimeUnit": "ns", "traceEvents": [\n')
+
+    def escrever(self, evento):
+        if self.eventos:
+            self.arquivo.write(',\n')
+        self.arquivo.write(json.dumps(evento, ensure_ascii=False, separators=(',', ':')))
+        self.eventos += 1
+
+    def fechar(self):
+        self.arquivo.write('\n]}\n')
+
+
+class _AgrupadorEstados:
+    """
+    Junta, por rank e profundidade da pilha, estados consecutivos curtos.
+
+    Intervalos mais curtos que o limiar e separados por menos que o limiar
+    viram uma única fatia; ao fechar um estado, os grupos pendentes das
+    profundidades internas são descarregados, então as fatias continuam
+    aninhadas dentro do estado pai.
+    """
+
+    def __init__(self, escritor, limiar):
+        self.escritor = escritor
+        self.limiar = limiar
+        self.pendentes = {}
+
+    def adicionar(self, tid, profundidade, nome, entrada, saida):
+        grupos = self.pendentes.setdefault(tid, {})
+        for nivel in [p for p in grupos if p > profundidade]:
+            self._descarregar(tid, nivel)
+
+        grupo = grupos.get(profundidade)
+        curto = saida - entrada < self.limiar
+        if grupo is not None and (not curto or entrada - grupo['saida'] >= self.limiar):
+            self._descarregar(tid, profundidade)
+            grupo = None
+
+        if not curto:
+            self._emitir(tid, nome, entrada, saida, {nome: 1})
+        elif grupo is None:
+            grupos[profundidade] = {'entrada': entrada, 'saida': saida, 'nomes': {nome: 1}}
+        else:
+            grupo['saida'] = saida
+            grupo['nomes'][nome] = grupo['nomes'].get(nome, 0) + 1
+
+    def descarregar_tudo(self):
+        for tid, grupos in self.pendentes.items():
+            for profundidade in list(grupos):
+                self._descarregar(tid, profundidade)
+
+    def _descarregar(self, tid, profundidade):
+        grupo = self.pendentes[tid].pop(profundidade)
+        self._emitir(tid, None, grupo['entrada'], grupo['saida'], grupo['nomes'])
+
+    def _emitir(self, tid, nome, entrada, saida, nomes):
+        total = sum(nomes.values())
+        if total > 1:
+            nome = next(iter(nomes)) if len(nomes) == 1 else 'estados curtos'
+            nome = f"{nome} x{total}"
+        elif nome is None:
+            nome = next(iter(nomes))
+        evento = {'name': nome, 'cat': 'estado', 'ph': 'X', 'pid': 0, 'tid': tid,
+                  'ts': entrada * 1e6, 'dur': (saida - entrada) * 1e6}
+        if total > 1:
+            evento['args'] = {'estados': nomes}
+        self.escritor.escrever(evento)
+
+
+def exportar_perfetto(nome_arquivo_trace, nome_arquivo_saida, inicio=None, fim=None, ranks=None, limiar=0.0):
+    """
+    Exporta um trace Paje para o formato Chrome trace-event (Perfetto).
+
+    O trace é lido em streaming e os eventos são gravados à medida que se
+    completam, sem montar o trace em memória: cada estado (push/pop) vira
+    uma fatia na linha do seu rank e cada mensagem (start/end link) um
+    fluxo da origem ao destino. Estados e mensagens mais curtos que o
+    limiar e consecutivos (separados por menos que o limiar) são
+    agrupados numa única fatia/fluxo, o que reduz o arquivo em traces
+    grandes. Com nome_arquivo_saida terminado em .gz a saída é comprimida.
+
+    Args:
+        nome_arquivo_trace (str): O caminho para o arquivo .trace.
+        nome_arquivo_saida (str): O arquivo .json (ou .json.gz) de saída.
+        inicio (float): Início da janela de tempo em segundos (None = início do trace).
+        fim (float): Fim da janela de tempo em segundos (None = fim do trace).
+            Estados são recortados na janela; mensagens que a cruzam são mantidas.
+        ranks (iterable): Containers exportados, como em 'Rank Origem' (None = todos).
+            Uma mensagem é exportada se origem e destino estão no subconjunto.
+        limiar (float): Duração (s) abaixo da qual estados e mensagens são agrupados.
+
+    Returns:
+        int: Número de eventos gravados.
+    """
+    inicio = float('-inf') if inicio is None else inicio
+    fim = float('inf') if fim is None else fim
+    ranks = None if ranks is None else {str(rank) for rank in ranks}
+
+    state_definitions = {}
+    rank_state_stacks = {}
+    links_started = {}
+    mensagens_pendentes = {}
+    tids = _Vocabulario()
+    last_time = inicio
+    num_fluxo = 0
+
+    def tid_de(container):
+        return int(container) if container.isdigit() else -1 - tids[container]
+
+    def emitir_mensagem(origem, destino, partida, chegada, quantidade):
+        nonlocal num_fluxo
+        num_fluxo += 1
+        args = {'origem': origem, 'destino': destino}
+        if quantidade > 1:
+            args['mensagens'] = quantidade
+        comum = {'name': 'mensagem', 'cat': 'mensagem', 'pid': 0, 'id': num_fluxo, 'args': args}
+        escritor.escrever({**comum, 'ph': 's', 'tid': tid_de(origem), 'ts': partida * 1e6})
+        escritor.escrever({**comum, 'ph': 'f', 'bp': 'e', 'tid': tid_de(destino), 'ts': chegada * 1e6})
+
+    def registrar_mensagem(origem, destino, partida, chegada):
+        # Mensagens curtas consecutivas do mesmo par viram um único fluxo
+        par = (origem, destino)
+        grupo = mensagens_pendentes.get(par)
+        curta = chegada - partida < limiar
+        if grupo is not None and (not curta or partida - grupo[1] >= limiar):
+            emitir_mensagem(origem, destino, *mensagens_pendentes.pop(par))
+            grupo = None
+        if not curta:
+            emitir_mensagem(origem, destino, partida, chegada, 1)
+        elif grupo is None:
+            mensagens_pendentes[par] = [partida, chegada, 1]
+        else:
+            grupo[1] = chegada
+            grupo[2] += 1
+
+    print(f"Exportando o arquivo: {nome_arquivo_trace}")
+
+    abrir = gzip.open if str(nome_arquivo_saida).endswith('.gz') else open
+    with open(nome_arquivo_trace, 'r') as f, abrir(nome_arquivo_saida, 'wt', encoding='utf-8') as saida:
+        escritor = _EscritorEventosTrace(saida)
+        agrupador = _AgrupadorEstados(escritor, limiar)
+        escritor.escrever({'name': 'process_name', 'ph': 'M', 'pid': 0,
+                           'args': {'name': os.path.basename(nome_arquivo_trace)}})
+
+        for line in f:
+            if line.startswith(('%', '#')) or not line.strip():
+                continue
+
+            parts = line.split()
+            event_type = parts[0]
+            try:
+                if len(event_type) > 1 or event_type >= '6':
+                    event_time = float(parts[1])
+                    if event_time > fim:
+                        # Depois da janela só interessam os fins das mensagens abertas
+                        if not links_started:
+                            break
+                        if event_type != '16':
+                            continue
+                    last_time = max(last_time, min(event_time, fim))
+
+                # 5: PajeDefineEntityValue (Define o nome de um estado)
+                if event_type == '5' and parts[2] == '2':
+                    state_definitions[parts[1]] = parts[3].strip('"')
+
+                # 6: PajeCreateContainer (Nome da linha do rank)
+                elif event_type == '6':
+                    container = parts[2]
+                    if ranks is None or container in ranks:
+                        escritor.escrever({'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': tid_de(container),
+                                           'args': {'name': parts[-1].strip('"')}})
+
+                # 12: PajePushState (Um rank entra em um estado)
+                elif event_type == '12':
+                    rank_id = parts[3]
+                    if ranks is None or rank_id in ranks:
+                        rank_state_stacks.setdefault(rank_id, []).append((parts[4], event_time))
+
+                # 13: PajePopState (Um rank sai do estado corrente)
+                elif event_type == '13':
+                    stack = rank_state_stacks.get(parts[3])
+                    if stack:
+                        state_id, entry_time = stack.pop()
+                        if event_time >= inicio:
+                            agrupador.adicionar(tid_de(parts[3]), len(stack),
+                                                state_definitions.get(state_id, "Unknown"),
+                                                max(entry_time, inicio), event_time)
+
+                # 15: PajeStartLink (Início de uma comunicação)
+                elif event_type == '15':
+                    if ranks is None or parts[5] in ranks:
+                        links_started[parts[6]] = (parts[5], event_time)
+
+                # 16: PajeEndLink (Fim de uma comunicação)
+                elif event_type == '16':
+                    start_info = links_started.pop(parts[6], None)
+                    if start_info is not None and event_time >= inicio and (ranks is None or parts[5] in ranks):
+                        registrar_mensagem(start_info[0], parts[5], start_info[1], event_time)
             except (IndexError, ValueError):
-                pass
+                continue
+
+        # Estados ainda abertos terminam no fim da janela (ou no último evento lido)
+        for rank_id, stack in rank_state_stacks.items():
+            while stack:
+                state_id, entry_time = stack.pop()
+                if last_time >= inicio:
+                    agrupador.adicionar(tid_de(rank_id), len(stack), state_definitions.get(state_id, "Unknown"),
+                                        max(entry_time, inicio), last_time)
+        agrupador.descarregar_tudo()
+        for (origem, destino), grupo in mensagens_pendentes.items():
+            emitir_mensagem(origem, destino, *grupo)
+
+        escritor.fechar()
+
+    print(f"{escritor.eventos} eventos exportados para: {nome_arquivo_saida}")
+    return escritor.eventos
 
-    return pd.DataFrame(communications)
 
 # --- Execução Principal ---
 if __name__ == "__main__":
     nome_do_arquivo = 'gt.trace'
-    df_resultado = analisar_trace_completo(nome_do_arquivo)
+    df_resultado, df_estados = analisar_trace_completo(nome_do_arquivo, retornar_estados=True)
 
     if not df_resultado.empty:
         nome_arquivo_saida = 'communication_analysis_completo.csv'
         df_resultado.to_csv(nome_arquivo_saida, index=False)
+        df_estados.to_csv('communication_analysis_estados.csv', index=False)
         print(f"\nAnálise completa concluída com sucesso!")
         print(f"{len(df_resultado)} comunicações foram analisadas.")
         print(f"Resultados salvos em: {nome_arquivo_saida}")
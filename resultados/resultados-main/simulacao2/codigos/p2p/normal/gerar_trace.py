@@ -0,0 +1,431 @@
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from analisar import analisar_trace_completo, analisar_trace_paralelo
+
+# Eventos do cabeçalho Paje gerado pelo SimGrid: (nome, id, campos)
+EVENTOS_PAJE = (
+    ('PajeDefineContainerType', 0, ('Alias string', 'Type string', 'Name string')),
+    ('PajeDefineVariableType', 1, ('Alias string', 'Type string', 'Name string', 'Color color')),
+    ('PajeDefineStateType', 2, ('Alias string', 'Type string', 'Name string')),
+    ('PajeDefineEventType', 3, ('Alias string', 'Type string', 'Name string')),
+    ('PajeDefineLinkType', 4, ('Alias string', 'Type string', 'StartContainerType string',
+                               'EndContainerType string', 'Name string')),
+    ('PajeDefineEntityValue', 5, ('Alias string', 'Type string', 'Name string', 'Color color')),
+    ('PajeCreateContainer', 6, ('Time date', 'Alias string', 'Type string', 'Container string', 'Name string')),
+    ('PajeDestroyContainer', 7, ('Time date', 'Type string', 'Name string')),
+    ('PajeSetVariable', 8, ('Time date', 'Type string', 'Container string', 'Value double')),
+    ('PajeAddVariable', 9, ('Time date', 'Type string', 'Container string', 'Value double')),
+    ('PajeSubVariable', 10, ('Time date', 'Type string', 'Container string', 'Value double')),
+    ('PajeSetState', 11, ('Time date', 'Type string', 'Container string', 'Value string')),
+    ('PajePushState', 12, ('Time date', 'Type string', 'Container string', 'Value string')),
+    ('PajePopState', 13, ('Time date', 'Type string', 'Container string')),
+    ('PajeResetState', 14, ('Time date', 'Type string', 'Container string')),
+    ('PajeStartLink', 15, ('Time date', 'Type string', 'Container string', 'Value string',
+                           'StartContainer string', 'Key string')),
+    ('PajeEndLink', 16, ('Time date', 'Type string', 'Container string', 'Value string',
+                         'EndContainer string', 'Key string')),
+    ('PajeNewEvent', 17, ('Time date', 'Type string', 'Container string', 'Value string')),
+)
+
+# Tipos de container, estado e link declarados logo após o cabeçalho
+TIPOS_PAJE = ('0 1 0 MPI', '2 2 1 MPI_STATE', '4 3 0 1 1 MPI_LINK',
+              '4 4 0 1 1 MIGRATE_LINK', '2 5 1 MIGRATE_STATE')
+
+# Estado MPI de cada padrão e cor usada pelo SimGrid
+ESTADOS_PADRAO = {
+    'bcast': ('PMPI_Bcast', '0 0.78 0.39'),
+    'reduce': ('PMPI_Reduce', '0 1 0'),
+    'gather': ('PMPI_Gather', '1 1 0'),
+    'scatter': ('PMPI_Scatter', '1 0.74 0.54'),
+    'all2all': ('PMPI_Alltoall', '0.52 0 1'),
+}
+ESTADOS_PINGPONG = (('PMPI_Recv', '1 0 0'), ('PMPI_Send', '0 0 1'))
+PADROES_SINTETICOS = tuple(ESTADOS_PADRAO) + ('pingpong',)
+
+# Tags das chaves de link: coletivas (SimGrid) e ponto a ponto (tag 0 dos benchmarks)
+TAG_COLETIVA = -3334
+TAG_PONTO_A_PONTO = 0
+
+# Ordem, num mesmo instante, dos eventos de uma rodada
+_PUSH, _INICIO, _FIM, _POP = range(4)
+
+
+def _rodadas(padrao, n_ranks):
+    """
+    Rodadas de uma chamada do padrão, em ranks relativos à raiz.
+
+    Mensagens de uma mesma rodada são simultâneas; cada rodada começa
+    quando a anterior termina. As rodadas são geradas sob demanda (o
+    all2all tem n_ranks - 1 rodadas de n_ranks mensagens).
+
+    Yields:
+        tuple: Arrays (origens, destinos) de cada rodada.
+    """
+    if padrao not in ESTADOS_PADRAO:
+        raise ValueError(f"Padrão desconhecido: {padrao!r} (use um de {PADROES_SINTETICOS})")
+
+    passos = []
+    mascara = 1
+    while mascara < n_ranks:
+        passos.append(mascara)
+        mascara *= 2
+
+    if padrao in ('bcast', 'reduce'):
+        # bcast: árvore binomial, a raiz envia primeiro para o rank mais distante; reduce: o inverso
+        for m in (reversed(passos) if padrao == 'bcast' else passos):
+            r = np.arange(0, n_ranks - m, 2 * m)
+            yield (r, r + m) if padrao == 'bcast' else (r + m, r)
+    elif padrao == 'gather':
+        yield np.arange(1, n_ranks), np.zeros(n_ranks - 1, dtype=np.int64)
+    elif padrao == 'scatter':
+        yield np.zeros(n_ranks - 1, dtype=np.int64), np.arange(1, n_ranks)
+    else:
+        r = np.arange(n_ranks)
+        for k in range(1, n_ranks):
+            yield r, (r + k) % n_ranks
+
+
+def _posicoes_repetidas(valores):
+    """Posição de cada elemento entre os iguais a ele (cumcount sem pandas)."""
+    ordem = np.argsort(valores, kind='stable')
+    ordenados = valores[ordem]
+    indices = np.arange(len(valores))
+    primeiro = np.maximum.accumulate(np.where(np.r_[True, ordenados[1:] != ordenados[:-1]], indices, 0))
+    posicoes = np.empty_like(indices)
+    posicoes[ordem] = indices - primeiro
+    return posicoes
+
+
+class _EscritorPaje:
+    """Formata e grava, em lotes ordenados por tempo, as linhas do trace."""
+
+    def __init__(self, arquivo, precisao, tamanho):
+        self.arquivo = arquivo
+        self.precisao = precisao
+        self.tamanho = tamanho
+        self.chaves = 0
+        self.mensagens = 0
+
+    def gravar(self, eventos, ordenar=True):
+        """Grava eventos (tempo, ordem, linha sem o tempo), por padrão em ordem de tempo."""
+        if ordenar:
+            eventos.sort(key=lambda evento: (evento[0], evento[1]))
+        p = self.precisao
+        self.arquivo.write(''.join(f"{linha[0]} {t:.{p}f} {linha[1]}\n" for t, _, linha in eventos))
+
+    def mensagens_rodada(self, origens, destinos, inicios, fins, tag):
+        """Pares de eventos (início, fim de link), um por mensagem da rodada."""
+        primeira = self.chaves + 1
+        self.chaves += len(origens)
+        self.mensagens += len(origens)
+        sufixo = f" {self.tamanho}" if self.tamanho is not None else ''
+
+        eventos = []
+        for seq, (o, d, t0, t1) in enumerate(zip(origens.tolist(), destinos.tolist(),
+                                                  inicios.tolist(), fins.tolist()), start=primeira):
+            chave = f"{o}_{d}_{tag}_{seq}"
+            eventos.append(((t0, _INICIO, ('15', f"3 0 PTP {o} {chave}{sufixo}")),
+                            (t1, _FIM, ('16', f"3 0 PTP {d} {chave}"))))
+        return eventos
+
+
+def gerar_trace(nome_arquivo_trace, padrao, n_ranks, iteracoes=100, tamanho=1024, latencia=2e-6,
+                banda=25e9, raiz=0, ruido=0.05, semente=42, exibir_tamanhos=False, precisao=6):
+    """
+    Gera um trace Paje sintético no formato do SimGrid (SMPI).
+
+    O arquivo tem o mesmo cabeçalho %EventDef, containers rank-<r>,
+    definições de estado (PajeDefineEntityValue), push/pop de estados e
+    start/end links dos traces reais, e é escrito em streaming (uma rodada
+    de mensagens por vez), então traces de vários GB não passam pela
+    memória. Cada mensagem leva latencia + tamanho / banda, com ruído
+    relativo; mensagens de uma rodada que compartilham origem ou destino
+    são serializadas. As coletivas seguem a árvore binomial (bcast/reduce),
+    o padrão linear na raiz (gather/scatter) e trocas cíclicas (all2all);
+    o pingpong é o manager-worker de pingpong.c. As iterações não se
+    sobrepõem, como se houvesse uma barreira entre as chamadas.
+
+    Args:
+        nome_arquivo_trace (str): O arquivo .trace de saída.
+        padrao (str): Um de PADROES_SINTETICOS.
+        n_ranks (int): Número de processos MPI (>= 2).
+        iteracoes (int): Número de chamadas (IT dos benchmarks).
+        tamanho (int): Tamanho das mensagens em bytes.
+        latencia (float): Latência por mensagem em segundos.
+        banda (float): Banda em bytes/s.
+        raiz (int): Rank raiz (root/master) do padrão.
+        ruido (float): Variação relativa das durações e dos atrasos de entrada.
+        semente (int): Semente do ruído.
+        exibir_tamanhos (bool): Inclui o campo Size no PajeStartLink, como
+            --cfg=tracing/smpi/display-sizes:yes.
+        precisao (int): Casas decimais dos tempos (tracing/precision).
+
+    Returns:
+        int: Número de mensagens geradas.
+    """
+    if padrao not in PADROES_SINTETICOS:
+        raise ValueError(f"Padrão desconhecido: {padrao!r} (use um de {PADROES_SINTETICOS})")
+    if n_ranks < 2:
+        raise ValueError("O trace sintético requer pelo menos 2 processos MPI")
+
+    gerador = np.random.default_rng(semente)
+    transmissao = tamanho / banda
+    custo = latencia + transmissao
+    containers = (np.arange(n_ranks) + raiz) % n_ranks + 1
+
+    with open(nome_arquivo_trace, 'w', buffering=1 << 20) as f:
+        escritor = _EscritorPaje(f, precisao, tamanho if exibir_tamanhos else None)
+
+        f.write(f"#This file was generated by gerar_trace.py (sintético, {padrao}, {n_ranks} ranks)\n")
+        for nome, identificador, campos in EVENTOS_PAJE:
+            if nome == 'PajeStartLink' and exibir_tamanhos:
+                campos = campos + ('Size int',)
+            f.write(f"%EventDef {nome} {identificador}\n")
+            f.write(''.join(f"%       {campo}\n" for campo in campos))
+            f.write("%EndEventDef\n")
+        f.write('\n'.join(TIPOS_PAJE) + '\n')
+        escritor.gravar([(0.0, _PUSH, ('6', f'{r} 1 0 "rank-{r - 1}"')) for r in range(1, n_ranks + 1)])
+
+        # MPI_Init
+        f.write('5 6 2 PMPI_Init "0 1 0"\n')
+        eventos = []
+        for r in range(1, n_ranks + 1):
+            eventos.append((0.0, _PUSH, ('12', f"2 {r} 6")))
+            eventos.append((0.0, _POP, ('13', f"2 {r}")))
+        escritor.gravar(eventos)
+
+        if padrao == 'pingpong':
+            (recv, cor_recv), (send, cor_send) = ESTADOS_PINGPONG
+            f.write(f'5 7 2 {recv} "{cor_recv}"\n5 8 2 {send} "{cor_send}"\n5 9 2 PMPI_Finalize "0 1 0"\n')
+            tempo = _gerar_pingpong(escritor, gerador, containers, iteracoes, latencia, transmissao, ruido)
+            finalize = 9
+        else:
+            estado, cor = ESTADOS_PADRAO[padrao]
+            f.write(f'5 7 2 {estado} "{cor}"\n5 8 2 PMPI_Finalize "0 1 0"\n')
+            tempo = _gerar_coletiva(escritor, gerador, containers, lambda: _rodadas(padrao, n_ranks),
+                                    iteracoes, latencia, transmissao, custo, ruido)
+            finalize = 8
+
+        # MPI_Finalize e destruição dos containers
+        eventos = []
+        for r in range(1, n_ranks + 1):
+            eventos.append((tempo, _PUSH, ('12', f"2 {r} {finalize}")))
+            eventos.append((tempo, _POP, ('13', f"2 {r}")))
+            eventos.append((tempo, _POP + 1, ('7', f"1 {r}")))
+        escritor.gravar(eventos)
+
+    return escritor.mensagens
+
+
+def _gerar_coletiva(escritor, gerador, containers, rodadas, iteracoes, latencia, transmissao, custo, ruido):
+    """
+    Grava as iterações de uma coletiva e devolve o tempo final.
+
+    rodadas é uma função sem argumentos que devolve um iterador novo das
+    rodadas (ver _rodadas), percorrido uma vez por iteração.
+    """
+    n_ranks = len(containers)
+
+    # Cada rank sai da coletiva ao fim da última rodada em que participa
+    ultima = np.full(n_ranks, -1)
+    n_rodadas = 0
+    for i, (origens, destinos) in enumerate(rodadas()):
+        ultima[origens] = i
+        ultima[destinos] = i
+        n_rodadas = i + 1
+    ultima[ultima < 0] = n_rodadas - 1
+    ordem = np.argsort(ultima, kind='stable')
+    saem = np.split(ordem, np.searchsorted(ultima[ordem], np.arange(1, n_rodadas)))
+
+    tempo = 0.0
+    for _ in range(iteracoes):
+        # Entrada na coletiva com atraso aleatório por rank
+        entradas = tempo + gerador.uniform(0, ruido * custo, n_ranks)
+        escritor.gravar([(t, _PUSH, ('12', f"2 {r} 7")) for r, t in zip(containers.tolist(), entradas.tolist())])
+        inicio_rodada = entradas.max()
+
+        for (origens, destinos), sair in zip(rodadas(), saem):
+            fila = np.maximum(_posicoes_repetidas(origens), _posicoes_repetidas(destinos))
+            n = len(origens)
+            inicios = inicio_rodada + fila * transmissao + gerador.uniform(0, ruido * custo, n)
+            fins = inicios + latencia + transmissao * (1 + gerador.uniform(-ruido, ruido, n))
+            fim_rodada = fins.max()
+
+            eventos = [evento for par in escritor.mensagens_rodada(containers[origens], containers[destinos],
+                                                                   inicios, fins, TAG_COLETIVA)
+                       for evento in par]
+            eventos.extend((fim_rodada, _POP, ('13', f"2 {r}")) for r in containers[sair].tolist())
+            escritor.gravar(eventos)
+            inicio_rodada = fim_rodada
+
+        tempo = inicio_rodada
+
+    return tempo
+
+
+def _gerar_pingpong(escritor, gerador, containers, iteracoes, latencia, transmissao, ruido):
+    """Grava as iterações do pingpong (master -> worker -> master) e devolve o tempo final."""
+    workers = containers[1:]
+    mestre = containers[0]
+    n = 2 * len(workers)
+    origens = np.empty(n, dtype=np.int64)
+    destinos = np.empty(n, dtype=np.int64)
+    origens[0::2], destinos[0::2] = mestre, workers
+    origens[1::2], destinos[1::2] = workers, mestre
+
+    tempo = 0.0
+    for _ in range(iteracoes):
+        # Mensagens sequenciais: cada uma começa exatamente quando a anterior termina,
+        # então as linhas já saem em ordem de tempo, mensagem a mensagem
+        fins = tempo + np.cumsum(latencia + transmissao * (1 + gerador.uniform(-ruido, ruido, n)))
+        inicios = np.r_[tempo, fins[:-1]]
+        links = escritor.mensagens_rodada(origens, destinos, inicios, fins, TAG_PONTO_A_PONTO)
+
+        eventos = []
+        for o, d, t0, t1, (inicio, fim) in zip(origens.tolist(), destinos.tolist(),
+                                               inicios.tolist(), fins.tolist(), links):
+            eventos.append((t0, _PUSH, ('12', f"2 {o} 8")))
+            eventos.append((t0, _PUSH, ('12', f"2 {d} 7")))
+            eventos.append(inicio)
+            eventos.append(fim)
+            eventos.append((t1, _POP, ('13', f"2 {o}")))
+            eventos.append((t1, _POP, ('13', f"2 {d}")))
+        escritor.gravar(eventos, ordenar=False)
+        tempo = fins[-1]
+
+    return tempo
+
+
+def medir_parser(padrao, lista_ranks, iteracoes=100, diretorio='traces_sinteticos', diretorio_csv=None,
+                 medir_memoria=True, **parametros):
+    """
+    Mede o parser em traces sintéticos de tamanho crescente.
+
+    Para cada número de ranks gera o trace (sempre de novo, para que o
+    tempo de geração seja medido e o trace siga os parâmetros), analisa
+    com analisar_trace_completo e registra tempo e pico de memória
+    (tracemalloc, que deixa a leitura mais lenta; medir_memoria=False
+    mede só o tempo). Com diretorio_csv, salva as comunicações como
+    <padrao>_sintetica_sintetica_<ranks>_completo.csv, no formato lido
+    pelo MPILogAnalyzer.
+
+    Args:
+        padrao (str): Um de PADROES_SINTETICOS.
+        lista_ranks (list): Números de ranks a medir.
+        iteracoes (int): Número de chamadas por trace.
+        diretorio (str): Onde os traces são gravados.
+        diretorio_csv (str): Onde salvar os CSVs compilados (None = não salva).
+        medir_memoria (bool): Mede o pico de memória com tracemalloc.
+        **parametros: Repassados a gerar_trace.
+
+    Returns:
+        pandas.DataFrame: Uma linha por número de ranks com mensagens,
+        tamanho do trace, tempo de geração, tempo de análise e pico de memória.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    if diretorio_csv:
+        os.makedirs(diretorio_csv, exist_ok=True)
+
+    medidas = []
+    for n_ranks in lista_ranks:
+        nome_trace = os.path.join(diretorio, f"{padrao}_sintetico_{n_ranks}.trace")
+
+        inicio = time.perf_counter()
+        mensagens = gerar_trace(nome_trace, padrao, n_ranks, iteracoes, **parametros)
+        tempo_geracao = time.perf_counter() - inicio
+
+        if medir_memoria:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        df = analisar_trace_completo(nome_trace)
+        tempo_analise = time.perf_counter() - inicio
+        pico = None
+        if medir_memoria:
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        if diretorio_csv:
+            df.to_csv(os.path.join(diretorio_csv, f"{padrao}_sintetica_sintetica_{n_ranks}_completo.csv"), index=False)
+
+        medidas.append({
+            'Ranks': n_ranks,
+            'Mensagens': mensagens,
+            'Tamanho do Trace (MB)': os.path.getsize(nome_trace) / 2**20,
+            'Tempo de Geração (s)': tempo_geracao,
+            'Tempo de Análise (s)': tempo_analise,
+            'Mensagens/s': mensagens / tempo_analise if tempo_analise > 0 else np.nan,
+            'Pico de Memória (MB)': pico / 2**20 if pico is not None else np.nan
+        })
+        print(f"✓ {padrao} com {n_ranks} ranks: {mensagens} mensagens em {tempo_analise:.2f} s")
+
+    return pd.DataFrame(medidas)
+
+
+def medir_paralelo(nome_trace, lista_processos, repeticoes=3):
+    """
+    Compara a leitura paralela com a sequencial num mesmo trace.
+
+    Cada configuração é medida repeticoes vezes e fica o menor tempo. A
+    aceleração depende dos núcleos disponíveis (coluna CPUs): com um só
+    núcleo os blocos são lidos um após o outro e a leitura paralela não
+    tem como ganhar da sequencial.
+
+    Args:
+        nome_trace (str): Trace a analisar.
+        lista_processos (list): Números de processos a medir.
+        repeticoes (int): Medições por configuração.
+
+    Returns:
+        pandas.DataFrame: Uma linha por número de processos com os tempos
+        sequencial e paralelo e a aceleração.
+    """
+    def menor_tempo(funcao):
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+        return min(tempos)
+
+    tempo_sequencial = menor_tempo(lambda: analisar_trace_completo(nome_trace))
+
+    medidas = []
+    for n_processos in lista_processos:
+        tempo_paralelo = menor_tempo(lambda: analisar_trace_paralelo(nome_trace, n_processos=n_processos))
+        medidas.append({
+            'Processos': n_processos,
+            'CPUs': os.cpu_count(),
+            'Tempo Sequencial (s)': tempo_sequencial,
+            'Tempo Paralelo (s)': tempo_paralelo,
+            'Aceleração': tempo_sequencial / tempo_paralelo
+        })
+        print(f"✓ {n_processos} processos: {tempo_paralelo:.2f} s (sequencial {tempo_sequencial:.2f} s)")
+
+    return pd.DataFrame(medidas)
+
+
+# --- Execução Principal ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Gera um trace Paje sintético no formato do SimGrid')
+    parser.add_argument('padrao', choices=PADROES_SINTETICOS)
+    parser.add_argument('ranks', type=int)
+    parser.add_argument('-o', '--saida', help='Arquivo .trace de saída (padrão: <padrao>_sintetico_<ranks>.trace)')
+    parser.add_argument('--iteracoes', type=int, default=100)
+    parser.add_argument('--tamanho', type=int, default=1024)
+    parser.add_argument('--latencia', type=float, default=2e-6)
+    parser.add_argument('--banda', type=float, default=25e9)
+    parser.add_argument('--raiz', type=int, default=0)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--exibir-tamanhos', action='store_true')
+    args = parser.parse_args()
+
+    saida = args.saida or f"{args.padrao}_sintetico_{args.ranks}.trace"
+    mensagens = gerar_trace(saida, args.padrao, args.ranks, args.iteracoes, args.tamanho, args.latencia,
+                            args.banda, args.raiz, semente=args.semente, exibir_tamanhos=args.exibir_tamanhos)
+    print(f"{mensagens} mensagens geradas em: {saida}")
@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Os módulos não formam um pacote: cada diretório entra no caminho de importação
+sys.path.insert(0, str(RAIZ / 'csv_compilados_simulacao2'))
+sys.path.insert(0, str(RAIZ / 'simulacao2' / 'codigos' / 'p2p' / 'normal'))
+
+from analisar import analisar_trace_completo  # noqa: E402
+from gerar_trace import gerar_trace  # noqa: E402
+
+# Parâmetros de rede dos traces sintéticos de cada tecnologia
+TECNOLOGIAS = {
+    'infiniband': {'latencia': 1e-6, 'banda': 25e9},
+    'gigabitethernet': {'latencia': 50e-6, 'banda': 125e6},
+}
+
+# Cada topologia é uma semente de ruído diferente
+TOPOLOGIAS = {'torus': 1, 'fattree': 2}
+
+
+@pytest.fixture(scope='session')
+def diretorio_tabelas(tmp_path_factory):
+    """Tabelas compiladas de traces sintéticos (2 padrões x 2 topologias x 2 tecnologias x 2 tamanhos)."""
+    diretorio = tmp_path_factory.mktemp('tabelas')
+    for padrao in ('bcast', 'gather'):
+        for topologia, semente in TOPOLOGIAS.items():
+            for tecnologia, parametros in TECNOLOGIAS.items():
+                for n_ranks in (4, 8):
+                    nome = f'{padrao}_{topologia}_{tecnologia}_{n_ranks}'
+                    trace = diretorio / f'{nome}.trace'
+                    gerar_trace(str(trace), padrao, n_ranks, iteracoes=20, semente=semente, **parametros)
+                    analisar_trace_completo(str(trace)).to_csv(diretorio / f'{nome}_completo.csv', index=False)
+                    trace.unlink()
+    return diretorio
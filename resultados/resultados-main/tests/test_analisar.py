@@ -0,0 +1,213 @@
+import gzip
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analisar import (LIMITE_ESBOCO, analisar_trace_completo, analisar_trace_paralelo, compilar_traces,
+                      exportar_perfetto, formatar_diagnosticos, impressao_digital_trace, resumir_tabela,
+                      verificar_equivalencia_paralela)
+from gerar_trace import gerar_trace
+
+
+@pytest.fixture(scope='module')
+def trace_sintetico(tmp_path_factory):
+    trace = tmp_path_factory.mktemp('traces') / 'all2all_sintetico_8.trace'
+    gerar_trace(str(trace), 'all2all', 8, iteracoes=10, exibir_tamanhos=True)
+    return trace
+
+
+def _mutar(trace, destino):
+    """Copia o trace com um tempo fora de ordem, um pop sem push e um estado definido no meio."""
+    linhas = trace.read_text().splitlines(keepends=True)
+    eventos = [i for i, linha in enumerate(linhas) if linha.split(' ', 1)[0] in ('12', '13', '15', '16')]
+    meio = eventos[len(eventos) // 2]
+    campos = linhas[meio].split(' ')
+    campos[1] = '0.0'
+    linhas[meio] = ' '.join(campos)
+    pushes = [i for i in eventos if linhas[i].startswith('12 ')]
+    del linhas[pushes[len(pushes) // 3]]
+    linhas.insert(eventos[2 * len(eventos) // 3], '5 99 2 "MPI_Novo" "1 1 1"\n')
+    destino.write_text(''.join(linhas))
+    return destino
+
+
+@pytest.mark.parametrize('n_blocos', [1, 2, 3, 7])
+def test_paralelo_equivalente_ao_sequencial(trace_sintetico, n_blocos):
+    assert verificar_equivalencia_paralela(str(trace_sintetico), n_processos=2, n_blocos=n_blocos)
+
+
+@pytest.mark.parametrize('n_blocos', [2, 5])
+def test_paralelo_equivalente_em_trace_com_erros(trace_sintetico, tmp_path, n_blocos):
+    trace = _mutar(trace_sintetico, tmp_path / 'mutado.trace')
+    diagnosticos = analisar_trace_paralelo(str(trace), n_processos=2, n_blocos=n_blocos).attrs['diagnosticos']
+    assert {'tempo_nao_monotonico', 'pop_sem_push'} <= set(diagnosticos)
+    assert verificar_equivalencia_paralela(str(trace), n_processos=2, n_blocos=n_blocos)
+
+
+def test_paralelo_retorna_tamanhos(trace_sintetico):
+    df = analisar_trace_paralelo(str(trace_sintetico), n_processos=2)
+    assert (df['Tamanho (bytes)'] == 1024).all()
+
+
+def test_estados_numeram_as_chamadas(tmp_path):
+    trace = tmp_path / 'bcast_sintetico_4.trace'
+    gerar_trace(str(trace), 'bcast', 4, iteracoes=5)
+    _, estados = analisar_trace_completo(str(trace), retornar_estados=True)
+
+    bcast = estados[estados['Estado'] == 'PMPI_Bcast']
+    assert bcast['Rank'].nunique() == 4
+    for _, chamadas in bcast.groupby('Rank')['Chamada']:
+        assert list(chamadas) == [0, 1, 2, 3, 4]
+    assert (estados['Tempo Saída'] >= estados['Tempo Entrada']).all()
+
+
+def test_validador_categorias(tmp_path):
+    trace = tmp_path / 'pingpong_sintetico_2.trace'
+    gerar_trace(str(trace), 'pingpong', 2, iteracoes=1)
+    with open(trace, 'a') as f:
+        f.write('99 0.000005\n'                          # evento_nao_definido
+                '12 abc 2 1 6\n'                         # linha_malformada
+                '12 0.000005 2 1 42\n'                   # valor_indefinido (e estado aberto)
+                '13 0.000005 2 2\n'                      # pop_sem_push
+                '16 0.000006 3 0 PTP 1 sem_inicio\n'     # fim_sem_inicio
+                '15 0.000006 3 0 PTP 1 aberto\n'
+                '15 0.000006 3 0 PTP 1 aberto\n'         # link_duplicado (e link aberto)
+                '12 0.000001 2 2 6\n'                    # tempo_nao_monotonico (e estado aberto)
+                '7 0.000002 1 1\n')                      # volta a crescer: sem novo diagnóstico
+    diagnosticos = analisar_trace_completo(str(trace)).attrs['diagnosticos']
+
+    assert {categoria: dados['ocorrencias'] for categoria, dados in diagnosticos.items()} == {
+        'evento_nao_definido': 1,
+        'linha_malformada': 1,
+        'valor_indefinido': 1,
+        'pop_sem_push': 1,
+        'fim_sem_inicio': 1,
+        'link_duplicado': 1,
+        'tempo_nao_monotonico': 1,
+        'link_nao_finalizado': 1,
+        'estado_nao_finalizado': 2,
+    }
+    assert diagnosticos['linha_malformada']['exemplos'][0].endswith("'12 abc 2 1 6' (ValueError)")
+    assert formatar_diagnosticos(diagnosticos).endswith('Seu trace tem 6 erros e 4 avisos.')
+    assert verificar_equivalencia_paralela(str(trace), n_processos=2, n_blocos=3)
+
+
+def _eventos_perfetto(trace, saida, **opcoes):
+    total = exportar_perfetto(str(trace), str(saida), **opcoes)
+    abrir = gzip.open if str(saida).endswith('.gz') else open
+    with abrir(saida, 'rt', encoding='utf-8') as f:
+        eventos = json.load(f)['traceEvents']
+    assert total == len(eventos)
+    return eventos
+
+
+def test_exportar_perfetto(tmp_path):
+    trace = tmp_path / 'pingpong_sintetico_4.trace'
+    gerar_trace(str(trace), 'pingpong', 4, iteracoes=3)
+    df, estados = analisar_trace_completo(str(trace), retornar_estados=True)
+    eventos = _eventos_perfetto(trace, tmp_path / 'pingpong.json.gz')
+
+    fases = pd.Series([evento['ph'] for evento in eventos]).value_counts()
+    assert fases['X'] == len(estados)
+    assert fases['s'] == fases['f'] == len(df)
+    assert fases['M'] == 1 + 4
+    fatias = sorted((evento['tid'], evento['ts'], evento['dur']) for evento in eventos if evento['ph'] == 'X')
+    esperadas = sorted(zip(estados['Rank'].astype(int), estados['Tempo Entrada'] * 1e6,
+                           (estados['Tempo Saída'] - estados['Tempo Entrada']) * 1e6))
+    assert fatias == pytest.approx(esperadas)
+
+
+def test_exportar_perfetto_agrupa_e_filtra(tmp_path):
+    trace = tmp_path / 'pingpong_sintetico_4.trace'
+    gerar_trace(str(trace), 'pingpong', 4, iteracoes=3)
+    df = analisar_trace_completo(str(trace))
+
+    # Limiar maior que o trace: as mensagens de cada par viram um único fluxo
+    agrupados = _eventos_perfetto(trace, tmp_path / 'agrupado.json', limiar=1.0)
+    partidas = [evento for evento in agrupados if evento['ph'] == 's']
+    pares = df.groupby(['Rank Origem', 'Rank Destino']).size()
+    assert len(partidas) == len(pares)
+    assert sorted(evento['args']['mensagens'] for evento in partidas) == sorted(pares)
+
+    # Só o rank 2: nenhuma mensagem tem as duas pontas no subconjunto
+    filtrados = _eventos_perfetto(trace, tmp_path / 'filtrado.json', ranks=[2])
+    assert {evento['tid'] for evento in filtrados if 'tid' in evento} == {2}
+    assert not [evento for evento in filtrados if evento['ph'] in ('s', 'f')]
+
+
+def _simulacao(diretorio, traces):
+    """Monta <diretorio>/torus/infiniband/4 com os traces {nome: (padrao, comentario)}."""
+    pasta = diretorio / 'torus' / 'infiniband' / '4'
+    pasta.mkdir(parents=True)
+    for nome, (padrao, comentario) in traces.items():
+        gerar_trace(str(pasta / f'{nome}.trace'), padrao, 4, iteracoes=3)
+        corpo = (pasta / f'{nome}.trace').read_text()
+        (pasta / f'{nome}.trace').write_text(f'#{comentario}\n{corpo}')
+    return diretorio
+
+
+def test_impressao_digital_ignora_comentarios(tmp_path):
+    nomes = {'bcast': ('bcast', 'smpirun bcast'), 'bcastflex': ('bcast', 'smpirun bcastflex 0'),
+             'gather': ('gather', 'smpirun gather')}
+    traces = _simulacao(tmp_path, nomes) / 'torus' / 'infiniband' / '4'
+    digitais = {nome: impressao_digital_trace(str(traces / f'{nome}.trace')) for nome in nomes}
+
+    assert digitais['bcast'] == digitais['bcastflex'] != digitais['gather']
+    assert impressao_digital_trace(str(traces / 'bcast.trace'), tamanho_bloco=100) == digitais['bcast']
+
+
+def test_compilar_traces_deduplica(tmp_path, capsys):
+    simulacao = _simulacao(tmp_path / 'sim', {
+        'bcast_torus_infiniband_4': ('bcast', 'smpirun bcast'),
+        'bcastflex_torus_infiniband_4': ('bcast', 'smpirun bcastflex 0'),
+        'gather_torus_infiniband_4': ('gather', 'smpirun gather')})
+    saida = tmp_path / 'csv'
+    saida.mkdir()
+    # Tabela de uma compilação anterior, que agora vira apelido
+    (saida / 'bcastflex_torus_infiniband_4_completo.csv').write_text('antiga\n')
+
+    catalogo = compilar_traces(str(simulacao), str(saida)).set_index('Tabela')
+    saida_texto = capsys.readouterr().out
+
+    assert (catalogo.at['bcastflex_torus_infiniband_4_completo.csv', 'Original'] ==
+            'bcast_torus_infiniband_4_completo.csv')
+    assert catalogo.at['gather_torus_infiniband_4_completo.csv', 'Original'] == ''
+    assert not (saida / 'bcastflex_torus_infiniband_4_completo.csv').exists()
+    assert 'removido bcastflex_torus_infiniband_4_completo.csv' in saida_texto
+    assert saida_texto.count('Analisando o arquivo') == 2
+    assert sorted(arquivo.name for arquivo in saida.iterdir()) == [
+        'bcast_torus_infiniband_4_completo.csv', 'bcast_torus_infiniband_4_resumo.json', 'catalogo.csv',
+        'gather_torus_infiniband_4_completo.csv', 'gather_torus_infiniband_4_resumo.json']
+
+    # Nada mudou: nenhuma tabela é refeita; pedir os estados refaz as que não os têm
+    compilar_traces(str(simulacao), str(saida))
+    assert 'Analisando o arquivo' not in capsys.readouterr().out
+    compilar_traces(str(simulacao), str(saida), retornar_estados=True)
+    assert capsys.readouterr().out.count('Analisando o arquivo') == 2
+    assert (saida / 'gather_torus_infiniband_4_estados.csv').exists()
+
+    # Outra simulação com um trace equivalente reaproveita a tabela desta
+    outra = _simulacao(tmp_path / 'sim2', {'gather_torus_infiniband_4': ('gather', 'outra versão')})
+    catalogo_outra = compilar_traces(str(outra), str(tmp_path / 'csv2'), catalogos_externos=[str(saida)])
+    assert catalogo_outra['Original'].tolist() == [os.path.join('..', 'csv', 'gather_torus_infiniband_4_completo.csv')]
+
+
+def test_resumir_tabela_preserva_soma_e_contagem():
+    duracoes = np.random.default_rng(1).lognormal(-10, 1, LIMITE_ESBOCO * 3)
+    df = pd.DataFrame({'Tempo Inicial': np.zeros(len(duracoes)), 'Tempo Final': duracoes})
+    resumo = resumir_tabela(df, 'abc')
+    esboco = resumo['esboco']
+
+    assert resumo['impressao_digital'] == 'abc'
+    assert resumo['contagem'] == len(duracoes)
+    assert (resumo['minimo'], resumo['mediana'], resumo['maximo']) == \
+        (duracoes.min(), np.median(duracoes), duracoes.max())
+    assert not esboco['exato'] and len(esboco['valores']) <= LIMITE_ESBOCO
+    assert sum(esboco['contagens']) == len(duracoes)
+    assert np.dot(esboco['valores'], esboco['contagens']) == pytest.approx(duracoes.sum())
+
+    poucos = resumir_tabela(df.iloc[:10])['esboco']
+    assert poucos['exato'] and sorted(poucos['valores']) == sorted(duracoes[:10])
@@ -0,0 +1,577 @@
+import json
+import os
+import shutil
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analise import (UNIDADES_BANDA, UNIDADES_TEMPO, EnginePandas, EnginePolars, MPICampaignComparator,
+                     MPILogAnalyzer, anexar_memoria_compartilhada, carregar_plataforma, converter_unidade,
+                     ler_amostra_csv, ler_resumo, matriz_saltos, quantil_ponderado)
+from analisar import analisar_trace_completo, gerar_resumos
+from conftest import RAIZ
+from gerar_trace import gerar_trace
+
+
+def _gravar_tabela(diretorio, nome, mensagens, acao='PMPI_Bcast'):
+    """Grava <nome>_completo.csv com as mensagens (origem, destino, inicio, fim)."""
+    origens, destinos, inicios, fins = zip(*mensagens)
+    pd.DataFrame({
+        'Rank Origem': origens,
+        'Rank Destino': destinos,
+        'Ação da Origem': acao,
+        'Estado do Destino': acao,
+        'Tempo Inicial': inicios,
+        'Tempo Final': fins
+    }).to_csv(diretorio / f'{nome}_completo.csv', index=False)
+
+
+def _da_configuracao(df, meta):
+    """Linhas de uma tabela de resultados que pertencem à configuração de meta."""
+    return df[(df['Tipo Comunicação'] == meta['tipo_comunicacao']) & (df['Topologia'] == meta['topologia']) &
+              (df['Tecnologia'] == meta['tecnologia']) & (df['Nº Nós'] == meta['num_nos'])]
+
+
+def _analisador(diretorio, **opcoes):
+    analyzer = MPILogAnalyzer(str(diretorio), **opcoes)
+    analyzer.load_data()
+    return analyzer
+
+
+def _tabelas_comparacao(diretorio, engine):
+    analyzer = MPILogAnalyzer(str(diretorio), engine=engine)
+    analyzer.load_data()
+    analyzer.calcular_estatisticas_basicas()
+    analyzer.analisar_escalabilidade()
+    analyzer.comparar_tecnologias()
+    analyzer.comparar_topologias()
+    return analyzer.results
+
+
+def test_engine_polars_equivalente_ao_pandas(diretorio_tabelas):
+    pytest.importorskip('polars')
+    pandas = _tabelas_comparacao(diretorio_tabelas, 'pandas')
+    polars = _tabelas_comparacao(diretorio_tabelas, 'polars')
+
+    for tabela in ('estatisticas_basicas', 'escalabilidade', 'comparacao_tecnologias', 'comparacao_topologias'):
+        assert not pandas[tabela].empty
+        pd.testing.assert_frame_equal(pandas[tabela], polars[tabela], check_exact=False, rtol=1e-9,
+                                      check_dtype=False)
+
+
+def test_comparar_ic_reprodutivel_com_semente(diretorio_tabelas):
+    primeira = _analisador(diretorio_tabelas).comparar_tecnologias(n_reamostras=500, semente=7)
+    segunda = _analisador(diretorio_tabelas).comparar_tecnologias(n_reamostras=500, semente=7)
+    pd.testing.assert_frame_equal(primeira, segunda)
+
+
+def test_comparar_ic_contem_a_diferenca(diretorio_tabelas):
+    df = _analisador(diretorio_tabelas).comparar_tecnologias(n_reamostras=500, semente=7)
+    inferior, superior = df['IC95% Inf. Diferença (s)'], df['IC95% Sup. Diferença (s)']
+    diferenca = df['Tempo Médio 2 (s)'] - df['Tempo Médio 1 (s)']
+
+    assert len(df) == 8
+    assert ((inferior <= diferenca) & (diferenca <= superior)).all()
+    assert (df['Significativo'] == np.where((inferior > 0) | (superior < 0), 'Sim', 'Não')).all()
+    # Latência de 1 us contra 50 us: a Infiniband vence em todas as configurações
+    assert (df['Significativo'] == 'Sim').all()
+    assert (df['Melhor'] == 'infiniband').all()
+    assert (df['Método do IC'] == 'bootstrap aproximado').all()
+
+
+def test_bootstrap_aproximado_proximo_do_exato(tmp_path):
+    # Durações contínuas: muito mais valores distintos que GRUPOS_BOOTSTRAP
+    duracoes = np.random.default_rng(0).lognormal(-10, 1, 2000)
+    analyzer = MPILogAnalyzer(str(tmp_path))
+    analyzer.data = {'sintetica': {'df': pd.DataFrame({'Duracao': duracoes})}}
+
+    _, medias = analyzer.calcular_bootstrap_medias(2000, semente=3)
+    rng = np.random.default_rng(3)
+    exatas = np.array([duracoes[rng.integers(0, len(duracoes), len(duracoes))].mean() for _ in range(2000)])
+
+    assert medias.shape == (2000, 1)
+    assert np.mean(medias) == pytest.approx(duracoes.mean(), rel=1e-2)
+    assert np.std(medias) == pytest.approx(np.std(exatas), rel=0.1)
+
+
+def test_latencia_cauda_quantis_e_piores_mensagens(diretorio_tabelas):
+    analyzer = _analisador(diretorio_tabelas)
+    cauda = analyzer.analisar_latencia_cauda(n_piores=5)
+    piores = analyzer.results['piores_mensagens']
+
+    assert len(cauda) == len(analyzer.data)
+    for key, data in analyzer.data.items():
+        meta = data['metadata']
+        duracoes = data['df']['Duracao'].to_numpy()
+        linha = _da_configuracao(cauda, meta).iloc[0]
+        for q in (0.5, 0.9, 0.99, 0.999):
+            coluna = 'Tempo Mediano (s)' if q == 0.5 else f'p{q * 100:g} (s)'
+            assert linha[coluna] == pytest.approx(np.quantile(duracoes, q))
+        assert linha['Tempo Máximo (s)'] == duracoes.max()
+
+        da_config = _da_configuracao(piores, meta)
+        assert list(da_config['Posição']) == [1, 2, 3, 4, 5]
+        assert list(da_config['Duração (s)']) == sorted(duracoes)[::-1][:5]
+
+
+def test_concorrencia_por_varredura(tmp_path):
+    # Em trânsito: 1 em [0, 1), 2 em [1, 3) (em t=2 uma termina e outra começa), 1 em [3, 4]
+    _gravar_tabela(tmp_path, 'bcast_torus_infiniband_4', [(0, 1, 0.0, 2.0), (0, 2, 1.0, 3.0), (1, 3, 2.0, 4.0)])
+    analyzer = _analisador(tmp_path)
+    linha = analyzer.analisar_concorrencia(n_intervalos=4).iloc[0]
+
+    assert linha['Concorrência Máxima'] == 2
+    assert linha['Concorrência Média'] == pytest.approx(1.5)
+    assert linha['Ocupação da Rede (%)'] == pytest.approx(100)
+    assert linha['Duração Total (s)'] == 4.0
+    linha_do_tempo = analyzer.concorrencia['bcast_torus_infiniband_4']
+    np.testing.assert_allclose(linha_do_tempo['concorrencia'], [1, 2, 2, 1])
+    np.testing.assert_allclose(linha_do_tempo['taxa_conclusao'], [0, 0, 1, 2])
+
+
+def test_desbalanceamento_defasagem_e_espera(tmp_path):
+    _gravar_tabela(tmp_path, 'bcast_torus_infiniband_4', [(0, 1, 3.0, 3.5), (0, 2, 3.0, 3.5)])
+    # Uma chamada: os ranks chegam em 0, 1 e 3 e saem todos em 4
+    pd.DataFrame({
+        'Rank': [0, 1, 2],
+        'Estado': 'PMPI_Bcast',
+        'Chamada': 0,
+        'Tempo Entrada': [0.0, 1.0, 3.0],
+        'Tempo Saída': 4.0
+    }).to_csv(tmp_path / 'bcast_torus_infiniband_4_estados.csv', index=False)
+    analyzer = _analisador(tmp_path)
+    linha = analyzer.analisar_desbalanceamento().iloc[0]
+
+    assert linha['Chamadas'] == 1
+    assert linha['Defasagem Máxima (s)'] == 3.0
+    assert linha['Espera Média por Rank (s)'] == pytest.approx(5 / 3)
+    assert linha['Fração de Espera (%)'] == pytest.approx(5 / 8 * 100)
+    assert linha['Rank Mais Atrasado'] == 2
+    espera = analyzer.results['espera_por_rank'].set_index('Rank')['Espera Média (s)']
+    assert list(espera) == [3.0, 2.0, 0.0]
+
+
+def test_converter_unidade():
+    assert converter_unidade('25GBps', UNIDADES_BANDA) == 25e9
+    assert converter_unidade('2us', UNIDADES_TEMPO) == 2e-6
+    assert converter_unidade('0', UNIDADES_TEMPO) == 0.0
+    with pytest.raises(ValueError):
+        converter_unidade('rápido', UNIDADES_BANDA)
+
+
+def test_plataforma_torus_do_repositorio():
+    plataforma = carregar_plataforma(RAIZ / 'simulacao2' / 'torus' / 'infiniband' / '16')
+    saltos = matriz_saltos(plataforma)
+
+    assert (plataforma['topologia'], plataforma['topo_parameters'], plataforma['num_nos']) == ('TORUS', '4,2,2', 16)
+    assert (plataforma['banda'], plataforma['latencia']) == (25e9, 1e-6)
+    assert (saltos == saltos.T).all() and (np.diag(saltos) == 0).all()
+    # Coordenadas (x, y, z) com x variando mais rápido: 3 = (3, 0, 0) está a 1 salto de 0 pelo wrap-around
+    assert saltos[0, 1] == 1 and saltos[0, 3] == 1 and saltos[0, 15] == 3
+    assert saltos.max() == 4
+
+
+def test_eficiencia_contra_o_limite(tmp_path):
+    diretorio = tmp_path / 'torus' / 'infiniband' / '16'
+    diretorio.mkdir(parents=True)
+    shutil.copy(RAIZ / 'simulacao2' / 'torus' / 'infiniband' / '16' / 'platform.xml', diretorio)
+    # Containers 1 -> 2 (nós 0 e 1, 1 salto): limite de 1 us + 1024 B a 25 GB/s; medido o dobro
+    limite = 1e-6 + 1024 / 25e9
+    _gravar_tabela(tmp_path, 'bcast_torus_infiniband_16', [(1, 2, 0.0, 2 * limite), (1, 2, 1.0, 1.0 + 2 * limite)])
+    analyzer = _analisador(tmp_path)
+    analyzer.carregar_plataformas(str(tmp_path))
+    linha = analyzer.analisar_eficiencia(iteracoes=2).iloc[0]
+
+    assert linha['Saltos Médios'] == 1
+    assert linha['Limite Médio por Mensagem (s)'] == pytest.approx(limite)
+    assert linha['Eficiência por Mensagem (%)'] == pytest.approx(50)
+
+
+def _soma_duracoes(colunas, metadata):
+    return metadata['num_nos'], len(colunas['Duracao']), colunas['Duracao'].sum()
+
+
+def test_memoria_compartilhada_sem_copia(diretorio_tabelas):
+    analyzer = _analisador(diretorio_tabelas)
+    descritor = analyzer.publicar_memoria_compartilhada()
+    try:
+        bloco, configs = anexar_memoria_compartilhada(descritor)
+        assert set(configs) == set(analyzer.data)
+        for key, data in analyzer.data.items():
+            colunas = configs[key]['colunas']
+            np.testing.assert_array_equal(colunas['Duracao'], data['df']['Duracao'].to_numpy())
+            np.testing.assert_array_equal(colunas['Rank Origem'], data['df']['Rank Origem'].to_numpy())
+            assert not colunas['Duracao'].flags.writeable
+            assert colunas['Duracao'].base is not None
+        del colunas, configs
+        bloco.close()
+    finally:
+        analyzer.liberar_memoria_compartilhada()
+    assert analyzer.memoria_compartilhada is None
+
+
+def test_executar_em_paralelo(diretorio_tabelas):
+    analyzer = _analisador(diretorio_tabelas)
+    resultados = analyzer.executar_em_paralelo(_soma_duracoes, n_processos=2)
+
+    assert set(resultados) == set(analyzer.data)
+    for key, data in analyzer.data.items():
+        num_nos, n, soma = resultados[key]
+        assert num_nos == data['metadata']['num_nos']
+        assert n == len(data['df'])
+        assert soma == pytest.approx(data['df']['Duracao'].sum())
+
+
+def test_engines_guardam_o_numero_de_threads():
+    assert EnginePandas(3).n_threads == 3
+    assert EnginePandas().n_threads >= 1
+    pytest.importorskip('polars')
+    assert EnginePolars(3).n_threads == 3
+
+
+def _campanha(diretorio, latencias):
+    diretorio.mkdir()
+    for nome, latencia in latencias.items():
+        padrao, n_ranks = nome.split('_')[0], int(nome.split('_')[-1])
+        trace = diretorio / f'{nome}.trace'
+        gerar_trace(str(trace), padrao, n_ranks, iteracoes=20, latencia=latencia)
+        analisar_trace_completo(str(trace)).to_csv(diretorio / f'{nome}_completo.csv', index=False)
+        trace.unlink()
+    return str(diretorio)
+
+
+def test_detectar_regressoes(tmp_path):
+    base = _campanha(tmp_path / 'base', {'bcast_torus_infiniband_8': 1e-6, 'gather_torus_infiniband_8': 1e-6,
+                                         'scatter_torus_infiniband_8': 1e-6})
+    nova = _campanha(tmp_path / 'nova', {'bcast_torus_infiniband_8': 1e-6, 'gather_torus_infiniband_8': 2e-6,
+                                         'scatter_torus_infiniband_8': 0.5e-6, 'reduce_torus_infiniband_8': 1e-6})
+    comparador = MPICampaignComparator({'base': base, 'nova': nova})
+    comparador.load_data()
+    df = comparador.detectar_regressoes(n_reamostras=500)
+
+    assert list(df['Tipo Comunicação']) == ['gather', 'scatter', 'bcast']
+    assert list(df['Classificação']) == ['Regressão', 'Melhoria', 'Estável']
+    estavel = df.iloc[2]
+    assert estavel['Δ Média (%)'] == 0 and estavel['KS D'] == 0 and estavel['KS p-valor'] == 1
+    assert df.iloc[0]['Δ Média (%)'] > 5 and df.iloc[0]['IC Inf. Δ Média (s)'] > 0
+    assert df.iloc[1]['Δ Média (%)'] < -5 and df.iloc[1]['IC Sup. Δ Média (s)'] < 0
+    # Sem os diretórios das simulações não há como comparar platform.xml e versão do SimGrid
+    assert 'Plataforma Alterada' not in df
+
+
+def test_caminho_critico(tmp_path):
+    # Duas chamadas de uma árvore 0 -> {1, 2}, 1 -> 3; na segunda, 1 -> 3 espera 0,5 s a mais
+    _gravar_tabela(tmp_path, 'bcast_torus_infiniband_4', [
+        (0, 1, 0.0, 1.0), (0, 2, 1.0, 2.0), (1, 3, 1.0, 2.5),
+        (0, 1, 10.0, 11.0), (0, 2, 11.0, 12.0), (1, 3, 11.5, 13.0)])
+    analyzer = _analisador(tmp_path)
+    linha = analyzer.analisar_caminho_critico().iloc[0]
+    caminhos = analyzer.caminhos_criticos['bcast_torus_infiniband_4']
+
+    assert list(caminhos['Ranks']) == ['0 -> 1 -> 3', '0 -> 1 -> 3']
+    assert list(caminhos['Comprimento (s)']) == [2.5, 3.0]
+    assert list(caminhos['Tempo em Trânsito (s)']) == [2.5, 2.5]
+    assert list(caminhos['Tempo em Espera (s)']) == [0.0, 0.5]
+    assert linha['Chamadas'] == 2 and linha['Saltos Médios'] == 2
+    assert linha['Fração em Trânsito (%)'] == pytest.approx(5 / 5.5 * 100)
+
+
+def test_caminho_critico_com_mensagens_de_duracao_zero(tmp_path):
+    # Cada mensagem termina no instante em que a outra começa: predecessoras uma da outra
+    _gravar_tabela(tmp_path, 'reduce_torus_infiniband_2', [(0, 1, 5.0, 5.0), (1, 0, 5.0, 5.0)], acao='PMPI_Reduce')
+    analyzer = _analisador(tmp_path)
+    linha = analyzer.analisar_caminho_critico().iloc[0]
+
+    assert linha['Saltos Médios'] == 2
+    assert linha['Comprimento Médio (s)'] == 0
+
+
+def test_parse_filename_raiz_e_tamanho():
+    analyzer = MPILogAnalyzer('.')
+    flex = analyzer.parse_filename('bcastflex_torus_infiniband_16_raiz3_tam4096_completo.csv')
+    assert (flex['tipo_comunicacao'], flex['num_nos'], flex['raiz'], flex['tamanho_mensagem']) == \
+        ('bcastflex', 16, 3, 4096)
+    assert analyzer.parse_filename('bcastflex_torus_infiniband_16_completo.csv')['raiz'] == 0
+    padrao = analyzer.parse_filename('bcast_torus_infiniband_16_completo.csv')
+    assert (padrao['raiz'], padrao['tamanho_mensagem']) == (None, 1024)
+    assert analyzer.parse_filename('bcast_torus_infiniband_completo.csv') is None
+
+
+def test_sensibilidade_raiz(tmp_path):
+    # Duas iterações por raiz, com tempo por iteração de 1 s (raiz 0), 3 s (raiz 1) e 2 s (raiz 2)
+    for raiz, tempo, sufixo in ((0, 1.0, ''), (1, 3.0, '_raiz1'), (2, 2.0, '_raiz2')):
+        outros = [rank for rank in range(3) if rank != raiz]
+        mensagens = [(raiz, destino, inicio, inicio + tempo / (1 + i))
+                     for inicio in (0.0, 10.0) for i, destino in enumerate(outros)]
+        _gravar_tabela(tmp_path, f'bcastflex_torus_infiniband_4{sufixo}', mensagens)
+    analyzer = _analisador(tmp_path)
+    linha = analyzer.analisar_sensibilidade_raiz().iloc[0]
+    por_raiz = analyzer.results['tempo_por_raiz']
+
+    assert sorted(analyzer.data['bcastflex_torus_infiniband_4']['raizes']) == [0, 1, 2]
+    assert analyzer.data['bcastflex_torus_infiniband_4']['metadata']['raiz'] == 0
+    assert list(por_raiz['Tempo Médio por Iteração (s)']) == [1.0, 3.0, 2.0]
+    assert list(por_raiz['Iterações']) == [2, 2, 2]
+    assert (linha['Raízes'], linha['Melhor Raiz'], linha['Pior Raiz']) == (3, 0, 1)
+    assert linha['Dispersão (%)'] == pytest.approx(200)
+
+
+def test_curva_de_banda_segue_hockney(tmp_path):
+    # t(m) = 1 us + m / (1 GB/s): o ajuste recupera t0, r_inf e n_1/2 = 1000 B
+    tamanhos = [2 ** k for k in range(6, 17, 2)]
+    for tamanho in tamanhos:
+        duracao = 1e-6 + tamanho / 1e9
+        _gravar_tabela(tmp_path, f'pingpong_torus_infiniband_2_tam{tamanho}',
+                       [(0, 1, float(i), i + duracao) for i in range(3)], acao='PMPI_Send')
+    analyzer = _analisador(tmp_path)
+    linha = analyzer.analisar_tamanho_mensagem().iloc[0]
+    curvas = analyzer.results['curvas_tamanho']
+
+    assert list(curvas['Tamanho (B)']) == tamanhos
+    assert list(curvas['Mensagens']) == [3] * len(tamanhos)
+    assert linha['Tamanhos'] == len(tamanhos)
+    assert linha['Hockney t0 (s)'] == pytest.approx(1e-6, rel=1e-6)
+    assert linha['Hockney r_inf (B/s)'] == pytest.approx(1e9, rel=1e-6)
+    assert linha['Hockney n_1/2 (B)'] == pytest.approx(1000, rel=1e-6)
+    assert linha['Banda de Pico (B/s)'] == pytest.approx(tamanhos[-1] / (1e-6 + tamanhos[-1] / 1e9))
+    assert tamanhos[1] < linha['Meia Banda Medida (B)'] < tamanhos[2]
+
+
+def test_amostra_csv_reprodutivel_e_independente_do_bloco(tmp_path):
+    _gravar_tabela(tmp_path, 'bcast_torus_infiniband_4', [(0, 1, float(i), i + 0.5) for i in range(1000)])
+    arquivo = tmp_path / 'bcast_torus_infiniband_4_completo.csv'
+    amostra, total = ler_amostra_csv(arquivo, 50, semente=1)
+
+    assert total == 1000 and len(amostra) == 50
+    assert amostra['Tempo Inicial'].is_monotonic_increasing
+    assert amostra['Tempo Inicial'].nunique() == 50
+    pd.testing.assert_frame_equal(amostra, ler_amostra_csv(arquivo, 50, semente=1, linhas_por_bloco=37)[0])
+    assert not amostra.equals(ler_amostra_csv(arquivo, 50, semente=2)[0])
+    # Amostra maior que o arquivo: todas as linhas
+    assert len(ler_amostra_csv(arquivo, 5000)[0]) == 1000
+
+
+def test_modo_previa(diretorio_tabelas):
+    exato = _analisador(diretorio_tabelas).calcular_estatisticas_basicas()
+    previa = _analisador(diretorio_tabelas, amostra=30).calcular_estatisticas_basicas()
+    completa = _analisador(diretorio_tabelas, amostra=10_000).calcular_estatisticas_basicas()
+
+    assert (previa['Linhas Amostradas'] == 30).all()
+    pd.testing.assert_series_equal(previa['Total Comunicações'], exato['Total Comunicações'], check_dtype=False)
+    assert (previa['Tempo Médio (s) ± IC95'] > 0).all()
+    # Amostra com todas as linhas: a correção de população finita zera o erro da média
+    assert (completa['Tempo Médio (s) ± IC95'] == 0).all()
+    pd.testing.assert_series_equal(completa['Tempo Médio (s)'], exato['Tempo Médio (s)'])
+    with pytest.raises(ValueError):
+        MPILogAnalyzer(str(diretorio_tabelas), amostra=30, resumos=True)
+
+
+def test_load_data_le_apelidos_do_catalogo(tmp_path):
+    _gravar_tabela(tmp_path, 'bcast_torus_infiniband_4', [(0, 1, 0.0, 1.0), (0, 2, 0.0, 2.0)])
+    pd.DataFrame({
+        'Tabela': ['bcast_torus_infiniband_4_completo.csv', 'bcastflex_torus_infiniband_4_completo.csv'],
+        'Original': ['', 'bcast_torus_infiniband_4_completo.csv']
+    }).to_csv(tmp_path / 'catalogo.csv', index=False)
+    analyzer = _analisador(tmp_path)
+
+    assert set(analyzer.data) == {'bcast_torus_infiniband_4', 'bcastflex_torus_infiniband_4'}
+    original = analyzer.data['bcast_torus_infiniband_4']['df']
+    apelido = analyzer.data['bcastflex_torus_infiniband_4']['df']
+    pd.testing.assert_frame_equal(original, apelido)
+    assert apelido is not original
+
+
+def test_load_data_aplica_o_esquema(diretorio_tabelas):
+    analyzer = _analisador(diretorio_tabelas)
+    df = analyzer.data['bcast_torus_infiniband_8']['df']
+    assert df['Rank Origem'].dtype == np.int16
+    assert isinstance(df['Ação da Origem'].dtype, pd.CategoricalDtype)
+    assert df['Tempo Inicial'].dtype == np.float64
+    np.testing.assert_array_equal(df['Duracao'], df['Tempo Final'] - df['Tempo Inicial'])
+
+    minimo = _analisador(diretorio_tabelas, somente_duracoes=True)
+    assert list(minimo.data['bcast_torus_infiniband_8']['df'].columns) == ['Rank Origem', 'Rank Destino', 'Duracao']
+    pd.testing.assert_frame_equal(minimo.calcular_estatisticas_basicas(), analyzer.calcular_estatisticas_basicas())
+    # As análises que precisam dos tempos avisam em vez de falhar
+    assert minimo.analisar_concorrencia().empty
+
+
+def test_quantil_ponderado_igual_ao_do_array_expandido():
+    rng = np.random.default_rng(5)
+    valores = np.sort(rng.choice(1000, 40, replace=False)).astype(np.float64)
+    contagens = rng.integers(1, 6, 40)
+    expandido = np.repeat(valores, contagens)
+    for q in (0, 0.1, 0.25, 0.5, 0.9, 0.999, 1):
+        assert quantil_ponderado(valores, contagens, q) == pytest.approx(np.quantile(expandido, q))
+
+
+@pytest.fixture
+def diretorio_com_resumos(diretorio_tabelas, tmp_path):
+    diretorio = tmp_path / 'tabelas'
+    shutil.copytree(diretorio_tabelas, diretorio)
+    assert len(gerar_resumos(str(diretorio))) == 16
+    return diretorio
+
+
+def test_modo_resumos_igual_ao_exato(diretorio_com_resumos):
+    exato = _analisador(diretorio_com_resumos)
+    resumos = _analisador(diretorio_com_resumos, resumos=True)
+
+    assert not any('df' in data for data in resumos.data.values())
+    pd.testing.assert_frame_equal(resumos.calcular_estatisticas_basicas(), exato.calcular_estatisticas_basicas(),
+                                  check_exact=False, rtol=1e-9)
+    pd.testing.assert_frame_equal(resumos.analisar_escalabilidade(), exato.analisar_escalabilidade(),
+                                  check_exact=False, rtol=1e-9)
+    comparacao = resumos.comparar_tecnologias()
+    assert (comparacao['Método do IC'] == 'normal (resumos)').all()
+    assert (comparacao['Significativo'] == 'Sim').all()
+    # Análises que precisam de cada mensagem leem as linhas sob demanda
+    assert len(resumos.analisar_latencia_cauda()) == 16
+    assert all('df' in data for data in resumos.data.values())
+
+
+def test_resumo_mais_antigo_que_a_tabela_e_ignorado(diretorio_com_resumos):
+    tabela = diretorio_com_resumos / 'bcast_torus_infiniband_8_completo.csv'
+    assert ler_resumo(tabela)['contagem'] == len(pd.read_csv(tabela))
+    resumo = tabela.with_name('bcast_torus_infiniband_8_resumo.json')
+    os.utime(tabela, (resumo.stat().st_mtime + 10,) * 2)
+
+    assert ler_resumo(tabela) is None
+    analyzer = _analisador(diretorio_com_resumos, resumos=True)
+    assert 'df' in analyzer.data['bcast_torus_infiniband_8']
+    assert 'df' not in analyzer.data['bcast_torus_infiniband_4']
+
+
+def test_modelo_saltos(tmp_path):
+    for topologia in ('torus', 'fattree', 'estrela'):
+        diretorio = tmp_path / topologia / 'infiniband' / '16'
+        diretorio.mkdir(parents=True)
+        shutil.copy(RAIZ / 'simulacao2' / topologia / 'infiniband' / '16' / 'platform.xml', diretorio)
+    # Containers 1 -> 2, 3, 16: 1, 2 e 3 saltos no torus 4x2x2; duração exata de 2 us + 1 us por salto
+    mensagens = [(1, destino, 0.0, 2e-6 + 1e-6 * saltos) for destino, saltos in ((2, 1), (3, 2), (16, 3))] * 2
+    _gravar_tabela(tmp_path, 'bcast_torus_infiniband_16', mensagens)
+    _gravar_tabela(tmp_path, 'bcast_estrela_infiniband_16', mensagens)
+    analyzer = _analisador(tmp_path)
+    analyzer.carregar_plataformas(str(tmp_path))
+    modelo = analyzer.analisar_modelo_saltos().set_index('Topologia')
+
+    torus = modelo.loc['torus']
+    assert torus['Latência por Salto (s)'] == pytest.approx(1e-6)
+    assert torus['Intercepto (s)'] == pytest.approx(2e-6)
+    assert torus['R²'] == pytest.approx(1)
+    assert torus['Resíduo P99 (s)'] == pytest.approx(0, abs=1e-15)
+    # Estrela: todas as mensagens com 2 saltos, sem inclinação
+    assert np.isnan(modelo.loc['estrela', 'Latência por Salto (s)'])
+    assert modelo.loc['estrela', 'Saltos Médios'] == 2
+    por_salto = analyzer.results['residuos_por_salto']
+    assert list(por_salto[por_salto['Topologia'] == 'torus']['Saltos']) == [1, 2, 3]
+
+    # Fat tree 2;4,4: 2 saltos no mesmo grupo de 4 nós e 4 entre grupos
+    saltos = matriz_saltos(carregar_plataforma(tmp_path / 'fattree' / 'infiniband' / '16'))
+    assert (saltos[0, 1], saltos[0, 3], saltos[0, 4], saltos[0, 15]) == (2, 2, 4, 4)
+
+
+def test_comparar_qualquer_eixo(diretorio_tabelas):
+    analyzer = _analisador(diretorio_tabelas)
+
+    nos = analyzer.comparar('num_nos', n_reamostras=200)
+    assert len(nos) == 8
+    # Os lados de cada par seguem a ordem em que as configurações foram carregadas
+    assert {frozenset(par) for par in zip(nos['Nº Nós 1'], nos['Nº Nós 2'])} == {frozenset((4, 8))}
+    assert list(nos.columns[:3]) == ['Tipo Comunicação', 'Topologia', 'Tecnologia']
+
+    # Sem eixos fixos, cada tecnologia é uma célula com todas as mensagens dela
+    geral = analyzer.comparar('tecnologia', fixos=(), n_reamostras=200)
+    assert len(geral) == 1
+    for lado in (1, 2):
+        tecnologia = geral[f'Tecnologia {lado}'].iloc[0]
+        duracoes = pd.concat([data['df']['Duracao'] for data in analyzer.data.values()
+                              if data['metadata']['tecnologia'] == tecnologia])
+        assert geral[f'Tempo Médio {lado} (s)'].iloc[0] == pytest.approx(duracoes.mean())
+
+    referencia = analyzer.comparar('topologia', referencia='fattree', n_reamostras=200)
+    assert (referencia['Topologia 1'] == 'fattree').all() and (referencia['Topologia 2'] == 'torus').all()
+
+    pd.testing.assert_frame_equal(analyzer.comparar_topologias(n_reamostras=200),
+                                  analyzer.comparar('topologia', n_reamostras=200))
+    assert analyzer.comparar('topologia', referencia='dragonfly').empty
+
+
+def test_exportar_tabelas_jsonl(diretorio_tabelas, tmp_path):
+    analyzer = _analisador(diretorio_tabelas)
+    analyzer.calcular_estatisticas_basicas()
+    analyzer.analisar_latencia_cauda()
+    analyzer.comparar_tecnologias(n_reamostras=200)
+    analyzer.results['estatisticas_basicas'].loc[0, 'Desvio Padrão (s)'] = np.inf
+    arquivo = analyzer.exportar_tabelas(tmp_path / 'tabelas.jsonl', linhas_por_bloco=3)
+
+    with open(arquivo, encoding='utf-8') as f:
+        linhas = [json.loads(linha) for linha in f]
+    cabecalhos = [linha for linha in linhas if 'esquema' in linha]
+    assert [cabecalho['secao'] for cabecalho in cabecalhos] == [
+        'estatisticas_basicas', 'comparacao_tecnologias', 'latencia_cauda', 'piores_mensagens']
+    for cabecalho in cabecalhos:
+        tabela = analyzer.results[cabecalho['secao']]
+        registros = [linha for linha in linhas if linha['secao'] == cabecalho['secao'] and 'esquema' not in linha]
+        assert cabecalho['linhas'] == len(registros) == len(tabela)
+        assert list(cabecalho['esquema']) == list(tabela.columns)
+    estatisticas = [linha for linha in linhas if linha['secao'] == 'estatisticas_basicas' and 'esquema' not in linha]
+    assert estatisticas[0]['Desvio Padrão (s)'] is None
+    assert estatisticas[1]['Tempo Médio (s)'] == analyzer.results['estatisticas_basicas'].loc[1, 'Tempo Médio (s)']
+
+    with pytest.raises(ValueError):
+        analyzer.exportar_tabelas(tmp_path / 'tabelas.csv', formato='csv')
+
+
+def test_exportar_tabelas_parquet(diretorio_tabelas, tmp_path):
+    pl = pytest.importorskip('polars')
+    analyzer = _analisador(diretorio_tabelas)
+    estatisticas = analyzer.calcular_estatisticas_basicas()
+    destino = analyzer.exportar_tabelas(tmp_path / 'parquet', formato='parquet')
+
+    assert [arquivo.name for arquivo in destino.iterdir()] == ['estatisticas_basicas.parquet']
+    lida = pl.read_parquet(destino / 'estatisticas_basicas.parquet')
+    assert lida.columns == list(estatisticas.columns)
+    assert lida['Tempo Médio (s)'].to_list() == estatisticas['Tempo Médio (s)'].tolist()
+
+
+def test_preparar_exploracao(diretorio_tabelas):
+    analyzer = _analisador(diretorio_tabelas)
+    respostas = analyzer.preparar_exploracao(n_bins=10)
+    configuracoes = json.loads(respostas['/api/configuracoes'])
+
+    assert len(configuracoes) == 16
+    for configuracao in configuracoes:
+        key = configuracao['chave']
+        df = analyzer.data[key]['df']
+        histograma = json.loads(respostas[f'/api/histograma/{key}'])
+        matriz = json.loads(respostas[f'/api/matriz/{key}'])
+        assert configuracao['contagem'] == len(df)
+        assert configuracao['caixa']['mediana'] == pytest.approx(df['Duracao'].median())
+        assert len(histograma['bordas']) == 11
+        assert sum(histograma['contagens']) + histograma['nao_positivas'] == len(df)
+        assert np.sum(matriz['contagem']) == len(df)
+        origem, destino = df['Rank Origem'].iloc[0], df['Rank Destino'].iloc[0]
+        par = df[(df['Rank Origem'] == origem) & (df['Rank Destino'] == destino)]['Duracao']
+        assert matriz['media'][origem - 1][destino - 1] == pytest.approx(par.mean())
+
+
+def test_servidor_de_exploracao(diretorio_tabelas):
+    analyzer = _analisador(diretorio_tabelas)
+    servidor = analyzer.iniciar_servidor(porta=0, bloquear=False)
+    base = f'http://127.0.0.1:{servidor.server_address[1]}'
+    try:
+        with urlopen(f'{base}/api/configuracoes') as resposta:
+            assert resposta.headers['Content-Type'] == 'application/json'
+            assert len(json.load(resposta)) == 16
+        with urlopen(f'{base}/') as resposta:
+            assert resposta.headers['Content-Type'].startswith('text/html')
+        with pytest.raises(HTTPError) as erro:
+            urlopen(f'{base}/api/histograma/inexistente')
+        assert erro.value.code == 404
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
@@ -0,0 +1,62 @@
+import pytest
+
+from analisar import analisar_trace_completo
+from gerar_trace import PADROES_SINTETICOS, gerar_trace, medir_parser
+
+# Mensagens por iteração de cada padrão com n ranks
+MENSAGENS_POR_ITERACAO = {
+    'bcast': lambda n: n - 1,
+    'reduce': lambda n: n - 1,
+    'gather': lambda n: n - 1,
+    'scatter': lambda n: n - 1,
+    'all2all': lambda n: n * (n - 1),
+    'pingpong': lambda n: 2 * (n - 1),
+}
+
+
+@pytest.mark.parametrize('padrao', PADROES_SINTETICOS)
+@pytest.mark.parametrize('n_ranks', [2, 5, 8])
+def test_trace_sintetico_lido_pelo_parser(tmp_path, padrao, n_ranks):
+    trace = tmp_path / f'{padrao}_sintetico_{n_ranks}.trace'
+    mensagens = gerar_trace(str(trace), padrao, n_ranks, iteracoes=4, latencia=1e-6)
+    df = analisar_trace_completo(str(trace))
+
+    assert mensagens == len(df) == 4 * MENSAGENS_POR_ITERACAO[padrao](n_ranks)
+    assert df.attrs['diagnosticos'] == {}
+    assert 'Tamanho (bytes)' not in df
+    assert ((df['Tempo Final'] - df['Tempo Inicial']) >= 1e-6 * (1 - 0.05)).all()
+    assert set(df['Rank Origem']) | set(df['Rank Destino']) == {str(r) for r in range(1, n_ranks + 1)}
+
+
+def test_trace_sintetico_com_tamanhos(tmp_path):
+    trace = tmp_path / 'gather_sintetico_4.trace'
+    gerar_trace(str(trace), 'gather', 4, iteracoes=3, tamanho=4096, exibir_tamanhos=True)
+    df = analisar_trace_completo(str(trace))
+
+    assert (df['Tamanho (bytes)'] == 4096).all()
+
+
+def test_trace_sintetico_reprodutivel(tmp_path):
+    traces = [tmp_path / f'{nome}.trace' for nome in ('a', 'b', 'c')]
+    for trace, semente in zip(traces, (1, 1, 2)):
+        gerar_trace(str(trace), 'bcast', 8, iteracoes=5, semente=semente)
+
+    assert traces[0].read_bytes() == traces[1].read_bytes()
+    assert traces[0].read_bytes() != traces[2].read_bytes()
+
+
+def test_trace_sintetico_parametros_invalidos(tmp_path):
+    with pytest.raises(ValueError):
+        gerar_trace(str(tmp_path / 'x.trace'), 'barrier', 4)
+    with pytest.raises(ValueError):
+        gerar_trace(str(tmp_path / 'x.trace'), 'bcast', 1)
+
+
+def test_medir_parser(tmp_path):
+    medidas = medir_parser('scatter', [4, 8], iteracoes=5, diretorio=str(tmp_path / 'traces'),
+                           diretorio_csv=str(tmp_path / 'csv'), medir_memoria=False)
+
+    assert list(medidas['Ranks']) == [4, 8]
+    assert list(medidas['Mensagens']) == [15, 35]
+    assert medidas['Pico de Memória (MB)'].isna().all()
+    assert (tmp_path / 'csv' / 'scatter_sintetica_sintetica_8_completo.csv').exists()